@@ -0,0 +1,68 @@
+"""
+Benchmark of per-request preparation cost, compare the
+preparation of `Http` (`prepare_request` and
+`merge_environment_settings` for every request) with the
+prepared request that produced by `RequestTemplate`.
+Construction of session is excluded from both sides, since
+`RequestTemplate.send` still build `Http` with its own session.
+No request is sent to the network. Run it with :
+
+    $ python -m benchmarks.request_preparation --iterations 5000
+"""
+import argparse
+import timeit
+
+import requests
+
+from maritest.request_template import RequestTemplate
+
+URL = "https://api.example.com/users/${user_id}"
+HEADERS = {"Authorization": "Bearer token", "Accept": "application/json"}
+
+
+def new_session() -> requests.Session:
+    # the same session settings that `Http.__init__` does
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.verify = True
+    return session
+
+
+def prepare_per_request(session: requests.Session, user_id: int) -> None:
+    # the same steps that `Http.__init__` does before sending
+    url = URL.replace("${user_id}", str(user_id))
+    request = requests.Request(method="GET", url=url, headers=HEADERS, params={"v": 1})
+    session.prepare_request(request)
+    session.merge_environment_settings(
+        url=url, proxies={}, stream=False, verify=None, cert=None
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    template = RequestTemplate("GET", URL, headers=HEADERS, params={"v": 1})
+    static_template = RequestTemplate(
+        "GET", URL.replace("${user_id}", "1"), headers=HEADERS, params={"v": 1}
+    )
+
+    session = new_session()
+    cases = [
+        ("per request (Http)", lambda: prepare_per_request(session, 1)),
+        ("RequestTemplate", lambda: template.prepare({"user_id": 1})),
+        ("RequestTemplate (static)", lambda: static_template.prepare()),
+    ]
+    baseline = None
+    for name, func in cases:
+        elapsed = min(timeit.repeat(func, number=args.iterations, repeat=3))
+        per_request = elapsed / args.iterations * 1e6
+        baseline = baseline or per_request
+        print(
+            f"{name:<28} {per_request:10.2f} us/request {baseline / per_request:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
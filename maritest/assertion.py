@@ -1,10 +1,13 @@
-import json
-
-from typing import Any, Optional
+from typing import Any, Iterable, List, Optional, Union
 from lxml import html
 
 from .client import Http
+from .expectation import Expectation
+from .snapshot import SnapshotStore, normalize, snapshots
+from .utils import links
 from .utils.dict_lookups import keys_in_dict
+from .utils.digest import parse_digest_headers
+from .utils.json_diff import json_diff
 
 
 class Assert(Http):
@@ -14,6 +17,10 @@ class Assert(Http):
     based on abstract method in Http class
     """
 
+    def expect(self) -> Expectation:
+        """Start chainable expectation, evaluated in one pass with `verify` method"""
+        return Expectation(self)
+
     def assert_is_ok(self, message: str):
         """Assert request is ok"""
         if self.response.status_code != 200:
@@ -94,30 +101,52 @@ class Assert(Http):
 
     def assert_status_code_in(self, status_code: list[int], message: str):
         """Assert response status code in range expected result"""
-        expected_result = [str(code) for code in status_code]
-        actual_result = str(self.response.status_code)
-        if actual_result in expected_result:
+        if self.response.status_code in frozenset(int(code) for code in status_code):
             return message
         raise AssertionError("The expected status code didn't match with actual result")
 
     def assert_status_code_not_in(self, status_code: list[int], message: str):
         """Assert response status code not in range expected result"""
-        expected_result = [str(code) for code in status_code]
-        actual_result = str(self.response.status_code)
-        if actual_result not in expected_result:
+        if self.response.status_code not in frozenset(
+            int(code) for code in status_code
+        ):
             return message
         raise AssertionError(
             "The expected status code (actually) did matched with actual result"
         )
 
-    def assert_json_to_equal(self, obj, message: str):
-        """Assert JSON response equal to expected result"""
-        response_data = self.response.json()
-        dumps = json.dumps(response_data, sort_keys=False)
-        loads = json.loads(dumps)
-        if loads == obj:
+    def assert_json_to_equal(
+        self,
+        obj,
+        message: str,
+        ignore_paths: Optional[List[str]] = None,
+        unordered: Union[bool, List[str]] = False,
+        max_diffs: int = 10,
+    ):
+        """
+        Assert JSON response equal to expected result, the
+        differing paths are reported if it's not equal
+
+        :param obj: expected object
+        :param message: message that returned if equal
+        :param ignore_paths: JSON paths that not compared (ex: ``$.data[*].updated_at``)
+        :param unordered: True to compare arrays regardless the order
+            of items, or JSON paths of arrays that compared without order
+        :param max_diffs: maximum numbers of reported difference
+        """
+        differences = json_diff(
+            self.response.json(),
+            obj,
+            ignore_paths=ignore_paths,
+            unordered=unordered,
+            max_diffs=max_diffs,
+        )
+        if not differences:
             return message
-        raise AssertionError("There's no object that match")
+        formatted = "\n".join(f"   - {difference}" for difference in differences)
+        raise AssertionError(
+            f"There's no object that match, first differences :\n{formatted}"
+        )
 
     def assert_content_to_equal(self, obj, message: str):
         if self.response.content == obj:
@@ -168,6 +197,46 @@ class Assert(Http):
         else:
             return message
 
+    def assert_content_encoding(self, encoding: str, message: str):
+        """
+        Assert response was compressed with expected content-encoding
+        (ex: ``gzip`` or ``br``), to detect the compression was dropped
+        """
+        actual = self.response.headers.get("Content-Encoding", "identity").lower()
+        if actual == encoding.lower():
+            return message
+        raise AssertionError(f"The content-encoding of response was => {actual}")
+
+    def assert_wire_size(self, max_size: int, message: str):
+        """
+        Assert size of response body as it was sent on
+        the wire (compressed) less than or equal to max size
+
+        :param max_size: maximum size in bytes
+        :param message: message that returned if passed
+        """
+        size = self.body_size()
+        if size.wire is None:
+            raise AssertionError("The size of body on the wire couldn't be known")
+        if size.wire <= max_size:
+            return message
+        raise AssertionError(
+            f"The size of body on the wire was => {size.wire} bytes ({size.encoding})"
+        )
+
+    def assert_decoded_size(self, max_size: int, message: str):
+        """
+        Assert size of response body after decoded
+        (decompressed) less than or equal to max size
+
+        :param max_size: maximum size in bytes
+        :param message: message that returned if passed
+        """
+        size = self.body_size()
+        if size.decoded <= max_size:
+            return message
+        raise AssertionError(f"The size of decoded body was => {size.decoded} bytes")
+
     def assert_tls_secure(self, message: str = None):
         """Assert request was TLS secure or invalid"""
         if message is None:
@@ -200,17 +269,121 @@ class Assert(Http):
             raise AssertionError("Data not equals or not found within XPATH response")
         return message
 
-    def assert_link_data(self, expected_values: str = None, message: str = None):
-        """Assert for checking href link attribute in HTTP response"""
-        response_content = self.response.content
-        parsing = html.fromstring(response_content)
-        url_link = parsing.xpath("//a/@href")
-        for find_element in url_link:
-            if (
-                find_element.startswith(("https", "http"))
-                and find_element not in expected_values
-            ):
+    def assert_snapshot(
+        self,
+        name: str,
+        message: str,
+        ignore_paths: Optional[List[str]] = None,
+        store: Optional[SnapshotStore] = None,
+    ):
+        """
+        Assert response body match the stored snapshot, the
+        snapshot is created on the first run. Set environment
+        variable ``MARITEST_UPDATE_SNAPSHOTS=1`` to update them
+
+        :param name: unique name of snapshot (ex: name of test case)
+        :param message: message that returned if matched
+        :param ignore_paths: JSON paths that excluded from snapshot
+            (ex: ``$.meta.request_id``)
+        :param store: snapshot store, by default using the shared `snapshots`
+        """
+        store = snapshots if store is None else store
+        differences = store.compare(
+            name, normalize(self.response.content, ignore_paths)
+        )
+        if not differences:
+            return message
+        formatted = "\n".join(f"   - {difference}" for difference in differences)
+        raise AssertionError(f"Response didn't match snapshot {name!r} :\n{formatted}")
+
+    def assert_body_digest(self, algorithm: str, expected: str, message: str):
+        """
+        Assert digest of response body equal to expected hexadecimal
+        digest, computed incrementally (see `digest_body`)
+
+        :param algorithm: name of algorithm, such as ``sha256``, ``md5`` or ``crc32``
+        :param expected: expected digest in hexadecimal
+        :param message: message that returned if equal
+        """
+        try:
+            actual = self.digest_body(algorithm).hexdigest(algorithm)
+        except ValueError as error:
+            raise AssertionError(f"The digest of body can't be computed => {error}")
+        if actual == expected.lower():
+            return message
+        raise AssertionError(f"The {algorithm} digest of body was => {actual}")
+
+    def assert_body_sha256(self, expected: str, message: str):
+        """Assert SHA-256 digest of response body equal to expected hexadecimal digest"""
+        return self.assert_body_digest("sha256", expected, message)
+
+    def assert_body_md5(self, expected: str, message: str):
+        """Assert MD5 digest of response body equal to expected hexadecimal digest"""
+        return self.assert_body_digest("md5", expected, message)
+
+    def assert_body_crc32(self, expected: Union[int, str], message: str):
+        """Assert CRC-32 checksum of response body equal to expected integer or hexadecimal"""
+        if isinstance(expected, int):
+            expected = f"{expected:08x}"
+        return self.assert_body_digest("crc32", expected, message)
+
+    def assert_digest_header(self, message: str):
+        """
+        Assert response body match the digest headers of response,
+        such as ``Content-MD5``, ``Digest`` or ``Content-Digest``. The
+        digests are computed from body as it was sent on the wire
+        """
+        expected = parse_digest_headers(self.response.headers)
+        if not expected:
+            raise AssertionError("There's no supported digest header in the response")
+        try:
+            actual = self.digest_body(*expected, decode_content=False)
+        except ValueError as error:
+            raise AssertionError(f"The digest of body can't be computed => {error}")
+        mismatched = [
+            algorithm
+            for algorithm, digest in expected.items()
+            if actual.digest(algorithm) != digest
+        ]
+        if mismatched:
+            raise AssertionError(
+                f"The body didn't match the {mismatched} digest header"
+            )
+        return message
+
+    def assert_link_data(
+        self,
+        expected_values: Union[str, Iterable[str]],
+        message: str = None,
+        check_links: bool = False,
+        max_workers: int = 8,
+    ):
+        """
+        Assert for checking href link attribute in HTTP response. The
+        anchors are collected while the HTML is parsed without building
+        the tree, and every absolute link must be a part of expected
+        values (string) or one of them (collection). With ``check_links``
+        the links are also requested concurrently with HEAD method and
+        must not return error status
+        """
+        found = links.response_links(self.response)
+        unexpected = links.unexpected_links(found, expected_values)
+        if unexpected:
+            raise AssertionError(
+                f"Link not equals or not found within content response => {unexpected[0]}"
+            )
+        if check_links:
+            results = links.check_links(
+                found, max_workers=max_workers, timeout=self.timeout
+            )
+            broken = {
+                link: result
+                for link, result in results.items()
+                if not isinstance(result, int) or result >= 400
+            }
+            if broken:
+                link, result = next(iter(broken.items()))
                 raise AssertionError(
-                    "Link not equals or not found within content response"
+                    f"There's {len(broken)} broken links, {link} returned {result}"
                 )
         return message
@@ -0,0 +1,376 @@
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import unittest
+import zlib
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .runner import CaseResult, Runner
+from .suite import load_document, load_plan
+from .version import __version__
+
+SUITE_EXTENSIONS = (".json", ".yaml", ".yml")
+
+# suite file that named with this suffix is always collected
+# from directory, without checking the content of it
+SUITE_SUFFIXES = tuple(f".suite{extension}" for extension in SUITE_EXTENSIONS)
+
+# work unit that can be sharded and sent into worker process,
+# consist of kind ("suite" or "python"), path of file and
+# selector (indexes of suite steps or python test id)
+WorkUnit = Tuple[str, str, Tuple]
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse shard argument with format of ``i/n``, i start from 1"""
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("shard must be formatted as i/n, ex: 1/4")
+    if total < 1 or not 1 <= index <= total:
+        raise argparse.ArgumentTypeError("shard index must be in range 1 - n")
+    return index, total
+
+
+def parse_variable(value: str) -> Tuple[str, str]:
+    """Parse variable argument with format of ``KEY=VALUE``"""
+    key, separator, variable = value.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError("variable must be formatted as KEY=VALUE")
+    return key, variable
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="maritest",
+        description="Execute maritest suite files or Python test modules",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="suite files (.json, .yaml), Python test modules or directories",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="numbers of worker process, by default set to 1",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help=(
+            "numbers of concurrent suite test cases per worker, by default set"
+            " to 8. Python test cases are always run one at a time per worker"
+        ),
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=(1, 1),
+        help="only run shard i of n, to split suites across machines (ex: 2/4)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="stop to run remaining test cases after the first failure",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="output format of the result, by default set to text",
+    )
+    parser.add_argument(
+        "--output", default=None, help="write the result into file instead of stdout"
+    )
+    parser.add_argument(
+        "--var",
+        type=parse_variable,
+        action="append",
+        default=[],
+        help="suite variable with format KEY=VALUE, can be repeated",
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    return parser
+
+
+def is_suite_file(path: str) -> bool:
+    """
+    Returned True if the file in directory is a suite file, it's either
+    named with ``.suite.json`` (or ``.yaml``, ``.yml``) suffix, or it's
+    mapping object that has ``tests`` key. Other files, such as the
+    payload fixtures, are not a suite file
+    """
+    if path.endswith(SUITE_SUFFIXES):
+        return True
+    try:
+        document, _ = load_document(path)
+    except (ValueError, ImportError):
+        return False
+    return "tests" in document
+
+
+def discover(paths: Sequence[str]) -> List[str]:
+    """
+    Returned list of suite files and Python test modules, for
+    directory it will collect suite files (see `is_suite_file`)
+    and ``test_*.py`` modules, while given file is always collected
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, directories, names in os.walk(path):
+                directories[:] = sorted(
+                    directory
+                    for directory in directories
+                    if not directory.startswith(".")
+                )
+                for name in sorted(names):
+                    file = os.path.join(root, name)
+                    if name.endswith(SUITE_EXTENSIONS):
+                        if is_suite_file(file):
+                            files.append(file)
+                    elif name.startswith("test_") and name.endswith(".py"):
+                        files.append(file)
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"There's no file or directory {path}")
+    return files
+
+
+def load_module(path: str):
+    """Import Python test module from file path"""
+    directory = os.path.dirname(os.path.abspath(path))
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+    name = f"maritest_cli_{zlib.crc32(os.path.abspath(path).encode('utf-8')):08x}"
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def iter_tests(suite: unittest.TestSuite):
+    """Flatten unittest suite into test cases"""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_tests(test)
+        else:
+            yield test
+
+
+def collect_units(files: Sequence[str]) -> List[WorkUnit]:
+    """
+    Collect work units from files, independent suite steps and
+    Python test cases are split as one unit per test case, while
+    suite that has extractors is kept as one unit
+    """
+    units: List[WorkUnit] = []
+    for path in files:
+        if path.endswith(SUITE_EXTENSIONS):
+            plan = load_plan(path)
+            if plan.is_independent:
+                units.extend(("suite", path, (index,)) for index in range(len(plan)))
+            else:
+                units.append(("suite", path, tuple(range(len(plan)))))
+        elif path.endswith(".py"):
+            module = load_module(path)
+            tests = unittest.defaultTestLoader.loadTestsFromModule(module)
+            units.extend(("python", path, (test.id(),)) for test in iter_tests(tests))
+        else:
+            raise ValueError(f"Unsupported file {path}")
+    return units
+
+
+def shard_units(units: Sequence[WorkUnit], index: int, total: int) -> List[WorkUnit]:
+    """
+    Returned units that belong to shard index (start from 1) of total,
+    based on stable hash so every machine compute the same split
+    """
+    if total == 1:
+        return list(units)
+    return [
+        unit
+        for unit in units
+        if zlib.crc32(f"{unit[1]}::{unit[2]}".encode("utf-8")) % total == index - 1
+    ]
+
+
+def run_python_test(path: str, test_id: str) -> CaseResult:
+    """Run one unittest test case by its id"""
+    module = load_module(path)
+    name = test_id.split(".", 1)[1] if "." in test_id else test_id
+    test = unittest.defaultTestLoader.loadTestsFromName(name, module)
+
+    start = time.perf_counter()
+    result = unittest.TestResult()
+    test.run(result)
+    failures = [
+        traceback.strip().splitlines()[-1]
+        for _, traceback in result.failures + result.errors
+    ]
+    if result.unexpectedSuccesses:
+        failures.append("unexpected success")
+    return CaseResult(
+        name=f"{path}::{name}",
+        passed=result.wasSuccessful(),
+        failures=failures,
+        duration=time.perf_counter() - start,
+    )
+
+
+def run_units(
+    units: Sequence[WorkUnit],
+    concurrency: int = 8,
+    fail_fast: bool = False,
+    variables: Optional[Dict[str, str]] = None,
+) -> List[CaseResult]:
+    """
+    Run work units in current process, independent suite test cases
+    are run concurrently by runner. Python test cases are run one at
+    a time, since they may patch global state (ex: `requests_mock`)
+    that affect other test cases, use workers or shard to spread
+    them out. This function is also the entry point of worker process
+    """
+    runner = Runner(concurrency=concurrency, fail_fast=fail_fast)
+    results: List[CaseResult] = []
+
+    suites: Dict[str, List[int]] = {}
+    python_tests: List[Tuple[str, str]] = []
+    for kind, path, selector in units:
+        if kind == "suite":
+            suites.setdefault(path, []).extend(selector)
+        else:
+            python_tests.append((path, selector[0]))
+
+    for path, indexes in suites.items():
+        plan = load_plan(path).select(indexes)
+        for result in plan.run(runner=runner, variables=variables):
+            result.name = f"{path}::{result.name}"
+            results.append(result)
+        if fail_fast and not all(result.passed for result in results):
+            return results
+
+    for test in python_tests:
+        result = run_python_test(*test)
+        results.append(result)
+        if fail_fast and not result.passed:
+            break
+    return results
+
+
+def execute(
+    units: Sequence[WorkUnit],
+    workers: int = 1,
+    concurrency: int = 8,
+    fail_fast: bool = False,
+    variables: Optional[Dict[str, str]] = None,
+) -> List[CaseResult]:
+    """
+    Execute work units, split them into worker processes if
+    workers more than one. With fail-fast, remaining chunk that
+    not started yet will be cancelled after the first failure
+    """
+    if workers <= 1 or len(units) <= 1:
+        return run_units(units, concurrency, fail_fast, variables)
+
+    # keep the units of the same file together, so each
+    # worker only need to load the suite file once
+    chunks: List[List[WorkUnit]] = [[] for _ in range(workers)]
+    for index, unit in enumerate(sorted(units, key=lambda unit: unit[1])):
+        chunks[index * workers // len(units)].append(unit)
+
+    results: List[CaseResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_units, chunk, concurrency, fail_fast, variables)
+            for chunk in chunks
+            if chunk
+        ]
+        for future in as_completed(futures):
+            results.extend(future.result())
+            if fail_fast and not all(result.passed for result in results):
+                for pending in futures:
+                    pending.cancel()
+                break
+    return results
+
+
+def summarize(results: Sequence[CaseResult], duration: float) -> dict:
+    passed = sum(1 for result in results if result.passed)
+    return {
+        "total": len(results),
+        "passed": passed,
+        "failed": len(results) - passed,
+        "duration": round(duration, 6),
+    }
+
+
+def format_text(results: Sequence[CaseResult], summary: dict) -> str:
+    lines = []
+    for result in results:
+        status = "PASSED" if result.passed else "FAILED"
+        lines.append(f"{status} {result.name} ({result.duration:.3f}s)")
+        for failure in result.failures:
+            lines.append(f"    - {failure}")
+        if result.error:
+            lines.append(f"    - {result.error}")
+    lines.append(
+        f"{summary['passed']} passed, {summary['failed']} failed "
+        f"in {summary['duration']:.2f}s"
+    )
+    return "\n".join(lines)
+
+
+def format_json(results: Sequence[CaseResult], summary: dict) -> str:
+    return json.dumps(
+        {"summary": summary, "results": [result.to_dict() for result in results]},
+        default=str,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Entry point of ``maritest`` command, returned exit code
+    0 if all test cases passed, 1 if one of them failed
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.concurrency < 1:
+        parser.error("--workers and --concurrency must be positive")
+
+    start = time.perf_counter()
+    try:
+        units = shard_units(collect_units(discover(args.paths)), *args.shard)
+    except (OSError, ValueError, ImportError) as error:
+        parser.error(str(error))
+
+    results = execute(
+        units,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        fail_fast=args.fail_fast,
+        variables=dict(args.var),
+    )
+    summary = summarize(results, time.perf_counter() - start)
+    formatter = format_json if args.format == "json" else format_text
+    output = formatter(results, summary)
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0 if summary["failed"] == 0 else 1
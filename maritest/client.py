@@ -3,6 +3,7 @@ try:
 except ImportError as e:
     raise Exception(f"Unable to imported `requests` package {e}")
 
+import os
 import urllib.parse
 import warnings
 import random
@@ -10,11 +11,21 @@ import urllib3
 
 from abc import abstractmethod
 from contextlib import contextmanager
-from typing import Tuple, Optional, Any
+from typing import Tuple, Optional, Any, Union, Iterable, List, Dict
 from requests.adapters import HTTPAdapter
 from requests.sessions import CaseInsensitiveDict, RequestsCookieJar
 
+from .result import DEFAULT_HEADERS, ResultRecord
+from .transport import BaseTransport, get_transport
+from .utils.circuit_breaker import CircuitBreakerRegistry, circuit_breakers
+from .utils import compression
+from .utils.compression import BodySize
+from .utils.digest import BodyDigest, digest_body
+from .utils.environment import environment_settings
+from .utils.exceptions import CircuitOpenError
 from .utils.factory import Logger
+from .utils.single_flight import in_flight, load_shared_response, request_key
+from .utils.upload import FileBody
 from .version import __version__
 
 # For our purposes,
@@ -57,7 +68,9 @@ class Http:
     :param auth: Authentication configuration for using
         HTTP client, by default set to None
     :param data: Append file like object in the request body,
-        set to None or optional.
+        set to None or optional. Path of file (path-like object),
+        `FileBody`, `IterableBody` and `MultipartEncoder` are streamed
+        without loading the whole body into memory
     :param files: Append file like object with defining
         content-type of that file. set to None or optional
     :param params: Append query string when request in url,
@@ -70,6 +83,30 @@ class Http:
     :param timeout: parameter to setup timeout argument whenever
         request is failed, the initial duration of timeout
         is random values, by default set to None or optional
+    :param circuit_breaker: Enable circuit breaker for the endpoint
+        of HTTP target, so request to failing endpoint will fail
+        fast with `CircuitOpenError`. Set True to use shared registry
+        or give `CircuitBreakerRegistry` instance, by default set to None
+    :param coalesce: Share one network call and response for identical
+        GET request (same url, params and headers) that in-flight
+        concurrently, by default set to False
+    :param transport: Transport layer to send the request, either
+        name of transport ("requests" or "http2") or `BaseTransport`
+        instance. By default set to None to use default transport
+    :param prepared: Prepared request that will be sent as it is,
+        skip the request preparation of session (ex: from `RequestTemplate`),
+        by default set to None
+    :param environment: Environment settings (proxies, verify, stream
+        and cert) that already merged, skip the lookup of environment
+        variables and netrc file, by default set to None
+    :param stream: Defer reading the response body until it's accessed,
+        so the body can be consumed incrementally (ex: `digest_body`)
+        in constant memory, by default set to False
+    :param accept_encoding: Content-encoding that accepted for the
+        response, True for all available (gzip, deflate, and br or zstd
+        if `brotli` or `zstandard` installed), False for ``identity`` only,
+        or name of encodings such as ``"gzip"`` or ``["br", "gzip"]``. By default set to None to
+        use the default ``Accept-Encoding`` header of `requests`
 
     Returned as HTTP response object
     """
@@ -91,6 +128,13 @@ class Http:
         auth: Optional[Tuple] = None,
         json: Optional[dict] = None,
         timeout: Optional[float] = None,
+        circuit_breaker: Optional[Union[bool, CircuitBreakerRegistry]] = None,
+        coalesce: bool = False,
+        transport: Optional[Union[str, BaseTransport]] = None,
+        prepared: Optional[requests.PreparedRequest] = None,
+        environment: Optional[dict] = None,
+        stream: bool = False,
+        accept_encoding: Optional[Union[bool, str, List[str]]] = None,
     ) -> None:
         self.event_hooks = event_hooks
         self.retry = retry
@@ -109,18 +153,29 @@ class Http:
         self.timeout = None
         self.response = None
         self.json = json or {}
+        if isinstance(data, os.PathLike):
+            data = FileBody(data)
         self.data = data or {}
         self.params = params or {}
         self.files = files or {}
         self.proxy = proxy or {}
         self.allow_redirects = allow_redirects
-        self.stream = False
+        self.stream = stream
         self.cert = None
         self.suppress_warning = suppress_warning
         self.auth = auth
         self.created_session = False  # flagging to close request session
         self.timeout = timeout
-
+        self.circuit_breaker = None
+        self.coalesce = coalesce
+        self.coalesced = False  # flagging response shared from other request
+        self.shared_response = None
+        self.transport = get_transport(transport)
+        self.body_digests: Dict[bool, BodyDigest] = {}
+        self.measured_size: Optional[BodySize] = None
+
+        # random timeout that generated when it wasn't set
+        self.default_timeout = timeout is None
         if timeout is None:
             self.timeout = self.random_timeout()
 
@@ -160,42 +215,113 @@ class Http:
                 self.suppress_warning = False
                 self.logger.info("[INFO] SSL verification status is enabled")
 
-        # wrap it our request
-        # and prepare it first before
-        # send it immediately
-        request = requests.Request(
-            method=self.method,
-            url=self.url,
-            headers=self.headers,
-            params=self.params,
-            data=self.data,
-            json=self.json,
-            files=self.files,
-            auth=self.auth,
-        )
+        if environment is None:
+            # before final request, check
+            # whether environment has proxies protocol or not
+            # if yes, then merged it as one. The settings are
+            # cached per host, see `environment_settings`
+            netrc_auth, update_request = environment_settings.resolve(
+                self.session,
+                url=self.url,
+                proxies=self.proxy,
+                stream=self.stream,
+                verify=self.suppress_warning,
+                cert=self.cert,
+            )
+        else:
+            netrc_auth, update_request = None, dict(environment)
+            update_request["stream"] = self.stream
+
+        if prepared is None:
+            # wrap it our request
+            # and prepare it first before
+            # send it immediately
+            request = requests.Request(
+                method=self.method,
+                url=self.url,
+                headers=self.headers,
+                params=self.params,
+                data=self.data,
+                json=self.json,
+                files=self.files,
+                auth=self.auth or netrc_auth,
+            )
+
+            # https://docs.python-requests.org/en/master/user/advanced/#session-objects
+            # netrc auth was already resolved, so skip reading netrc file again
+            self.session.trust_env = False
+            try:
+                prepare_request = self.session.prepare_request(request)
+            finally:
+                self.session.trust_env = True
+        else:
+            prepare_request = prepared
+
+        # streaming encoder (ex: multipart) know its own content-type
+        content_type = getattr(self.data, "content_type", None)
+        if content_type is not None and "Content-Type" not in prepare_request.headers:
+            prepare_request.headers["Content-Type"] = content_type
+
+        if accept_encoding is not None:
+            prepare_request.headers["Accept-Encoding"] = compression.accept_encoding(
+                accept_encoding
+            )
 
-        # https://docs.python-requests.org/en/master/user/advanced/#session-objects
-        prepare_request = self.session.prepare_request(request)
-
-        # before final request, check
-        # whether environment has proxies protocol or not
-        # if yes, then merged it as one
-        update_request = self.session.merge_environment_settings(
-            url=self.url,
-            proxies=self.proxy,
-            stream=self.stream,
-            verify=self.suppress_warning,
-            cert=self.cert,
-        )
         kwargs = {"allow_redirects": self.allow_redirects, "timeout": self.timeout}
         kwargs.update(update_request)
 
+        # fail fast without touching the network
+        # whenever the endpoint circuit was open
+        if circuit_breaker is True:
+            circuit_breaker = circuit_breakers
+        if isinstance(circuit_breaker, CircuitBreakerRegistry):
+            self.circuit_breaker = circuit_breaker.get(self.url)
+            if not self.circuit_breaker.allow_request():
+                self.logger.warning(
+                    f"[WARNING] Circuit is open for endpoint => {circuit_breaker.endpoint(self.url)}"
+                )
+                raise CircuitOpenError(
+                    endpoint=circuit_breaker.endpoint(self.url),
+                    retry_after=self.circuit_breaker.retry_after,
+                )
+
+        try:
+            if self.coalesce and self.method == "GET":
+                self.coalesce_request(prepare_request, **kwargs)
+            else:
+                self.send_request(prepare_request, **kwargs)
+        except Exception:
+            if self.circuit_breaker is not None and not self.coalesced:
+                self.circuit_breaker.record_failure()
+            raise
+
+        # only the leader of coalesced request
+        # that count the outcome into the circuit
+        if self.circuit_breaker is not None and not self.coalesced:
+            if self.response.status_code >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+
+        self.http_log_response()
+
+        if event_hooks:
+            # if event hooks was set to True
+            # call the valid response name instead
+            # only call the message from related assertion
+            self.response.raise_for_status()
+
+    def send_request(self, prepare_request: requests.PreparedRequest, **kwargs):
+        """
+        Internal method to send prepared request with
+        the session and stored the HTTP response
+        """
         try:
             with self.session as s:
 
                 self.http_log_request()
 
-                if retry:
+                if self.retry:
                     self.retry = urllib3.util.Retry(
                         total=3,
                         status_forcelist=[429, 500, 502, 503, 504],
@@ -212,7 +338,9 @@ class Http:
                         s.mount("http://", adapter)
                 else:
                     self.logger.info("[INFO] HTTP retry method might be turned it off")
-                self.response = s.send(request=prepare_request, **kwargs)
+                self.response = self.transport.send(
+                    prepare_request, session=s, **kwargs
+                )
                 self.response.encoding = "utf-8"
         except requests.exceptions.Timeout as error:
             # temporary using requests exception
@@ -230,13 +358,33 @@ class Http:
         except Exception as error:
             raise Exception(f"Other exception was occur {error}")
 
-        self.http_log_response()
+    def coalesce_request(self, prepare_request: requests.PreparedRequest, **kwargs):
+        """
+        Internal method to send prepared request once for all
+        identical GET request that in-flight concurrently
+        """
 
-        if event_hooks:
-            # if event hooks was set to True
-            # call the valid response name instead
-            # only call the message from related assertion
-            self.response.raise_for_status()
+        def send():
+            self.coalesced = False
+            self.send_request(prepare_request, **kwargs)
+            return load_shared_response(self.response)
+
+        # flagged as coalesced until this instance
+        # turn out to be the leader of the request
+        self.coalesced = True
+        options = dict(kwargs, retry=bool(self.retry))
+        if self.default_timeout:
+            # random default timeout doesn't make the requests different
+            options["timeout"] = None
+        key = request_key(prepare_request, **options)
+        self.shared_response, shared = in_flight.do(key, send)
+        if self.coalesced:
+            # waiter own its response, so closing it doesn't affect the others
+            self.response = self.shared_response.copy()
+        else:
+            self.response = self.shared_response.response
+        if shared:
+            self.logger.info(f"[INFO] HTTP Response was coalesced => {self.url}")
 
     def __str__(self) -> str:
         if self.method and self.url is not None:
@@ -265,7 +413,103 @@ class Http:
         # all HTTP response can't be accessible again, so for example:
         # if you tend to get the HTTP headers outside Http() class scope,
         # you wont get any response for that
-        self.response.close()
+        if self.response is not None:
+            self.response.close()
+
+    def release(self) -> None:
+        """
+        Release the response and session of this instance, so
+        the body could be garbage collected. The property methods
+        can't be used anymore after the response was released
+        """
+        if self.response is not None:
+            self.response.close()
+        self.response = None
+        self.shared_response = None
+        if self.created_session:
+            self.session.close()
+            self.created_session = False
+
+    def to_record(
+        self,
+        headers: Iterable[str] = DEFAULT_HEADERS,
+        assertions: Optional[Iterable[Tuple[str, Optional[str]]]] = None,
+        release: bool = True,
+    ) -> ResultRecord:
+        """
+        Emit compact result of the request that can be
+        retained at scale, see `ResultRecord`
+
+        :param headers: name of response headers that kept in the record
+        :param assertions: pairs of assertion name and failure message
+        :param release: release the response after the record
+            was created, by default set to True
+
+        Returned as result record
+        """
+        record = ResultRecord.from_http(self, headers=headers, assertions=assertions)
+        if release:
+            self.release()
+        return record
+
+    def digest_body(self, *algorithms: str, decode_content: bool = True) -> BodyDigest:
+        """
+        Compute digests of response body incrementally, all algorithms
+        are computed in one pass and cached (SHA-256 is always included).
+        With ``stream=True`` the body is hashed while it's read from the
+        network and never held in memory, so all algorithms that needed
+        should be requested at once, since the body can only be read once
+
+        :param algorithms: name of algorithms, such as ``sha256``, ``md5`` or ``crc32``
+        :param decode_content: compute from decoded body, or from body
+            as it was sent on the wire. By default set to True
+
+        Returned as `BodyDigest`
+        """
+        if self.response.headers.get("Content-Encoding", "identity") == "identity":
+            # the body on the wire is the same as decoded one
+            decode_content = True
+        cached = self.body_digests.get(decode_content)
+        if cached is not None and all(algorithm in cached for algorithm in algorithms):
+            return cached
+        names = {"sha256", *algorithms}
+        if cached is not None:
+            names.update(cached.algorithms)
+        if self._is_unread_stream():
+            digests = {decode_content: BodyDigest(names, decoded=decode_content)}
+            self._measure_stream(digests)
+        else:
+            self.body_digests[decode_content] = digest_body(
+                self.response, names, decode_content=decode_content
+            )
+        return self.body_digests[decode_content]
+
+    def body_size(self) -> BodySize:
+        """
+        Measure size of response body on the wire and after decoded, with
+        ``stream=True`` the body is decompressed chunk by chunk only to be
+        counted, so it's not held in memory (see `measure_body`). The
+        SHA-256 digest of streamed body is computed in the same pass
+
+        Returned as `BodySize`, it's only measured once
+        """
+        if self.measured_size is None:
+            if self._is_unread_stream():
+                self._measure_stream({})
+            else:
+                self.measured_size = compression.measure_body(self.response)
+        return self.measured_size
+
+    def _is_unread_stream(self) -> bool:
+        # private attribute of `requests`, False until the body was read
+        return self.response._content is False and not self.response._content_consumed
+
+    def _measure_stream(self, digests: Dict[bool, BodyDigest]) -> None:
+        # streamed body can only be read once, so its size and the
+        # digest for the record are always computed in the same pass
+        digests.setdefault(True, BodyDigest({"sha256"}))
+        self.measured_size = compression.measure_body(self.response, digests=digests)
+        self.body_digests.update(digests)
 
     def __del__(self):
         # delete all adapters based on the request.session(),
@@ -301,6 +545,8 @@ class Http:
     @property
     def get_json(self) -> Any:
         """Property method to return response in JSON format"""
+        if self.shared_response is not None:
+            return self.shared_response.json()
         return self.response.json()
 
     @property
@@ -419,7 +665,14 @@ class Http:
         raise NotImplementedError
 
     @abstractmethod
-    def assert_json_to_equal(self, obj, message: str):
+    def assert_json_to_equal(
+        self,
+        obj,
+        message: str,
+        ignore_paths: Optional[List[str]] = None,
+        unordered: Union[bool, List[str]] = False,
+        max_diffs: int = 10,
+    ):
         raise NotImplementedError
 
     @abstractmethod
@@ -1,5 +1,10 @@
+import threading
+import time
+import urllib.parse
+import requests
+
 from base64 import b64encode
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 from requests.auth import AuthBase, HTTPDigestAuth, HTTPBasicAuth
 from requests import models
 
@@ -16,8 +21,11 @@ class BearerAuth(AuthBase):
         if not isinstance(token, str):
             raise TypeError("Bearer token must be string of object")
 
+        # header value is static, so build it once
+        self.header = f"Bearer {self.token}"
+
     def __call__(self, r: models.PreparedRequest) -> models.PreparedRequest:
-        r.headers["Authorization"] = f"Bearer {self.token}"
+        r.headers["Authorization"] = self.header
         return r
 
 
@@ -33,9 +41,13 @@ class BasicAuthToken(AuthBase):
         if not isinstance(token, str):
             raise TypeError("Basic auth token must be string of object")
 
-    def __call__(self, r: models.PreparedRequest) -> models.PreparedRequest:
+        # encode the token once instead of
+        # re-encoded it for every request
         encode = b64encode(f"token: {self.token}".encode("utf-8")).decode("utf-8")
-        r.headers["Authorization"] = f"Basic {encode}"
+        self.header = f"Basic {encode}"
+
+    def __call__(self, r: models.PreparedRequest) -> models.PreparedRequest:
+        r.headers["Authorization"] = self.header
         return r
 
 
@@ -97,6 +109,164 @@ class ApiKeyAuth(AuthBase):
         return r
 
 
+class OAuth2Auth(AuthBase):
+    """
+    Custom OAuth2 authentication with client credentials
+    or refresh token grant. The access token is cached
+    in memory until expired and refreshed in background
+    before the expiry time, so all request that share this
+    auth instance will not fetch a token per request
+
+    :param token_url: token endpoint of authorization server, string type
+    :param client_id: client identifier, string type
+    :param client_secret: client secret, string type but optional
+        for public client
+    :param scope: scope of access request, separated by space.
+        Optional and by default set to None
+    :param refresh_token: if set, token will be requested with
+        refresh token grant instead of client credentials
+    :param refresh_margin: duration in seconds before the token expired
+        to refresh it in background, by default set to 60 seconds
+    :param timeout: timeout when request to token endpoint,
+        by default set to 10 seconds
+    :param clock: callable that returned current time in seconds,
+        by default set to `time.monotonic`
+    """
+
+    def __init__(
+        self,
+        token_url: str,
+        client_id: str,
+        client_secret: Optional[str] = None,
+        scope: Optional[str] = None,
+        refresh_token: Optional[str] = None,
+        refresh_margin: float = 60.0,
+        timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not isinstance(token_url, str) or not isinstance(client_id, str):
+            raise TypeError("`token_url` and `client_id` must be string object")
+
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.refresh_token = refresh_token
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.clock = clock
+
+        self.access_token: Optional[str] = None
+        self.header: Optional[str] = None
+        self.expires_at = 0.0
+        self.refresh_count = 0
+
+        self._lock = threading.Lock()
+        self._background: Optional[threading.Thread] = None
+
+    def __call__(self, r: models.PreparedRequest) -> models.PreparedRequest:
+        now = self.clock()
+        if self.header is None or now >= self.expires_at:
+            # no valid token at all, every
+            # request have to wait for it
+            self.refresh()
+        elif now >= self.expires_at - self.refresh_margin:
+            self.refresh_in_background()
+        r.headers["Authorization"] = self.header
+        return r
+
+    @property
+    def is_expired(self) -> bool:
+        """Property method to return whether cached token was expired"""
+        return self.header is None or self.clock() >= self.expires_at
+
+    def refresh(self, force: bool = False) -> str:
+        """
+        Fetch new access token from token endpoint. Concurrent
+        callers are deduplicated, only one of them will fetch
+        while the others wait and use the same token
+
+        :param force: fetch the token even though the cached one still valid
+
+        Returned as the access token
+        """
+        with self._lock:
+            # other caller might already refreshed it while we wait
+            if not force and not self._should_refresh():
+                return self.access_token
+            self._fetch_token()
+            return self.access_token
+
+    def refresh_in_background(self) -> None:
+        """Refresh access token with daemon thread if not already running"""
+        with self._lock:
+            if self._background is not None and self._background.is_alive():
+                return
+            self._background = threading.Thread(
+                target=self._background_refresh, daemon=True
+            )
+            self._background.start()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until background refresh is finished, if any"""
+        background = self._background
+        if background is not None:
+            background.join(timeout)
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            # the cached token still valid until expiry,
+            # next request will try to refresh it again
+            pass
+
+    def _should_refresh(self) -> bool:
+        if self.header is None:
+            return True
+        return self.clock() >= self.expires_at - self.refresh_margin
+
+    def _fetch_token(self) -> None:
+        if self.refresh_token is not None:
+            payload = {
+                "grant_type": "refresh_token",
+                "refresh_token": self.refresh_token,
+            }
+        else:
+            payload = {"grant_type": "client_credentials"}
+        if self.scope is not None:
+            payload["scope"] = self.scope
+
+        auth = None
+        if self.client_secret is not None:
+            auth = HTTPBasicAuth(self.client_id, self.client_secret)
+        else:
+            payload["client_id"] = self.client_id
+
+        try:
+            response = requests.post(
+                self.token_url, data=payload, auth=auth, timeout=self.timeout
+            )
+            response.raise_for_status()
+            body = response.json()
+            access_token = body["access_token"]
+        except requests.exceptions.RequestException as error:
+            raise Exception(f"Unable to fetch OAuth2 access token {error}")
+        except (KeyError, ValueError) as error:
+            raise Exception(f"Invalid OAuth2 token response {error}")
+
+        token_type = str(body.get("token_type", "Bearer"))
+        if token_type.lower() == "bearer":
+            token_type = "Bearer"
+
+        # server might be rotated the refresh token
+        self.refresh_token = body.get("refresh_token", self.refresh_token)
+        self.access_token = access_token
+        self.expires_at = self.clock() + float(body.get("expires_in", 3600))
+        self.header = f"{token_type} {access_token}"
+        self.refresh_count += 1
+
+
 class BasicAuth(HTTPBasicAuth):
     """
     this only inherit from requests module,
@@ -113,3 +283,115 @@ class DigestAuth(HTTPDigestAuth):
     """
 
     pass
+
+
+class DigestChallengeCache:
+    """
+    Thread-safe cache for server digest challenge (realm, nonce,
+    qop, opaque) per host, with nonce count (nc) that shared
+    across requests, threads and auth instances
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._challenges: Dict[str, Tuple[dict, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._challenges)
+
+    @staticmethod
+    def host(url: str) -> str:
+        """Given url, returned cache key of scheme and host"""
+        parse_url = urllib.parse.urlparse(url)
+        return f"{parse_url.scheme}://{parse_url.netloc}".lower()
+
+    def reserve(self, url: str) -> Optional[Tuple[dict, int]]:
+        """
+        Returned cached challenge of related host with
+        the next nonce count, or None if not cached yet
+        """
+        host = self.host(url)
+        with self._lock:
+            cached = self._challenges.get(host)
+            if cached is None:
+                return None
+            challenge, nonce_count = cached
+            nonce_count += 1
+            self._challenges[host] = (challenge, nonce_count)
+            return dict(challenge), nonce_count
+
+    def store(self, url: str, challenge: dict, nonce_count: int) -> None:
+        """Store the latest challenge and the nonce count that already used"""
+        host = self.host(url)
+        with self._lock:
+            cached = self._challenges.get(host)
+            if cached is not None and cached[0].get("nonce") == challenge.get("nonce"):
+                # other thread might be used higher count for the same nonce
+                nonce_count = max(nonce_count, cached[1])
+            self._challenges[host] = (dict(challenge), nonce_count)
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Remove challenge for related url, or remove all of them if not set"""
+        with self._lock:
+            if url is None:
+                self._challenges.clear()
+            else:
+                self._challenges.pop(self.host(url), None)
+
+
+# default cache that shared
+# for all CachedDigestAuth instances
+digest_challenges = DigestChallengeCache()
+
+
+class CachedDigestAuth(HTTPDigestAuth):
+    """
+    Digest authentication that reuse the server challenge
+    per host across requests and threads, so only the first
+    request need 401 challenge round trip while the next
+    requests send the Authorization header with the cached
+    nonce and incremented nonce count straight away
+
+    :param username: username for digest auth, string type
+    :param password: password for digest auth, string type
+    :param challenges: cache of digest challenge, by default
+        using module-level cache that shared for all instances
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        challenges: Optional[DigestChallengeCache] = None,
+    ) -> None:
+        super().__init__(username, password)
+        self.challenges = challenges if challenges is not None else digest_challenges
+
+    def __call__(self, r: models.PreparedRequest) -> models.PreparedRequest:
+        self.init_per_thread_state()
+        cached = self.challenges.reserve(r.url)
+        if cached is not None:
+            challenge, nonce_count = cached
+            # build_digest_header will increment
+            # the count for the same nonce by itself
+            self._thread_local.chal = challenge
+            self._thread_local.last_nonce = challenge["nonce"]
+            self._thread_local.nonce_count = nonce_count - 1
+        else:
+            self._thread_local.last_nonce = ""
+        return super().__call__(r)
+
+    def handle_401(self, r: models.Response, **kwargs) -> models.Response:
+        response = super().handle_401(r, **kwargs)
+        if response is not r:
+            # challenge was answered, cache it for
+            # the next request unless still rejected
+            if response.status_code == 401:
+                self.challenges.invalidate(r.request.url)
+            else:
+                self.challenges.store(
+                    r.request.url,
+                    self._thread_local.chal,
+                    self._thread_local.nonce_count,
+                )
+        return response
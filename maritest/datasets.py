@@ -0,0 +1,169 @@
+import csv
+import json
+import os
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from .runner import CaseResult, Runner
+from .suite import PlanStep, compile_assertion
+from .utils.template import Template
+
+# format of dataset file based on its extension
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class Dataset:
+    """
+    Dataset of parameters that streamed lazily from CSV or
+    JSON Lines file, only one row is kept in memory at a time
+    so the size of dataset doesn't matter. CSV values are
+    string type, while JSON Lines keep the type of values
+
+    :param path: path of dataset file
+    :param format: format of dataset, ``csv`` or ``jsonl``,
+        by default it's detected from the file extension
+    :param encoding: encoding of dataset file, by default set to utf-8
+    :param limit: maximum numbers of rows to be read, by default
+        set to None which means all rows
+    """
+
+    def __init__(
+        self,
+        path: str,
+        format: Optional[str] = None,
+        encoding: str = "utf-8",
+        limit: Optional[int] = None,
+    ) -> None:
+        if format is None:
+            format = FORMATS.get(os.path.splitext(path)[1].lower())
+        if format not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported dataset format of {path}")
+
+        self.path = path
+        self.format = format
+        self.encoding = encoding
+        self.limit = limit
+
+    def __repr__(self) -> str:
+        return f"<Dataset:{self.format}=>{self.path}>"
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        rows = self.iter_csv() if self.format == "csv" else self.iter_jsonl()
+        for index, row in enumerate(rows):
+            if self.limit is not None and index >= self.limit:
+                break
+            yield row
+
+    def iter_csv(self) -> Iterator[Dict[str, Any]]:
+        """Yielded every row of CSV file as dict, the header is used as keys"""
+        with open(self.path, newline="", encoding=self.encoding) as f:
+            yield from csv.DictReader(f)
+
+    def iter_jsonl(self) -> Iterator[Dict[str, Any]]:
+        """Yielded every line of JSON Lines file, blank lines are skipped"""
+        with open(self.path, encoding=self.encoding) as f:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError(
+                        f"Line {number} of {self.path} must be JSON object"
+                    )
+                yield row
+
+
+class _Row:
+    """Private item of data-driven test case that passed into runner"""
+
+    __slots__ = ("name", "variables")
+
+    def __init__(self, name: str, variables: Dict[str, Any]) -> None:
+        self.name = name
+        self.variables = variables
+
+
+class DataDriven:
+    """
+    Data-driven test case that run the same request and
+    assertions for every row of dataset. The request and
+    assertions are compiled once, then rendered per row with
+    the columns as ``${name}`` variables. For example :
+
+    >>> DataDriven(
+    ...     name="get user",
+    ...     dataset=Dataset("users.csv"),
+    ...     request={"method": "GET", "url": "https://api.com/users/${id}", "headers": {}},
+    ...     assertions=["assert_is_2xx_status", {"assert_status_code_in": [200]}],
+    ... )
+
+    :param name: name of test case, the result of every row
+        will be named as ``name[row number]``
+    :param dataset: iterable of rows (ex: `Dataset`)
+    :param request: keyword arguments for `Assert`, with placeholder
+    :param assertions: list of assertion as in suite file, such as
+        ``assert_is_2xx_status`` or ``{"assert_status_code_in": [200]}``
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dataset: Any,
+        request: Dict[str, Any],
+        assertions: Optional[List[Any]] = None,
+    ) -> None:
+        request = dict(request)
+        request.setdefault("headers", {})
+        self.name = name
+        self.dataset = dataset
+        self.step = PlanStep(
+            name=name,
+            request=Template(request),
+            assertions=[compile_assertion(name, entry) for entry in assertions or []],
+        )
+
+    def __repr__(self) -> str:
+        return f"<DataDriven:{self.name}=>{self.dataset!r}>"
+
+    def rows(self, variables: Optional[Dict[str, Any]] = None) -> Iterator[_Row]:
+        """Yielded item of runner for every row, lazily"""
+        for number, row in enumerate(self.dataset, start=1):
+            context = dict(variables) if variables else {}
+            context.update(row)
+            yield _Row(f"{self.name}[{number}]", context)
+
+    def run_row(self, row: _Row) -> CaseResult:
+        result = self.step.run(row.variables)
+        result.name = row.name
+        return result
+
+    def iterate(
+        self,
+        runner: Optional[Runner] = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[CaseResult]:
+        """
+        Run test case for every row concurrently, rows are read
+        only when the runner has room for it (backpressure)
+
+        :param runner: concurrent runner, by default using `Runner()`
+        :param variables: variables that available for every row,
+            the column of row take precedence
+
+        Yielded as result of every row in order of dataset
+        """
+        runner = runner or Runner()
+        return runner.iterate(self.run_row, self.rows(variables))
+
+    def run(
+        self,
+        runner: Optional[Runner] = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> List[CaseResult]:
+        """
+        Run test case for every row and collect all results,
+        use `iterate` for large dataset to keep memory flat
+
+        Returned as list of result in order of dataset
+        """
+        return list(self.iterate(runner=runner, variables=variables))
@@ -0,0 +1,455 @@
+from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from .utils.exceptions import ExpectationError
+from .utils.json_diff import json_diff
+from .utils.json_path import compile_path, format_path, resolve
+
+# sentinel for argument that
+# wasn't set by the user
+MISSING = object()
+
+
+class ResponseView:
+    """
+    Parsed view of HTTP response that shared for all checks
+    in one evaluation pass. Status, headers and duration are
+    read once, while JSON body only decoded on first access
+
+    :param http: `Http` instance that already have response
+    """
+
+    def __init__(self, http) -> None:
+        response = http.response
+        self.http = http
+        self.status_code: int = response.status_code
+        self.headers = response.headers
+        self.duration: float = response.elapsed.total_seconds()
+        self._json: Any = MISSING
+
+    @property
+    def content(self) -> bytes:
+        """Property method to return response body in bytes"""
+        return self.http.response.content
+
+    @property
+    def text(self) -> str:
+        """Property method to return response body in unicode"""
+        return self.http.response.text
+
+    @property
+    def json(self) -> Any:
+        """Property method to return decoded JSON body, only decoded once"""
+        if self._json is MISSING:
+            self._json = self.http.get_json
+        return self._json
+
+
+# check function that returned None if
+# passed, otherwise returned failure reason
+Check = Callable[[ResponseView], Optional[str]]
+
+
+class BaseExpectation:
+    """
+    Base class of chainable expectation builder, every method only
+    collect the check and returned itself, then all checks are
+    evaluated in one pass over one view (see `view` method) by
+    `verify` method that report all failures together instead of
+    stop at the first one
+    """
+
+    def __init__(self) -> None:
+        self.checks: List[Tuple[str, Callable[[Any], Optional[str]]]] = []
+
+    def __len__(self) -> int:
+        return len(self.checks)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}:{len(self.checks)} checks>"
+
+    def satisfy(self, check: Callable[[Any], Optional[str]], description: str):
+        """
+        Add custom check into expectation
+
+        :param check: callable that receive the view and returned
+            None if passed, otherwise returned reason of failure
+        :param description: short description of the check
+        """
+        self.checks.append((description, check))
+        return self
+
+    def view(self) -> Any:
+        """Returned view that shared for all checks in one evaluation pass"""
+        raise NotImplementedError
+
+    def evaluate(self) -> List[Tuple[str, Optional[str]]]:
+        """
+        Evaluate all checks in one pass over one view
+
+        Returned as list of pair of description and failure
+        reason (None if the check is passed)
+        """
+        view = self.view()
+        outcomes = []
+        for description, check in self.checks:
+            try:
+                failure = check(view)
+            except Exception as error:
+                failure = f"raised {error!r}"
+            outcomes.append((description, failure))
+        return outcomes
+
+    def verify(self, message: str = None):
+        """
+        Evaluate all checks and raise `ExpectationError`
+        with all failures if one of them failed
+
+        :param message: message that returned if all checks passed
+        """
+        failures = [
+            f"{description}, {failure}"
+            for description, failure in self.evaluate()
+            if failure is not None
+        ]
+        if failures:
+            raise ExpectationError(failures)
+        return message
+
+
+class Expectation(BaseExpectation):
+    """
+    Chainable expectation builder for HTTP response, every
+    method only collect the check and returned itself, then all
+    checks are evaluated in one pass by `verify` method that
+    report all failures together instead of stop at the first one.
+    For example :
+
+        request.expect().status_2xx().header("Content-Type").json_path("$.id", 1).verify()
+
+    :param http: `Http` instance that already have response
+    """
+
+    def __init__(self, http) -> None:
+        super().__init__()
+        self.http = http
+
+    def satisfy(self, check: Check, description: str) -> "Expectation":
+        """
+        Add custom check into expectation
+
+        :param check: callable that receive `ResponseView` and returned
+            None if passed, otherwise returned reason of failure
+        :param description: short description of the check
+        """
+        return super().satisfy(check, description)
+
+    def status(self, *status_code: int) -> "Expectation":
+        """Expect status code in one of expected status code"""
+        expected = frozenset(int(code) for code in status_code)
+
+        def check(view: ResponseView) -> Optional[str]:
+            if view.status_code not in expected:
+                return f"was {view.status_code}"
+
+        return self.satisfy(check, f"status code in {sorted(expected)}")
+
+    def status_range(self, start: int, stop: int) -> "Expectation":
+        """Expect status code in range of start (inclusive) and stop (exclusive)"""
+
+        def check(view: ResponseView) -> Optional[str]:
+            if not start <= view.status_code < stop:
+                return f"was {view.status_code}"
+
+        return self.satisfy(check, f"status code in range {start}-{stop - 1}")
+
+    def status_2xx(self) -> "Expectation":
+        """Expect status code in range 2xx"""
+        return self.status_range(200, 300)
+
+    def status_3xx(self) -> "Expectation":
+        """Expect status code in range 3xx"""
+        return self.status_range(300, 400)
+
+    def status_4xx(self) -> "Expectation":
+        """Expect status code in range 4xx"""
+        return self.status_range(400, 500)
+
+    def status_5xx(self) -> "Expectation":
+        """Expect status code in range 5xx"""
+        return self.status_range(500, 600)
+
+    def header(self, name: str, value: Any = MISSING) -> "Expectation":
+        """Expect response has header, and equal to value if set"""
+
+        def check(view: ResponseView) -> Optional[str]:
+            actual = view.headers.get(name)
+            if actual is None:
+                return "header wasn't set"
+            if value is not MISSING and actual != value:
+                return f"was {actual!r}"
+
+        if value is MISSING:
+            return self.satisfy(check, f"header {name!r} exists")
+        return self.satisfy(check, f"header {name!r} equal to {value!r}")
+
+    def content_type(self, value: str) -> "Expectation":
+        """Expect content-type header equal to value"""
+        return self.header("Content-Type", value)
+
+    def json_path(self, path: str, expected: Any = MISSING) -> "Expectation":
+        """
+        Expect value of JSON path exists in body,
+        and equal to expected value if set
+
+        :param path: JSON path expression such as ``$.data[0].id``
+        :param expected: expected value, optional
+        """
+        segments = compile_path(path)
+        formatted = format_path(segments)
+
+        def check(view: ResponseView) -> Optional[str]:
+            try:
+                actual = resolve(view.json, segments)
+            except (LookupError, IndexError):
+                return "path not found"
+            if expected is not MISSING and actual != expected:
+                return f"was {actual!r}"
+
+        if expected is MISSING:
+            return self.satisfy(check, f"JSON path {formatted} exists")
+        return self.satisfy(check, f"JSON path {formatted} equal to {expected!r}")
+
+    def json_equal(
+        self,
+        obj: Any,
+        ignore_paths: Optional[List[str]] = None,
+        unordered: Union[bool, List[str]] = False,
+    ) -> "Expectation":
+        """
+        Expect the whole JSON body equal to object, see
+        `json_diff` for ``ignore_paths`` and ``unordered``
+        """
+
+        def check(view: ResponseView) -> Optional[str]:
+            differences = json_diff(
+                view.json,
+                obj,
+                ignore_paths=ignore_paths,
+                unordered=unordered,
+                max_diffs=3,
+            )
+            if differences:
+                return "; ".join(str(difference) for difference in differences)
+
+        return self.satisfy(check, "JSON body equal to expected object")
+
+    def body_contains(self, text: str) -> "Expectation":
+        """Expect response body contains text"""
+
+        def check(view: ResponseView) -> Optional[str]:
+            if text not in view.text:
+                return "text not found"
+
+        return self.satisfy(check, f"body contains {text!r}")
+
+    def response_time(self, duration: float) -> "Expectation":
+        """Expect response time less than or equal to duration in seconds"""
+
+        def check(view: ResponseView) -> Optional[str]:
+            if view.duration > duration:
+                return f"was {view.duration} seconds"
+
+        return self.satisfy(check, f"response time <= {duration} seconds")
+
+    def view(self) -> ResponseView:
+        """Returned parsed view of response that shared for all checks"""
+        return ResponseView(self.http)
+
+
+class BatchView:
+    """
+    Aggregated view of all results in `ResultStore` that shared
+    for all batch checks in one evaluation pass. Status codes are
+    counted once, and latency percentiles of every percentile that
+    needed by the checks are computed together in one group-by
+
+    :param store: `ResultStore` that contains results of the run
+    :param percentiles: percentiles that needed by the checks
+    """
+
+    def __init__(self, store, percentiles: FrozenSet[float] = frozenset()) -> None:
+        self.store = store
+        self.percentiles = tuple(sorted(percentiles))
+        self.total: int = len(store)
+        self._status_counts: Optional[Counter] = None
+        self._groups: Dict[str, Dict[Any, Dict[str, float]]] = {}
+
+    @property
+    def status_counts(self) -> Counter:
+        """Property method to return numbers of response per status code"""
+        if self._status_counts is None:
+            self._status_counts = Counter(self.store.columns["status_code"])
+        return self._status_counts
+
+    def count(self, predicate: Callable[[int], bool]) -> int:
+        """Returned numbers of response that status code matched the predicate"""
+        return sum(
+            count
+            for status_code, count in self.status_counts.items()
+            if predicate(status_code)
+        )
+
+    def group(self, by: str) -> Dict[Any, Dict[str, float]]:
+        """Returned statistics of results per group, only aggregated once"""
+        if by not in self._groups:
+            self._groups[by] = self.store.group_by(by, percentiles=self.percentiles)
+        return self._groups[by]
+
+    @property
+    def overall(self) -> Dict[str, float]:
+        """Property method to return statistics of all results as one group"""
+        if "overall" not in self._groups:
+            self._groups["overall"] = self.store.group_by(
+                (), percentiles=self.percentiles
+            ).get((), {})
+        return self._groups["overall"]
+
+
+# batch check function that returned None
+# if passed, otherwise returned failure reason
+BatchCheck = Callable[[BatchView], Optional[str]]
+
+
+class BatchExpectation(BaseExpectation):
+    """
+    Chainable expectation builder for results of the whole run,
+    such as 99.9% of responses are 2xx, no 5xx at all or p95 latency
+    per endpoint under 300ms. The checks are evaluated together over
+    the columns of `ResultStore` instead of response by response.
+    For example :
+
+        store.expect().status_2xx(ratio=0.999).no_5xx().latency(95, 0.3).verify()
+
+    :param store: `ResultStore` that contains results of the run
+    """
+
+    def __init__(self, store) -> None:
+        super().__init__()
+        self.store = store
+        self.percentiles: set = set()
+
+    def satisfy(self, check: BatchCheck, description: str) -> "BatchExpectation":
+        """
+        Add custom check into expectation
+
+        :param check: callable that receive `BatchView` and returned
+            None if passed, otherwise returned reason of failure
+        :param description: short description of the check
+        """
+        return super().satisfy(check, description)
+
+    def _status_ratio(
+        self, predicate: Callable[[int], bool], ratio: float, description: str
+    ) -> "BatchExpectation":
+        def check(view: BatchView) -> Optional[str]:
+            if not view.total:
+                return "there's no result"
+            actual = view.count(predicate) / view.total
+            if actual < ratio:
+                return f"was {actual:.4%} of {view.total} responses"
+
+        return self.satisfy(check, f"{ratio:.4%} of responses {description}")
+
+    def status(self, *status_code: int, ratio: float = 1.0) -> "BatchExpectation":
+        """
+        Expect status code in one of expected status code
+
+        :param status_code: expected status codes
+        :param ratio: minimum ratio of responses, by default all of them
+        """
+        expected = frozenset(int(code) for code in status_code)
+        return self._status_ratio(
+            expected.__contains__, ratio, f"status code in {sorted(expected)}"
+        )
+
+    def status_range(
+        self, start: int, stop: int, ratio: float = 1.0
+    ) -> "BatchExpectation":
+        """
+        Expect status code in range of start (inclusive) and stop (exclusive)
+
+        :param ratio: minimum ratio of responses, by default all of them
+        """
+        return self._status_ratio(
+            lambda code: start <= code < stop,
+            ratio,
+            f"status code in range {start}-{stop - 1}",
+        )
+
+    def status_2xx(self, ratio: float = 1.0) -> "BatchExpectation":
+        """Expect status code in range 2xx, at least for the ratio of responses"""
+        return self.status_range(200, 300, ratio)
+
+    def no_status_range(self, start: int, stop: int) -> "BatchExpectation":
+        """Expect none of status code in range of start (inclusive) and stop (exclusive)"""
+
+        def check(view: BatchView) -> Optional[str]:
+            found = view.count(lambda code: start <= code < stop)
+            if found:
+                return f"found {found} responses"
+
+        return self.satisfy(check, f"no status code in range {start}-{stop - 1}")
+
+    def no_5xx(self) -> "BatchExpectation":
+        """Expect none of status code in range 5xx"""
+        return self.no_status_range(500, 600)
+
+    def no_errors(self) -> "BatchExpectation":
+        """Expect all requests got response (ex: no connection error or timeout)"""
+        return self.no_status_range(0, 1)
+
+    def failure_rate(self, rate: float) -> "BatchExpectation":
+        """Expect ratio of failed test cases less than or equal to rate"""
+
+        def check(view: BatchView) -> Optional[str]:
+            actual = view.overall.get("failure_rate", 0.0)
+            if actual > rate:
+                return f"was {actual:.4%}"
+
+        return self.satisfy(check, f"failure rate <= {rate:.4%}")
+
+    def latency(
+        self, percentile: float, duration: float, per_endpoint: bool = True
+    ) -> "BatchExpectation":
+        """
+        Expect latency percentile less than or equal to duration
+
+        :param percentile: percentile of latency (ex: 95 for p95)
+        :param duration: maximum latency in seconds
+        :param per_endpoint: check the percentile of every endpoint,
+            otherwise of all results together. By default set to True
+        """
+        self.percentiles.add(percentile)
+        name = f"p{percentile:g}"
+
+        def check(view: BatchView) -> Optional[str]:
+            if not per_endpoint:
+                actual = view.overall.get(name, 0.0)
+                if actual > duration:
+                    return f"was {actual} seconds"
+                return None
+            exceeded = [
+                f"{endpoint} was {stats[name]} seconds"
+                for endpoint, stats in view.group("endpoint").items()
+                if stats[name] > duration
+            ]
+            if exceeded:
+                return ", ".join(exceeded)
+
+        scope = "per endpoint " if per_endpoint else ""
+        return self.satisfy(check, f"{name} latency {scope}<= {duration} seconds")
+
+    def view(self) -> BatchView:
+        """Returned aggregated view of results that shared for all checks"""
+        return BatchView(self.store, frozenset(self.percentiles))
@@ -0,0 +1,203 @@
+import json
+import mmap
+import os
+import threading
+
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from .utils.digest import CHUNK_SIZE
+
+# fixture that larger than this size is memory-mapped
+# instead of read into memory, by default set to 1 MiB
+MMAP_THRESHOLD = 1024 * 1024
+
+# content-type of fixture based on its extension
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".yaml": "application/json",
+    ".yml": "application/json",
+    ".xml": "application/xml",
+    ".txt": "text/plain",
+    ".csv": "text/csv",
+}
+
+
+class Fixture:
+    """
+    Request body that already serialized, so it can be sent as many
+    times as needed without serializing the payload again. The body
+    is sent in slices of memoryview without being copied, and since
+    the size is known ``Content-Length`` header is sent. For example :
+
+    >>> payload = fixtures.load("fixtures/user.json")
+    >>> Http("POST", "https://api.com/users", headers={}, data=payload)
+
+    :param body: serialized body, bytes or memory-mapped file
+    :param content_type: value of content-type header
+    :param path: path of fixture file, None if it's not loaded from file
+    :param chunk_size: size of slice in bytes, by default set to 64 KiB
+    """
+
+    def __init__(
+        self,
+        body: Union[bytes, mmap.mmap],
+        content_type: Optional[str] = None,
+        path: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        self.body = body
+        self.content_type = content_type
+        self.path = path
+        self.chunk_size = chunk_size
+
+    def __repr__(self) -> str:
+        return f"<Fixture:{self.path or 'object'} {len(self)} bytes>"
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def __iter__(self) -> Iterator[memoryview]:
+        with memoryview(self.body) as view:
+            for start in range(0, len(view), self.chunk_size):
+                yield view[start : start + self.chunk_size]
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.body)
+
+    @property
+    def is_mapped(self) -> bool:
+        """Property method to return whether the body is memory-mapped"""
+        return isinstance(self.body, mmap.mmap)
+
+    @classmethod
+    def from_object(cls, obj: Any, chunk_size: int = CHUNK_SIZE) -> "Fixture":
+        """
+        Serialize JSON payload once, instead of passing it to ``json``
+        argument where it's serialized on every request
+
+        :param obj: JSON serializable object
+        :param chunk_size: size of slice in bytes
+
+        Returned as `Fixture` with compact JSON body
+        """
+        body = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+        return cls(body.encode("utf-8"), "application/json", chunk_size=chunk_size)
+
+    def close(self) -> None:
+        """Close the memory-mapped file of fixture, if any"""
+        if not self.is_mapped:
+            return
+        try:
+            self.body.close()
+        except BufferError:
+            # still being sent by another request, the mapping
+            # is closed when the last slice is garbage collected
+            pass
+
+
+class FixtureLoader:
+    """
+    Loader of fixture files that cache the serialized body, so the
+    file is only read and converted once. The cache is keyed on the
+    path of fixture, and reloaded whenever modification time or size
+    of the file has changed. JSON file is sent as it is (or minified),
+    YAML file is converted into JSON (required to install `PyYAML`),
+    and file that larger than ``mmap_threshold`` is memory-mapped
+
+    :param directory: base directory of relative fixture path,
+        by default set to None which means current directory
+    :param mmap_threshold: minimum size of file in bytes to be memory-mapped
+    :param minify: re-serialize JSON fixture without whitespaces,
+        note minified fixture is kept in memory instead memory-mapped
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        mmap_threshold: int = MMAP_THRESHOLD,
+        minify: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.mmap_threshold = mmap_threshold
+        self.minify = minify
+        self._cache: Dict[str, Tuple[Tuple[int, int], Fixture]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<FixtureLoader:{len(self._cache)} fixtures>"
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def resolve(self, path: Union[str, os.PathLike]) -> str:
+        """Returned absolute path of fixture"""
+        path = os.fspath(path)
+        if self.directory is not None:
+            path = os.path.join(self.directory, path)
+        return os.path.abspath(path)
+
+    def load(self, path: Union[str, os.PathLike]) -> Fixture:
+        """
+        Load fixture from the cache, or read it from file
+        if it's not cached yet or the file was modified
+
+        :param path: path of fixture file
+
+        Returned as `Fixture`
+        """
+        path = self.resolve(path)
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+            fixture = self._read(path, stat.st_size)
+            self._cache[path] = (key, fixture)
+        if cached is not None:
+            cached[1].close()
+        return fixture
+
+    def _read(self, path: str, size: int) -> Fixture:
+        extension = os.path.splitext(path)[1].lower()
+        content_type = CONTENT_TYPES.get(extension, "application/octet-stream")
+
+        if extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError(f"YAML fixture file need `PyYAML` package {e}")
+            with open(path, "rb") as f:
+                return self._serialize(yaml.safe_load(f), path, content_type)
+
+        if extension == ".json" and self.minify:
+            with open(path, "rb") as f:
+                return self._serialize(json.load(f), path, content_type)
+
+        with open(path, "rb") as f:
+            if size and size >= self.mmap_threshold:
+                body: Union[bytes, mmap.mmap] = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            else:
+                body = f.read()
+        return Fixture(body, content_type, path)
+
+    def _serialize(self, obj: Any, path: str, content_type: str) -> Fixture:
+        fixture = Fixture.from_object(obj)
+        fixture.path, fixture.content_type = path, content_type
+        return fixture
+
+    def clear(self) -> None:
+        """Remove all cached fixtures and close the memory-mapped files"""
+        with self._lock:
+            cached, self._cache = self._cache, {}
+        for _, fixture in cached.values():
+            fixture.close()
+
+
+# shared loader, so the same fixture is only
+# loaded once across the requests and suites
+fixtures = FixtureLoader()
@@ -0,0 +1,169 @@
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from requests.hooks import default_hooks
+from .assertion import Assert
+from .utils.environment import environment_settings
+from .utils.template import Template
+
+
+class RequestTemplate:
+    """
+    Precompiled request that produce prepared request by
+    substituting ``${name}`` placeholder. The session headers,
+    environment settings (proxies, verify) and netrc auth are
+    resolved once per host (see `environment_settings`), and a request
+    without placeholder is only prepared once and then copied. The
+    auth is applied to every request, so token refresh and digest
+    nonce count keep working.
+    For example :
+
+    >>> users = RequestTemplate("GET", "https://api.com/users/${id}", headers={})
+    >>> users.send({"id": 1}).assert_is_2xx_status(message="user found")
+
+    :param method: HTTP method verb, string type
+    :param url: url of HTTP target, with placeholder
+    :param headers: HTTP content headers, with placeholder
+    :param params: query string, with placeholder
+    :param json: JSON body, with placeholder
+    :param data: form body, with placeholder
+    :param auth: authentication of request, by default set to None
+        which means netrc auth of host will be used if any
+    :param proxy: HTTP proxies configuration, by default set to None
+    :param suppress_warning: Verification of SSL certificate, same as `Http`
+    :param options: other keyword arguments of `Http` (ex: logger,
+        retry, timeout, transport) that used for every request
+    """
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        json: Optional[Any] = None,
+        data: Optional[Any] = None,
+        auth: Optional[Any] = None,
+        proxy: Optional[dict] = None,
+        suppress_warning: Optional[bool] = None,
+        **options,
+    ) -> None:
+        self.method = method.upper()
+        self.auth = auth
+        self.proxy = proxy or {}
+        self.suppress_warning = suppress_warning
+        self.options = options
+
+        # same session settings as `Http` does for every request
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        self.session.verify = not suppress_warning
+
+        self.url = Template(url)
+        self.headers = Template(dict(self.session.headers))
+        self.params = Template(params or {})
+        self.json = Template(json)
+        self.data = Template(data)
+
+        self._prepared: Optional[requests.PreparedRequest] = None
+        if all(
+            template.is_static
+            for template in (self.url, self.headers, self.params, self.json, self.data)
+        ):
+            self._prepared = self._prepare_request({}, self.url.render())
+
+    def __repr__(self) -> str:
+        return f"<RequestTemplate:{self.method}=>{self.url.source}>"
+
+    @property
+    def variables(self) -> frozenset:
+        """Property method to return variables that needed by the template"""
+        return frozenset().union(
+            *(
+                template.variables
+                for template in (
+                    self.url,
+                    self.headers,
+                    self.params,
+                    self.json,
+                    self.data,
+                )
+            )
+        )
+
+    def host_settings(self, url: str) -> Tuple[Any, dict]:
+        """
+        Returned pair of auth and environment settings for
+        host of the url, it's only resolved once per host
+        """
+        netrc_auth, environment = environment_settings.resolve(
+            self.session,
+            url=url,
+            proxies=self.proxy,
+            stream=False,
+            verify=self.suppress_warning,
+            cert=None,
+        )
+        return self.auth or netrc_auth, environment
+
+    def prepare(
+        self, variables: Optional[Dict[str, Any]] = None
+    ) -> Tuple[requests.PreparedRequest, dict]:
+        """
+        Render the template and prepare the request
+
+        :param variables: mapping of variable name and value
+
+        Returned as pair of prepared request and environment settings
+        """
+        if self._prepared is not None:
+            prepared = self._prepared.copy()
+            # hooks are shared by copy, auth (ex: digest) register its own
+            prepared.hooks = default_hooks()
+            auth, environment = self.host_settings(prepared.url)
+        else:
+            variables = variables or {}
+            url = self.url.render(variables)
+            auth, environment = self.host_settings(url)
+            prepared = self._prepare_request(variables, url)
+        prepared.prepare_auth(auth)
+        return prepared, environment
+
+    def _prepare_request(
+        self, variables: Dict[str, Any], url: str
+    ) -> requests.PreparedRequest:
+        # prepared without auth, so it can be cached for static template
+        prepared = requests.PreparedRequest()
+        prepared.prepare(
+            method=self.method,
+            url=url,
+            headers=self.headers.render(variables),
+            params=self.params.render(variables),
+            json=self.json.render(variables),
+            data=self.data.render(variables),
+        )
+        return prepared
+
+    def send(self, variables: Optional[Dict[str, Any]] = None, cls=Assert, **options):
+        """
+        Send the request that rendered with variables
+
+        :param variables: mapping of variable name and value
+        :param cls: class of HTTP client, by default set to `Assert`
+        :param options: keyword arguments of `Http` that override
+            the options of template for this request
+
+        Returned as instance of the HTTP client
+        """
+        prepared, environment = self.prepare(variables)
+        arguments = dict(self.options)
+        arguments.update(options)
+        return cls(
+            method=self.method,
+            url=prepared.url,
+            headers=dict(prepared.headers),
+            prepared=prepared,
+            environment=environment,
+            **arguments,
+        )
@@ -0,0 +1,158 @@
+import hashlib
+import sys
+
+from typing import Iterable, List, Optional, Tuple
+
+# response headers that kept in the record by default
+DEFAULT_HEADERS = ("content-type", "content-length", "content-encoding")
+
+
+class ResultRecord:
+    """
+    Compact result of one HTTP request that can be retained
+    at scale for reporting, instead of the `Http` instance that
+    holds the response, session, logger and the whole body.
+    Only the body size and its SHA-256 digest are kept.
+
+    With ``__slots__`` the record itself takes 104 bytes (CPython
+    3.11, 64-bit), and the method, url and header names are interned
+    so they're shared between records of the same endpoint. In total
+    a record with three headers and one passed assertion takes around
+    700 bytes (most of it are the header values and the digest),
+    compare to the response object plus the whole body otherwise.
+
+    :param method: HTTP method verb
+    :param url: url of HTTP target
+    :param status_code: status code of HTTP response
+    :param elapsed: duration of request in seconds
+    :param headers: subset of response headers as pairs of
+        lowercase name and value
+    :param size: size of response body in bytes
+    :param digest: SHA-256 digest of response body (32 bytes)
+    :param assertions: pairs of assertion name and failure
+        message, the message is None if assertion was passed
+    :param error: error message if the request was failed
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "status_code",
+        "elapsed",
+        "headers",
+        "size",
+        "digest",
+        "assertions",
+        "error",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status_code: Optional[int] = None,
+        elapsed: float = 0.0,
+        headers: Tuple[Tuple[str, str], ...] = (),
+        size: int = 0,
+        digest: Optional[bytes] = None,
+        assertions: Tuple[Tuple[str, Optional[str]], ...] = (),
+        error: Optional[str] = None,
+    ) -> None:
+        self.method = sys.intern(method)
+        self.url = sys.intern(url)
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.headers = headers
+        self.size = size
+        self.digest = digest
+        self.assertions = assertions
+        self.error = error
+
+    def __repr__(self) -> str:
+        status = "PASSED" if self.passed else "FAILED"
+        return f"<ResultRecord:{self.method} {self.url}=>{self.status_code} {status}>"
+
+    @classmethod
+    def from_http(
+        cls,
+        http,
+        headers: Iterable[str] = DEFAULT_HEADERS,
+        assertions: Optional[Iterable[Tuple[str, Optional[str]]]] = None,
+    ) -> "ResultRecord":
+        """
+        Create record from `Http` instance that already has response
+
+        :param http: `Http` or `Assert` instance
+        :param headers: name of response headers that kept in the record
+        :param assertions: pairs of assertion name and failure message
+            (ex: result of `Expectation.evaluate`)
+        """
+        response = http.response
+        body_digest = getattr(http, "body_digests", {}).get(True)
+        measured_size = getattr(http, "measured_size", None)
+        if body_digest is not None:
+            # streamed body was already hashed and can't be read again
+            size, digest = body_digest.size, body_digest.digest("sha256")
+        elif response._content is False and response._content_consumed:
+            # streamed body was read elsewhere, keep what was measured
+            size = measured_size.decoded if measured_size is not None else 0
+            digest = None
+        else:
+            content = response.content or b""
+            size, digest = len(content), hashlib.sha256(content).digest()
+        return cls(
+            method=http.method,
+            url=http.url,
+            status_code=response.status_code,
+            elapsed=response.elapsed.total_seconds(),
+            headers=tuple(
+                (sys.intern(name.lower()), response.headers[name])
+                for name in headers
+                if name in response.headers
+            ),
+            size=size,
+            digest=digest,
+            assertions=tuple(
+                (sys.intern(name), failure) for name, failure in assertions or ()
+            ),
+        )
+
+    @property
+    def passed(self) -> bool:
+        """Property method to return whether request and all assertions passed"""
+        return self.error is None and all(
+            failure is None for _, failure in self.assertions
+        )
+
+    @property
+    def failures(self) -> List[str]:
+        """Property method to return failure messages of assertions"""
+        return [f"{name}: {failure}" for name, failure in self.assertions if failure]
+
+    @property
+    def hexdigest(self) -> Optional[str]:
+        """Property method to return SHA-256 digest of body in hexadecimal"""
+        return self.digest.hex() if self.digest is not None else None
+
+    def header(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Returned value of kept response header, case-insensitive"""
+        name = name.lower()
+        for key, value in self.headers:
+            if key == name:
+                return value
+        return default
+
+    def to_dict(self) -> dict:
+        """Returned record as dict object"""
+        return {
+            "method": self.method,
+            "url": self.url,
+            "status_code": self.status_code,
+            "elapsed": self.elapsed,
+            "headers": dict(self.headers),
+            "size": self.size,
+            "digest": self.hexdigest,
+            "assertions": [list(assertion) for assertion in self.assertions],
+            "error": self.error,
+            "passed": self.passed,
+        }
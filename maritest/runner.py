@@ -0,0 +1,194 @@
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+from .result import ResultRecord
+
+if TYPE_CHECKING:
+    from .store import ResultStore
+
+
+class CaseResult:
+    """
+    Result of one test case that executed by runner
+
+    :param name: name of test case
+    :param passed: whether all assertions of test case passed
+    :param failures: list of failed assertion message
+    :param error: error message if the case was raised exception
+        other than assertion error (ex: connection error)
+    :param duration: total duration of test case in seconds
+    :param status_code: status code of HTTP response, if any
+    :param variables: variables that extracted from HTTP response
+    :param record: compact record of the HTTP request, if any
+    """
+
+    def __init__(
+        self,
+        name: str,
+        passed: bool,
+        failures: Optional[List[str]] = None,
+        error: Optional[str] = None,
+        duration: float = 0.0,
+        status_code: Optional[int] = None,
+        variables: Optional[Dict[str, Any]] = None,
+        record: Optional[ResultRecord] = None,
+    ) -> None:
+        self.name = name
+        self.passed = passed
+        self.failures = failures or []
+        self.error = error
+        self.duration = duration
+        self.status_code = status_code
+        self.variables = variables or {}
+        self.record = record
+
+    def __repr__(self) -> str:
+        status = "PASSED" if self.passed else "FAILED"
+        return f"<CaseResult:{self.name}=>{status}>"
+
+    def to_dict(self) -> dict:
+        """Returned result as dict object"""
+        return {
+            "name": self.name,
+            "passed": self.passed,
+            "failures": self.failures,
+            "error": self.error,
+            "duration": self.duration,
+            "status_code": self.status_code,
+        }
+
+
+class Runner:
+    """
+    Concurrent runner that execute test cases with
+    thread pool, since most of the time of API test are
+    waiting for network I/O rather than computation
+
+    :param concurrency: maximum numbers of test cases
+        that run concurrently, by default set to 8
+    :param fail_fast: stop to execute remaining test cases
+        after the first failure, by default set to False
+    :param max_pending: maximum numbers of submitted test
+        cases that haven't been consumed, items are pulled
+        from the iterable lazily so the memory stays flat
+        for large dataset, by default set to twice of concurrency
+    :param store: columnar store that every result is appended
+        into for aggregation, by default set to None
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        fail_fast: bool = False,
+        max_pending: Optional[int] = None,
+        store: Optional["ResultStore"] = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be positive")
+        if max_pending is not None and max_pending < concurrency:
+            raise ValueError("max_pending can't be less than concurrency")
+
+        self.concurrency = concurrency
+        self.fail_fast = fail_fast
+        self.max_pending = max_pending or concurrency * 2
+        self.store = store
+        self.stopped = threading.Event()
+
+    def __repr__(self) -> str:
+        return f"<Runner:concurrency={self.concurrency}>"
+
+    def execute(
+        self, func: Callable[[Any], CaseResult], item: Any
+    ) -> Optional[CaseResult]:
+        """
+        Execute one test case, any exception will
+        be reported as failed result instead of raised.
+        Returned None if the case was skipped due fail-fast
+        """
+        if self.stopped.is_set():
+            return None
+
+        start = time.perf_counter()
+        try:
+            result = func(item)
+        except Exception as error:
+            result = CaseResult(
+                name=str(getattr(item, "name", item)),
+                passed=False,
+                error=f"{type(error).__name__}: {error}",
+                duration=time.perf_counter() - start,
+            )
+        if self.store is not None:
+            self.store.add_result(result)
+        if not result.passed and self.fail_fast:
+            self.stopped.set()
+        return result
+
+    def iterate(
+        self, func: Callable[[Any], CaseResult], items: Iterable[Any]
+    ) -> Iterator[CaseResult]:
+        """
+        Run function for every item concurrently and yield
+        the result as soon as it's ready, in the same order with
+        items. The next item is only pulled from the iterable when
+        one of pending test cases was consumed (backpressure)
+
+        :param func: callable that receive one item and returned `CaseResult`
+        :param items: iterable of test case, it could be lazy generator
+
+        Yielded as result of test case, skipped
+        test cases due fail-fast are not included
+        """
+        self.stopped.clear()
+        items = iter(items)
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                for item in items:
+                    pending.append(executor.submit(self.execute, func, item))
+                    while len(pending) >= self.max_pending or (
+                        pending and pending[0].done()
+                    ):
+                        result = pending.popleft().result()
+                        if result is not None:
+                            yield result
+                    if self.stopped.is_set():
+                        break
+
+                while pending:
+                    result = pending.popleft().result()
+                    if result is not None:
+                        yield result
+            finally:
+                # consumer stopped to iterate or fail-fast,
+                # cancel the test cases that not started yet
+                for future in pending:
+                    future.cancel()
+
+    def run(
+        self, func: Callable[[Any], CaseResult], items: Iterable[Any]
+    ) -> List[CaseResult]:
+        """
+        Run function for every item concurrently
+
+        :param func: callable that receive one item and returned `CaseResult`
+        :param items: iterable of test case
+
+        Returned as list of result in the same order with items,
+        skipped test cases due fail-fast are not included
+        """
+        return list(self.iterate(func, items))
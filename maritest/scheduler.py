@@ -0,0 +1,173 @@
+import bisect
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence
+
+from .runner import CaseResult, Runner
+
+
+def resolve_dependencies(steps: Sequence[Any]) -> List[FrozenSet[int]]:
+    """
+    Resolve dependencies of every step based on the data flow,
+    step that use ``${name}`` placeholder depend on the step
+    that extract ``name`` (the nearest one before it), plus the
+    steps that explicitly declared in ``depends_on``
+
+    :param steps: list of step that has ``name``, ``requires``,
+        ``extract`` and ``depends_on`` attributes (ex: `PlanStep`)
+
+    Returned as list of dependency indexes for every step, raise
+    ValueError for unknown, ambiguous or circular dependencies
+    """
+    producers: Dict[str, List[int]] = {}
+    names: Dict[str, List[int]] = {}
+    for index, step in enumerate(steps):
+        for variable in step.extract:
+            producers.setdefault(variable, []).append(index)
+        names.setdefault(step.name, []).append(index)
+
+    graph = []
+    for index, step in enumerate(steps):
+        dependencies = set()
+        for variable in step.requires:
+            candidates = producers.get(variable)
+            if not candidates:
+                # variable is given at runtime
+                continue
+            # candidates are sorted, so the nearest preceding one is bisected
+            position = bisect.bisect_left(candidates, index)
+            dependencies.add(candidates[position - 1] if position else candidates[0])
+
+        for name in step.depends_on:
+            if name not in names:
+                raise ValueError(f"Step {step.name} depend on unknown step {name}")
+            if len(names[name]) > 1:
+                raise ValueError(f"Step {step.name} depend on ambiguous step {name}")
+            dependencies.update(names[name])
+
+        if index in dependencies:
+            raise ValueError(f"Step {step.name} can't depend on itself")
+        graph.append(frozenset(dependencies))
+
+    # make sure every step can be scheduled (Kahn's algorithm)
+    dependents = reverse_graph(graph)
+    remaining = [len(dependencies) for dependencies in graph]
+    ready = [index for index, count in enumerate(remaining) if count == 0]
+    scheduled = 0
+    while ready:
+        current = ready.pop()
+        scheduled += 1
+        for index in dependents[current]:
+            remaining[index] -= 1
+            if remaining[index] == 0:
+                ready.append(index)
+    if scheduled != len(steps):
+        circular = [steps[index].name for index, count in enumerate(remaining) if count]
+        raise ValueError(f"Circular dependency between steps {circular}")
+    return graph
+
+
+def reverse_graph(graph: Sequence[FrozenSet[int]]) -> List[List[int]]:
+    """Returned list of dependent indexes for every step of dependency graph"""
+    dependents: List[List[int]] = [[] for _ in graph]
+    for index, dependencies in enumerate(graph):
+        for dependency in dependencies:
+            dependents[dependency].append(index)
+    return dependents
+
+
+class Scheduler:
+    """
+    Dependency-aware scheduler that run steps as directed
+    acyclic graph. Independent branches are run concurrently,
+    and only the steps that need the extracted variables of
+    other steps wait for them. Step that its dependency failed
+    will be skipped and reported as failed
+
+    :param runner: runner that execute each step, the concurrency
+        and fail-fast option are taken from it, by default using `Runner()`
+    """
+
+    def __init__(self, runner: Optional[Runner] = None) -> None:
+        self.runner = runner or Runner()
+
+    def __repr__(self) -> str:
+        return f"<Scheduler:concurrency={self.runner.concurrency}>"
+
+    def run(
+        self,
+        steps: Sequence[Any],
+        variables: Optional[Dict[str, Any]] = None,
+        graph: Optional[Sequence[FrozenSet[int]]] = None,
+    ) -> List[CaseResult]:
+        """
+        Run all steps based on their dependencies
+
+        :param steps: list of step (ex: `PlanStep`), each step must
+            have ``run(variables)`` method that returned `CaseResult`
+        :param variables: variables that available for all steps
+        :param graph: dependencies of steps that already resolved
+            with `resolve_dependencies`, by default resolved from steps
+
+        Returned as list of result in the same order with steps,
+        skipped steps due fail-fast are not included
+        """
+        if graph is None:
+            graph = resolve_dependencies(steps)
+        dependents = reverse_graph(graph)
+
+        base = dict(variables or {})
+        remaining = [len(dependencies) for dependencies in graph]
+        failed: List[List[str]] = [[] for _ in steps]
+        results: List[Optional[CaseResult]] = [None] * len(steps)
+        futures: Dict[Future, int] = {}
+        runner = self.runner
+        runner.stopped.clear()
+
+        with ThreadPoolExecutor(max_workers=runner.concurrency) as executor:
+
+            def submit(index: int) -> None:
+                # the context only consist of variables from the
+                # dependencies, so the other branches can't leak into it
+                context = dict(base)
+                for dependency in sorted(graph[index]):
+                    context.update(results[dependency].variables)
+                future = executor.submit(
+                    runner.execute, lambda step: step.run(context), steps[index]
+                )
+                futures[future] = index
+
+            def complete(index: int, result: CaseResult) -> None:
+                pending = [(index, result)]
+                while pending:
+                    current, outcome = pending.pop()
+                    results[current] = outcome
+                    for dependent in dependents[current]:
+                        remaining[dependent] -= 1
+                        if not outcome.passed:
+                            failed[dependent].append(steps[current].name)
+                        if remaining[dependent] or runner.stopped.is_set():
+                            continue
+                        if failed[dependent]:
+                            skipped = CaseResult(
+                                name=steps[dependent].name,
+                                passed=False,
+                                error=f"Skipped due failed dependency {failed[dependent]}",
+                            )
+                            pending.append((dependent, skipped))
+                        else:
+                            submit(dependent)
+
+            for index, count in enumerate(remaining):
+                if count == 0:
+                    submit(index)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures.pop(future)
+                    result = future.result()
+                    if result is not None:
+                        complete(index, result)
+
+        return [result for result in results if result is not None]
@@ -0,0 +1,222 @@
+import difflib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import urllib.parse
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .utils.json_diff import json_diff
+from .utils.json_path import compile_path
+
+# environment variable to update all snapshots instead of asserting them
+UPDATE_ENVIRONMENT = "MARITEST_UPDATE_SNAPSHOTS"
+
+
+def drop_paths(obj: Any, paths: Iterable[str]) -> Any:
+    """
+    Returned copy of decoded JSON object without the values of
+    JSON paths, ``*`` match any key or index. Used to remove volatile
+    fields (ex: timestamp, request id) before the body is hashed
+    """
+    for path in paths:
+        obj = _drop(obj, compile_path(path.replace("[*]", ".*")))
+    return obj
+
+
+def _drop(obj: Any, segments: Tuple[Any, ...]) -> Any:
+    if not segments:
+        return obj
+    segment, rest = segments[0], segments[1:]
+    if isinstance(obj, dict):
+        if segment == "*":
+            keys = list(obj)
+        else:
+            keys = [segment] if segment in obj else []
+        copied = dict(obj)
+        for key in keys:
+            if rest:
+                copied[key] = _drop(obj[key], rest)
+            else:
+                del copied[key]
+        return copied
+    if isinstance(obj, list):
+        if segment == "*":
+            indexes = range(len(obj))
+        elif isinstance(segment, int) and -len(obj) <= segment < len(obj):
+            indexes = [segment % len(obj)]
+        else:
+            indexes = []
+        copied = list(obj)
+        for index in sorted(indexes, reverse=True):
+            if rest:
+                copied[index] = _drop(obj[index], rest)
+            else:
+                del copied[index]
+        return copied
+    return obj
+
+
+def normalize(content: bytes, ignore_paths: Optional[Iterable[str]] = None) -> bytes:
+    """
+    Normalize response body before it's stored or compared. JSON
+    body is serialized with sorted keys and without whitespace, so
+    the order of keys or formatting don't change the digest. Other
+    body is kept as it is, except the line endings of text
+
+    :param content: response body in bytes
+    :param ignore_paths: JSON paths that removed from JSON body
+    """
+    try:
+        obj = json.loads(content)
+    except (ValueError, UnicodeDecodeError):
+        return content.replace(b"\r\n", b"\n")
+    if ignore_paths:
+        obj = drop_paths(obj, ignore_paths)
+    return json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+class SnapshotStore:
+    """
+    Content-addressed store of response snapshots. Normalized bodies
+    are stored once as ``objects/<sha256>`` file, so the same body of
+    many endpoints is deduplicated, and every snapshot name only refers
+    to the digest of its body (``refs/<name>``). Asserting unchanged
+    snapshot costs one hash computation of the body, the stored body is
+    only loaded to report the differences if the digest didn't match
+
+    :param directory: directory of the store, by default set to
+        ``.snapshots`` in the current working directory
+    :param update: replace the stored snapshots with actual bodies
+        instead of asserting them, by default set to True if
+        ``MARITEST_UPDATE_SNAPSHOTS`` environment variable was set
+    """
+
+    def __init__(
+        self, directory: str = ".snapshots", update: Optional[bool] = None
+    ) -> None:
+        self.directory = directory
+        if update is None:
+            update = os.environ.get(UPDATE_ENVIRONMENT, "") not in ("", "0", "false")
+        self.update = update
+        self._refs: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<SnapshotStore:{self.directory}>"
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        """Returned SHA-256 digest of normalized body in hexadecimal"""
+        return hashlib.sha256(content).hexdigest()
+
+    def object_path(self, digest: str) -> str:
+        """Returned path of stored body, split by the first two characters of digest"""
+        return os.path.join(self.directory, "objects", digest[:2], digest[2:])
+
+    def ref_path(self, name: str) -> str:
+        """Returned path of file that refer to digest of snapshot"""
+        filename = urllib.parse.quote(name, safe="")
+        if len(filename) > 200:
+            filename = hashlib.sha256(name.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "refs", filename)
+
+    @staticmethod
+    def _write(path: str, content: bytes) -> None:
+        # written into temporary file then renamed, so the
+        # concurrent reader never see half-written file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(content)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def get(self, name: str) -> Optional[str]:
+        """Returned digest of snapshot, None if it's not stored yet"""
+        if name not in self._refs:
+            try:
+                with open(self.ref_path(name), encoding="ascii") as f:
+                    self._refs[name] = f.read().strip()
+            except FileNotFoundError:
+                self._refs[name] = None
+        return self._refs[name]
+
+    def load(self, name: str) -> Optional[bytes]:
+        """Returned stored body of snapshot, None if it's not stored yet"""
+        digest = self.get(name)
+        if digest is None:
+            return None
+        with open(self.object_path(digest), "rb") as f:
+            return f.read()
+
+    def save(self, name: str, content: bytes) -> str:
+        """
+        Store normalized body as snapshot, the body is only
+        written once if the same content was already stored
+
+        Returned as digest of the body
+        """
+        digest = self.digest(content)
+        path = self.object_path(digest)
+        with self._lock:
+            if not os.path.exists(path):
+                self._write(path, content)
+            if self.get(name) != digest:
+                self._write(self.ref_path(name), digest.encode("ascii"))
+                self._refs[name] = digest
+        return digest
+
+    def compare(self, name: str, content: bytes, max_diffs: int = 10) -> List[str]:
+        """
+        Compare normalized body with snapshot, the snapshot is
+        created if it's not stored yet (or the store in update mode)
+
+        :param name: unique name of snapshot (ex: name of test case)
+        :param content: normalized body, see `normalize`
+        :param max_diffs: maximum numbers of reported difference
+
+        Returned as list of differences, empty if it's matched
+        """
+        expected = self.get(name)
+        if expected is None or self.update:
+            self.save(name, content)
+            return []
+        if self.digest(content) == expected:
+            return []
+        return self.differences(self.load(name), content, max_diffs)
+
+    @staticmethod
+    def differences(expected: bytes, actual: bytes, max_diffs: int = 10) -> List[str]:
+        """Returned differences between stored and actual body"""
+        try:
+            differences = json_diff(
+                json.loads(actual), json.loads(expected), max_diffs=max_diffs
+            )
+        except (ValueError, UnicodeDecodeError):
+            pass
+        else:
+            # digest is different but the decoded values are equal (ex: 1 and 1.0)
+            return [str(difference) for difference in differences] or [
+                "body is different"
+            ]
+
+        lines = difflib.unified_diff(
+            expected.decode("utf-8", "replace").splitlines(),
+            actual.decode("utf-8", "replace").splitlines(),
+            "snapshot",
+            "response",
+            lineterm="",
+        )
+        return list(lines)[: max_diffs + 2] or ["body is different"]
+
+
+# shared store that used by `assert_snapshot` by default
+snapshots = SnapshotStore()
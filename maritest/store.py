@@ -0,0 +1,370 @@
+import csv
+import io
+import math
+import threading
+import urllib.parse
+
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .expectation import BatchExpectation
+from .result import ResultRecord
+from .runner import CaseResult
+
+# name and typecode of every column
+COLUMNS = (
+    ("endpoint", "I"),
+    ("status_code", "H"),
+    ("latency", "d"),
+    ("size", "Q"),
+    ("passed", "B"),
+)
+
+# supported keys for grouping the results
+GROUP_KEYS = ("endpoint", "status_class")
+
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+
+
+def _numpy():
+    """Returned `numpy` module if it was installed, otherwise None"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Returned the q-th percentile of sorted values with linear
+    interpolation, same as the default method of `numpy.percentile`
+    """
+    if not values:
+        return math.nan
+    position = (len(values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return float(values[lower])
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def status_class(status_code: int) -> str:
+    """Returned class of status code (ex: 2xx), ``error`` if there's no response"""
+    if not status_code:
+        return "error"
+    return f"{status_code // 100}xx"
+
+
+def default_endpoint(result: CaseResult) -> str:
+    """
+    Returned endpoint of result as method and url
+    without query string, or name of test case if
+    the request wasn't sent at all
+    """
+    record = result.record
+    if record is None:
+        return result.name
+    parsed = urllib.parse.urlsplit(record.url)
+    return f"{record.method} {parsed.scheme}://{parsed.netloc}{parsed.path}"
+
+
+class ResultStore:
+    """
+    Columnar in-memory store of test results. Every result is
+    appended into typed arrays (endpoint id, status code, latency,
+    body size and pass/fail), so one million results take around
+    23 MB. The aggregations are vectorized with `numpy` if it was
+    installed, otherwise computed in one pass over the columns
+
+    :param endpoint: callable that receive `CaseResult` and returned
+        name of endpoint for grouping, by default using method and
+        url without query string
+    """
+
+    def __init__(self, endpoint: Optional[Callable[[CaseResult], str]] = None) -> None:
+        self.endpoint = endpoint or default_endpoint
+        self.endpoints: List[str] = []
+        self.columns: Dict[str, array] = {
+            name: array(typecode) for name, typecode in COLUMNS
+        }
+        self._endpoint_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<ResultStore:{len(self)} results>"
+
+    def __len__(self) -> int:
+        return len(self.columns["passed"])
+
+    def append(
+        self,
+        endpoint: str,
+        status_code: Optional[int],
+        latency: float,
+        size: int = 0,
+        passed: bool = True,
+    ) -> None:
+        """
+        Append one result into the columns
+
+        :param endpoint: name of endpoint
+        :param status_code: status code of response, None
+            or 0 if the request was failed without response
+        :param latency: duration of request in seconds
+        :param size: size of response body in bytes
+        :param passed: whether the request and assertions passed
+        """
+        with self._lock:
+            endpoint_id = self._endpoint_ids.get(endpoint)
+            if endpoint_id is None:
+                endpoint_id = self._endpoint_ids[endpoint] = len(self.endpoints)
+                self.endpoints.append(endpoint)
+            columns = self.columns
+            columns["endpoint"].append(endpoint_id)
+            columns["status_code"].append(status_code or 0)
+            columns["latency"].append(latency)
+            columns["size"].append(size)
+            columns["passed"].append(1 if passed else 0)
+
+    def add_record(self, record: ResultRecord, endpoint: Optional[str] = None) -> None:
+        """Append `ResultRecord` into the store"""
+        if endpoint is None:
+            parsed = urllib.parse.urlsplit(record.url)
+            endpoint = f"{record.method} {parsed.scheme}://{parsed.netloc}{parsed.path}"
+        self.append(
+            endpoint, record.status_code, record.elapsed, record.size, record.passed
+        )
+
+    def add_result(self, result: CaseResult) -> None:
+        """Append `CaseResult` of runner into the store"""
+        record = result.record
+        if record is None:
+            self.append(self.endpoint(result), None, result.duration, 0, result.passed)
+        else:
+            self.append(
+                self.endpoint(result),
+                record.status_code,
+                record.elapsed,
+                record.size,
+                result.passed,
+            )
+
+    def extend(self, results: Iterable[CaseResult]) -> "ResultStore":
+        """Append all results into the store, returned the same store"""
+        for result in results:
+            self.add_result(result)
+        return self
+
+    def _group_codes(self, by: str) -> Tuple[List[Any], List[int]]:
+        # returned labels of groups and group index of every row
+        if by == "endpoint":
+            return list(self.endpoints), list(self.columns["endpoint"])
+        if by == "status_class":
+            labels: List[str] = []
+            ids: Dict[str, int] = {}
+            codes = []
+            for status_code in self.columns["status_code"]:
+                label = status_class(status_code)
+                if label not in ids:
+                    ids[label] = len(labels)
+                    labels.append(label)
+                codes.append(ids[label])
+            return labels, codes
+        raise ValueError(f"Results can only be grouped by {GROUP_KEYS}")
+
+    def group_by(
+        self,
+        by: Union[str, Sequence[str]] = "endpoint",
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    ) -> Dict[Any, Dict[str, float]]:
+        """
+        Aggregate the results per group, such as per endpoint,
+        per status class (2xx, 4xx, ...) or both of them
+
+        :param by: ``endpoint``, ``status_class`` or sequence of them,
+            empty sequence to aggregate all results as one group
+        :param percentiles: percentiles of latency, by default 50, 90, 95, 99
+
+        Returned as mapping of group (tuple if grouped by sequence)
+        and its statistics: count, failure_rate (assertion or request
+        failed), error_rate (5xx or no response), mean, min and max
+        latency, latency percentiles (ex: p95) and total size
+        """
+        with self._lock:
+            if isinstance(by, str):
+                labels, codes = self._group_codes(by)
+            elif not by:
+                # all results as one group
+                labels, codes = [()], [0] * len(self)
+            else:
+                # combine group index of every key into one code per row
+                grouped = [self._group_codes(key) for key in by]
+                ids: Dict[Tuple[int, ...], int] = {}
+                labels, codes = [], []
+                for key_codes in zip(*(key_codes for _, key_codes in grouped)):
+                    code = ids.get(key_codes)
+                    if code is None:
+                        code = ids[key_codes] = len(labels)
+                        labels.append(
+                            tuple(
+                                key_labels[key_code]
+                                for (key_labels, _), key_code in zip(grouped, key_codes)
+                            )
+                        )
+                    codes.append(code)
+
+            # columns can't be appended while numpy holds their buffers
+            numpy = _numpy()
+            if numpy is not None:
+                return self._aggregate_numpy(numpy, codes, labels, percentiles)
+            return self._aggregate(codes, labels, percentiles)
+
+    def _aggregate(self, codes, labels, percentiles) -> Dict[Any, Dict[str, float]]:
+        columns = self.columns
+        latencies: Dict[int, List[float]] = {}
+        stats: Dict[int, List[int]] = {}
+        for code, status_code, latency, size, passed in zip(
+            codes,
+            columns["status_code"],
+            columns["latency"],
+            columns["size"],
+            columns["passed"],
+        ):
+            latencies.setdefault(code, []).append(latency)
+            counter = stats.setdefault(code, [0, 0, 0])
+            counter[0] += 0 if passed else 1
+            counter[1] += 1 if status_code >= 500 or status_code == 0 else 0
+            counter[2] += size
+
+        summary = {}
+        for code, values in latencies.items():
+            values.sort()
+            failed, errors, size = stats[code]
+            count = len(values)
+            row = {
+                "count": count,
+                "failure_rate": failed / count,
+                "error_rate": errors / count,
+                "mean": sum(values) / count,
+                "min": values[0],
+                "max": values[-1],
+                "size": size,
+            }
+            for q in percentiles:
+                row[f"p{q:g}"] = percentile(values, q)
+            summary[labels[code]] = row
+        return summary
+
+    def _aggregate_numpy(self, numpy, codes, labels, percentiles):
+        columns = self.columns
+        codes = numpy.asarray(codes, dtype=numpy.int64)
+        status_codes = numpy.frombuffer(columns["status_code"], dtype=numpy.uint16)
+        latency = numpy.frombuffer(columns["latency"], dtype=numpy.float64)
+        size = numpy.frombuffer(columns["size"], dtype=numpy.uint64)
+        passed = numpy.frombuffer(columns["passed"], dtype=numpy.uint8)
+        errors = (status_codes >= 500) | (status_codes == 0)
+
+        counts = numpy.bincount(codes)
+        failed = numpy.bincount(codes, weights=1 - passed)
+        error_counts = numpy.bincount(codes, weights=errors)
+        sizes = numpy.bincount(codes, weights=size)
+        totals = numpy.bincount(codes, weights=latency)
+
+        # sort by group then latency, so every group is contiguous and sorted
+        order = numpy.lexsort((latency, codes))
+        sorted_latency = latency[order]
+        offsets = numpy.concatenate(([0], numpy.cumsum(counts)))
+
+        summary = {}
+        for code in numpy.nonzero(counts)[0]:
+            values = sorted_latency[offsets[code] : offsets[code + 1]]
+            count = int(counts[code])
+            row = {
+                "count": count,
+                "failure_rate": float(failed[code]) / count,
+                "error_rate": float(error_counts[code]) / count,
+                "mean": float(totals[code]) / count,
+                "min": float(values[0]),
+                "max": float(values[-1]),
+                "size": int(sizes[code]),
+            }
+            if percentiles:
+                for q, value in zip(percentiles, numpy.percentile(values, percentiles)):
+                    row[f"p{q:g}"] = float(value)
+            summary[labels[int(code)]] = row
+        return summary
+
+    def expect(self) -> BatchExpectation:
+        """Returned `BatchExpectation` to assert the results of the whole run"""
+        return BatchExpectation(self)
+
+    def rows(self) -> Iterable[Tuple[str, int, float, int, bool]]:
+        """Yielded every result as row of endpoint, status code, latency, size and passed"""
+        columns = self.columns
+        endpoints = self.endpoints
+        for endpoint_id, status_code, latency, size, passed in zip(
+            columns["endpoint"],
+            columns["status_code"],
+            columns["latency"],
+            columns["size"],
+            columns["passed"],
+        ):
+            yield endpoints[endpoint_id], status_code, latency, size, bool(passed)
+
+    def to_csv(self, file: Union[str, io.TextIOBase]) -> None:
+        """
+        Export the results into CSV file
+
+        :param file: path of CSV file or text file object
+        """
+        if isinstance(file, str):
+            with open(file, "w", newline="", encoding="utf-8") as f:
+                return self.to_csv(f)
+        writer = csv.writer(file)
+        writer.writerow([name for name, _ in COLUMNS])
+        writer.writerows(self.rows())
+
+    def to_arrow(self):
+        """
+        Returned the results as `pyarrow.Table`, the numeric
+        columns are converted without copying row by row.
+        Required to install `pyarrow` package
+        """
+        try:
+            import pyarrow
+        except ImportError as e:
+            raise ImportError(f"Exporting into Arrow need `pyarrow` package {e}")
+
+        columns = self.columns
+        endpoint = pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(columns["endpoint"], type=pyarrow.uint32()),
+            pyarrow.array(self.endpoints, type=pyarrow.string()),
+        )
+        return pyarrow.table(
+            {
+                "endpoint": endpoint,
+                "status_code": pyarrow.array(
+                    columns["status_code"], type=pyarrow.uint16()
+                ),
+                "latency": pyarrow.array(columns["latency"], type=pyarrow.float64()),
+                "size": pyarrow.array(columns["size"], type=pyarrow.uint64()),
+                "passed": pyarrow.array(
+                    [bool(passed) for passed in columns["passed"]], type=pyarrow.bool_()
+                ),
+            }
+        )
+
+    def to_parquet(self, path: str, **options) -> None:
+        """
+        Export the results into Parquet file, required
+        to install `pyarrow` package
+
+        :param path: path of Parquet file
+        :param options: keyword arguments of `pyarrow.parquet.write_table`
+        """
+        table = self.to_arrow()
+        import pyarrow.parquet
+
+        pyarrow.parquet.write_table(table, path, **options)
@@ -0,0 +1,509 @@
+import hashlib
+import inspect
+import json
+import os
+import time
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .assertion import Assert
+from .fixtures import fixtures
+from .request_template import RequestTemplate
+from .runner import CaseResult, Runner
+from .scheduler import Scheduler, resolve_dependencies
+from .utils.extractors import Extractor
+from .utils.template import Template
+from .version import __version__
+
+# bump this version whenever the structure
+# of execution plan was changed, so the old
+# cached plan on disk won't be used anymore
+PLAN_VERSION = 3
+
+# keys of request section that passed into Assert
+REQUEST_KEYS = (
+    "method",
+    "url",
+    "headers",
+    "params",
+    "json",
+    "data",
+    "fixture",
+    "timeout",
+    "allow_redirects",
+    "retry",
+    "suppress_warning",
+)
+
+
+class PlanStep:
+    """
+    Compiled test case of suite file, consist of request
+    template, extractors and assertions that already
+    validated against the assertion methods of `Assert`
+
+    :param name: name of test case
+    :param request: template of keyword arguments for `Assert`
+    :param extract: mapping of variable name and its extractor
+    :param assertions: list of pair assertion method name and
+        template of its keyword arguments
+    :param depends_on: name of steps that must be run before
+        this step, other than the one that extract its variables
+    :param base_dir: directory that relative fixture path resolved
+        against, usually directory of suite file. By default set to
+        None which means current directory
+    """
+
+    def __init__(
+        self,
+        name: str,
+        request: Template,
+        extract: Optional[Dict[str, Extractor]] = None,
+        assertions: Optional[List[Tuple[str, Template]]] = None,
+        depends_on: Optional[List[str]] = None,
+        base_dir: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.request = request
+        self.extract = extract or {}
+        self.assertions = assertions or []
+        self.depends_on = depends_on or []
+        self.base_dir = base_dir
+
+        # request without runtime variable is prepared once on the
+        # first run and copied after that, it's created lazily so
+        # compiling a large suite doesn't create a session per step
+        self._template: Optional[RequestTemplate] = None
+
+    def __repr__(self) -> str:
+        return f"<PlanStep:{self.name}>"
+
+    @property
+    def requires(self) -> frozenset:
+        """Property method to return variables that needed by the step"""
+        variables = set(self.request.variables)
+        for _, arguments in self.assertions:
+            variables.update(arguments.variables)
+        return frozenset(variables)
+
+    @property
+    def template(self) -> Optional[RequestTemplate]:
+        """
+        Property method to return request template that prepared
+        once, None if the request has runtime variable or fixture
+        """
+        if self._template is None and self.request.is_static:
+            arguments = self.request.render()
+            if "fixture" not in arguments:
+                self._template = RequestTemplate(logger=False, **arguments)
+        return self._template
+
+    def build_request(self, variables: Dict[str, Any]) -> dict:
+        """Returned keyword arguments for `Assert` based on variables"""
+        return self.request.render(variables)
+
+    def to_dict(self) -> dict:
+        """Returned JSON serializable representation of compiled step"""
+        return {
+            "name": self.name,
+            "request": self.request.dump(),
+            "extract": {
+                variable: extractor.expression
+                for variable, extractor in self.extract.items()
+            },
+            "assertions": [
+                [method, arguments.dump()] for method, arguments in self.assertions
+            ],
+            "depends_on": list(self.depends_on),
+            "base_dir": self.base_dir,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PlanStep":
+        """Restore compiled step from `to_dict` without validating it again"""
+        return cls(
+            name=data["name"],
+            request=Template.load(data["request"]),
+            extract={
+                variable: Extractor(expression)
+                for variable, expression in data["extract"].items()
+            },
+            assertions=[
+                (method, Template.load(arguments))
+                for method, arguments in data["assertions"]
+            ],
+            depends_on=data["depends_on"],
+            base_dir=data["base_dir"],
+        )
+
+    def run(self, variables: Optional[Dict[str, Any]] = None) -> CaseResult:
+        """
+        Send the request, run all assertions and extractors
+
+        :param variables: variables that used to render the templates
+
+        Returned as result of test case
+        """
+        variables = variables or {}
+        start = time.perf_counter()
+        template = self.template
+        if template is not None:
+            request = template.send(cls=Assert)
+        else:
+            # rendered arguments may be shared with the compiled plan
+            arguments = dict(self.build_request(variables))
+            if "fixture" in arguments:
+                # pre-serialized body that cached across the runs
+                fixture = os.path.join(self.base_dir or "", arguments.pop("fixture"))
+                arguments["data"] = fixtures.load(fixture)
+            request = Assert(logger=False, **arguments)
+
+        outcomes = []
+        for name, assertion_args in self.assertions:
+            failure = None
+            try:
+                outcome = getattr(request, name)(**assertion_args.render(variables))
+                # some assertion method returned the error instead raise it
+                if isinstance(outcome, AssertionError):
+                    failure = str(outcome)
+            except AssertionError as error:
+                failure = str(error)
+            outcomes.append((name, failure))
+
+        extracted = {}
+        for variable, extractor in self.extract.items():
+            try:
+                extracted[variable] = extractor.extract(request)
+            except (LookupError, ValueError) as error:
+                outcomes.append((f"extract {variable}", repr(error)))
+
+        # keep compact record and release the response
+        record = request.to_record(assertions=outcomes)
+        return CaseResult(
+            name=self.name,
+            passed=record.passed,
+            failures=record.failures,
+            duration=time.perf_counter() - start,
+            status_code=record.status_code,
+            variables=extracted,
+            record=record,
+        )
+
+
+class ExecutionPlan:
+    """
+    Compiled suite file that ready to be executed
+
+    :param name: name of suite
+    :param steps: list of compiled test case
+    :param variables: suite variables that already substituted
+    :param source_hash: SHA-256 of the suite file
+    :param graph: dependencies of every step that resolved
+        at compile time, by default resolved on the first run
+    """
+
+    def __init__(
+        self,
+        name: str,
+        steps: List[PlanStep],
+        variables: Optional[Dict[str, Any]] = None,
+        source_hash: str = "",
+        graph: Optional[List[FrozenSet[int]]] = None,
+    ) -> None:
+        self.name = name
+        self.steps = steps
+        self.variables = variables or {}
+        self.source_hash = source_hash
+        self.graph = graph
+
+    def __repr__(self) -> str:
+        return f"<ExecutionPlan:{self.name}=>{len(self.steps)} steps>"
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def select(self, indexes: Iterable[int]) -> "ExecutionPlan":
+        """Returned new plan that only consist of steps with related indexes"""
+        return ExecutionPlan(
+            name=self.name,
+            steps=[self.steps[index] for index in indexes],
+            variables=self.variables,
+            source_hash=self.source_hash,
+        )
+
+    def to_dict(self) -> dict:
+        """Returned JSON serializable representation of execution plan"""
+        if self.graph is None:
+            self.graph = resolve_dependencies(self.steps)
+        return {
+            "name": self.name,
+            "steps": [step.to_dict() for step in self.steps],
+            "variables": self.variables,
+            "source_hash": self.source_hash,
+            "graph": [sorted(dependencies) for dependencies in self.graph],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ExecutionPlan":
+        """Restore execution plan from `to_dict` without compiling it again"""
+        return cls(
+            name=data["name"],
+            steps=[PlanStep.from_dict(step) for step in data["steps"]],
+            variables=data["variables"],
+            source_hash=data["source_hash"],
+            graph=[frozenset(dependencies) for dependencies in data["graph"]],
+        )
+
+    @property
+    def is_independent(self) -> bool:
+        """Property method to return whether no step depend on the others"""
+        return not any(step.extract or step.depends_on for step in self.steps)
+
+    def run(
+        self,
+        runner: Optional[Runner] = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> List[CaseResult]:
+        """
+        Execute all steps of plan with `Scheduler`, independent
+        steps are run concurrently while the step that need
+        extracted variables only wait for the steps that extract them
+
+        :param runner: concurrent runner, by default using `Runner()`
+        :param variables: additional variables for placeholder that
+            wasn't defined in suite file (ex: environment specific)
+
+        Returned as list of test case result
+        """
+        context = dict(self.variables)
+        context.update(variables or {})
+        if self.graph is None:
+            self.graph = resolve_dependencies(self.steps)
+        return Scheduler(runner).run(self.steps, context, graph=self.graph)
+
+
+def load_document(path: str) -> Tuple[dict, str]:
+    """
+    Load suite file in JSON or YAML format, YAML format
+    required to install `PyYAML` package
+
+    :param path: path of suite file
+
+    Returned as tuple of suite document and its SHA-256 hash
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError(f"YAML suite file need `PyYAML` package {e}")
+        document = yaml.safe_load(raw)
+    else:
+        document = json.loads(raw)
+
+    if not isinstance(document, dict):
+        raise ValueError(f"Suite file {path} must be mapping object")
+    return document, hashlib.sha256(raw).hexdigest()
+
+
+def compile_assertion(step_name: str, entry: Any) -> Tuple[str, Template]:
+    """
+    Compile one assertion entry of suite file, such as
+    ``assert_is_2xx_status`` or ``{"assert_status_code_in": [200, 201]}``.
+    The arguments are validated against the signature of method
+
+    Returned as pair of method name and template of keyword arguments
+    """
+    if isinstance(entry, str):
+        name, arguments = entry, {}
+    elif isinstance(entry, dict) and len(entry) == 1:
+        name, arguments = next(iter(entry.items()))
+    else:
+        raise ValueError(f"Invalid assertion {entry!r} in {step_name}")
+
+    method = getattr(Assert, name, None)
+    if not name.startswith("assert_") or method is None:
+        raise ValueError(f"There's no assertion method {name} in {step_name}")
+
+    parameters = [
+        parameter
+        for parameter in inspect.signature(method).parameters.values()
+        if parameter.name != "self"
+    ]
+    if arguments is None:
+        arguments = {}
+    elif not isinstance(arguments, dict):
+        # shorthand for the first argument, ex: assert_status_code_in: [200]
+        arguments = {parameters[0].name: arguments}
+    else:
+        arguments = dict(arguments)
+
+    if any(parameter.name == "message" for parameter in parameters):
+        arguments.setdefault("message", f"{step_name}: {name}")
+
+    try:
+        inspect.signature(method).bind(None, **arguments)
+    except TypeError as error:
+        raise ValueError(f"Invalid arguments of {name} in {step_name}: {error}")
+    return name, Template(arguments)
+
+
+def compile_suite(
+    document: dict, source_hash: str = "", base_dir: Optional[str] = None
+) -> ExecutionPlan:
+    """
+    Compile suite document into execution plan. The suite
+    variables and defaults are substituted at compile time,
+    so only variables from extractors left to be rendered
+
+    :param document: suite document that loaded from file
+    :param source_hash: SHA-256 of suite file
+    :param base_dir: directory that relative fixture path resolved
+        against, by default set to None which means current directory
+    """
+    variables = dict(document.get("variables") or {})
+    defaults = dict(document.get("defaults") or {})
+    base_url = document.get("base_url", "")
+
+    steps = []
+    for index, case in enumerate(document.get("tests") or []):
+        name = case.get("name", f"test {index + 1}")
+        request = dict(defaults)
+        request.update(case.get("request") or {})
+
+        unknown = set(request) - set(REQUEST_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown request keys {sorted(unknown)} in {name}")
+        if "method" not in request or "url" not in request:
+            raise ValueError(f"Request of {name} need `method` and `url`")
+
+        headers = dict(defaults.get("headers") or {})
+        headers.update((case.get("request") or {}).get("headers") or {})
+        request["headers"] = headers
+        if request["url"].startswith("/"):
+            request["url"] = f"{base_url.rstrip('/')}{request['url']}"
+
+        extract = {
+            variable: Extractor(expression)
+            for variable, expression in (case.get("extract") or {}).items()
+        }
+        assertions = [
+            compile_assertion(name, entry) for entry in case.get("assert") or []
+        ]
+        assertions = [
+            (method, arguments.partial(variables)) for method, arguments in assertions
+        ]
+        depends_on = case.get("depends_on") or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        steps.append(
+            PlanStep(
+                name=name,
+                request=Template(request).partial(variables),
+                extract=extract,
+                assertions=assertions,
+                depends_on=list(depends_on),
+                base_dir=base_dir,
+            )
+        )
+
+    # unknown and circular dependencies are
+    # reported at compile time instead of runtime
+    graph = resolve_dependencies(steps)
+    return ExecutionPlan(
+        name=document.get("name", "suite"),
+        steps=steps,
+        variables=variables,
+        source_hash=source_hash,
+        graph=graph,
+    )
+
+
+def default_cache_dir() -> str:
+    """
+    Returned directory of cached plans in user cache directory,
+    ``$XDG_CACHE_HOME/maritest/plans`` or ``~/.cache/maritest/plans``
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "maritest", "plans")
+
+
+def load_plan(
+    path: str, cache_dir: Optional[str] = None, use_cache: bool = True
+) -> ExecutionPlan:
+    """
+    Load suite file and compile it into execution plan. The
+    plan is cached on disk as JSON keyed by hash of the suite
+    file, so unchanged suite file only compiled once. The cached
+    plan is only used if its header match the suite file hash and
+    the plan version, otherwise the suite file is compiled again
+
+    :param path: path of suite file (JSON or YAML)
+    :param cache_dir: directory of cached plan, by default set
+        to user cache directory (see `default_cache_dir`)
+    :param use_cache: read and write cached plan, by default set to True
+    """
+    document, source_hash = load_document(path)
+    # fixture path in the suite is relative to the suite file
+    base_dir = os.path.dirname(os.path.abspath(path))
+    if not use_cache:
+        return compile_suite(document, source_hash, base_dir)
+
+    header = {
+        "plan_version": PLAN_VERSION,
+        "maritest": __version__,
+        "source_hash": source_hash,
+        "base_dir": base_dir,
+    }
+    key = hashlib.sha256(json.dumps(header, sort_keys=True).encode("utf-8")).hexdigest()
+    cache_path = os.path.join(cache_dir or default_cache_dir(), f"{key}.json")
+
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("header") == header:
+            return ExecutionPlan.from_dict(cached["plan"])
+    except (OSError, ValueError, LookupError, TypeError, AttributeError):
+        # missing or invalid cache, compile it again
+        pass
+
+    plan = compile_suite(document, source_hash, base_dir)
+    try:
+        payload = {"header": header, "plan": plan.to_dict()}
+        content = json.dumps(payload)
+        # skip the plan that can't be restored as it is from
+        # JSON (ex: non-string keys or dates from YAML file)
+        if json.loads(content) != payload:
+            return plan
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temporary_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # cache is only optimization,
+        # the plan still can be used
+        pass
+    return plan
+
+
+def run_suite(
+    path: str,
+    runner: Optional[Runner] = None,
+    variables: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+) -> List[CaseResult]:
+    """
+    Load, compile and execute suite file
+
+    :param path: path of suite file (JSON or YAML)
+    :param runner: concurrent runner, by default using `Runner()`
+    :param variables: additional variables for placeholder that
+        wasn't defined in suite file
+    :param cache_dir: directory of cached plan
+    """
+    return load_plan(path, cache_dir=cache_dir).run(runner=runner, variables=variables)
@@ -0,0 +1,777 @@
+import asyncio
+import datetime
+import http
+import io
+import os
+import sys
+import threading
+import urllib.parse
+import requests
+
+from abc import ABC, abstractmethod
+from email.message import Message
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from requests.adapters import HTTPAdapter
+from requests.cookies import MockRequest, MockResponse, RequestsCookieJar
+from requests.hooks import dispatch_hook
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+from .utils.dns_cache import DNSCache
+from .utils.tls import SSLContextCache, TLSAdapter
+from .utils.tls import ssl_contexts as shared_ssl_contexts
+
+
+class BaseTransport(ABC):
+    """
+    Base class for transport layer of HTTP client. Transport
+    receive prepared request from `Http` and returned it as
+    `requests.Response`, so all properties and assertion
+    methods have the same behavior whatever the transport is
+    """
+
+    name = "base"
+
+    def __repr__(self) -> str:
+        return f"<Transport:{self.name}>"
+
+    @abstractmethod
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        session: Optional[requests.Session] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send prepared request to HTTP target
+
+        :param request: prepared request that want to be send
+        :param session: request session that created by `Http`,
+            only required by transport that built on top of it
+        :param kwargs: keyword arguments of sending request such
+            as `timeout`, `allow_redirects`, `verify`, `proxies`,
+            `stream` and `cert`
+
+        Returned as HTTP response object
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Close all resources that held by transport"""
+        pass
+
+    @staticmethod
+    def session_retry(session: Optional[requests.Session]) -> Optional[Retry]:
+        """
+        Returned retry policy that mounted into adapter of the session
+        by `Http` (see ``retry`` argument), None if retry was turned off
+        """
+        if session is None:
+            return None
+        for adapter in session.adapters.values():
+            retry = getattr(adapter, "max_retries", None)
+            if isinstance(retry, Retry) and retry.total:
+                return retry
+        return None
+
+    def dispatch_response_hooks(
+        self,
+        request: requests.PreparedRequest,
+        response: requests.Response,
+        session: Optional[requests.Session] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Dispatch response hooks of the request (ex: digest
+        auth challenge), same as like `requests.Session` did
+        """
+        response.connection = TransportConnection(self, session)
+        return dispatch_hook("response", request.hooks, response, **kwargs)
+
+
+class TransportConnection:
+    """
+    Adapter-like object that attached into response as
+    `connection` attribute, so response hooks able
+    to re-send the request through the same transport
+    """
+
+    def __init__(
+        self, transport: BaseTransport, session: Optional[requests.Session] = None
+    ) -> None:
+        self.transport = transport
+        self.session = session
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        return self.transport.send(request, session=self.session, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+class RequestsTransport(BaseTransport):
+    """
+    Default transport that send the request
+    with `requests.Session` (HTTP/1.1 with urllib3)
+
+    :param dns_cache: `DNSCache` instance that installed into
+        adapters of the session, so the host isn't resolved
+        for every new connection. By default set to None
+    :param ssl_contexts: Reuse SSL context and resume TLS session
+        across connections, set True to use the shared cache or give
+        `SSLContextCache` instance. By default set to None
+    """
+
+    name = "requests"
+
+    def __init__(
+        self,
+        dns_cache: Optional[DNSCache] = None,
+        ssl_contexts: Optional[Union[bool, SSLContextCache]] = None,
+    ) -> None:
+        # empty cache is falsy, so compare it explicitly
+        if ssl_contexts is True:
+            ssl_contexts = shared_ssl_contexts
+        elif ssl_contexts is False:
+            ssl_contexts = None
+        self.dns_cache = dns_cache
+        self.ssl_contexts = ssl_contexts
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        session: Optional[requests.Session] = None,
+        **kwargs,
+    ) -> requests.Response:
+        if session is None:
+            with requests.Session() as session:
+                return self.send(request, session=session, **kwargs)
+
+        for prefix, adapter in list(session.adapters.items()):
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            if self.ssl_contexts is not None and not isinstance(adapter, TLSAdapter):
+                adapter = TLSAdapter(self.ssl_contexts, max_retries=adapter.max_retries)
+                session.mount(prefix, adapter)
+            if self.dns_cache is not None:
+                self.dns_cache.install(adapter)
+        return session.send(request, **kwargs)
+
+
+class Http2Transport(BaseTransport):
+    """
+    HTTP/2 transport built on top of `httpx` package. It
+    keeps one client per host for the whole process, so many
+    concurrent requests are multiplexed as streams over a
+    single connection per host instead of one request per connection.
+    The retry policy of `Http` is applied same as like `requests`
+    (connection errors and 429/5xx status code with backoff), and
+    with ``stream=True`` the body is read from the network when it's
+    accessed. Required to install `httpx[http2]` package
+
+    :param client_options: keyword arguments that passed into
+        `httpx.Client` constructor, for example `limits`
+    """
+
+    name = "http2"
+
+    def __init__(self, **client_options) -> None:
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                f"HTTP/2 transport need `httpx[http2]` package to be installed {e}"
+            )
+
+        self.httpx = httpx
+        self.client_options = client_options
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get_client(
+        self, url: str, verify: Any = True, cert: Any = None, proxy: Any = None
+    ):
+        """
+        Returned `httpx.Client` for related host and
+        TLS configuration, create it if not exists
+        """
+        parse_url = urllib.parse.urlparse(url)
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        key = (parse_url.scheme, parse_url.netloc.lower(), verify, cert, proxy)
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                options = {"http2": True, "verify": verify, "cert": cert}
+                if proxy is not None:
+                    options["proxy"] = proxy
+                options.update(self.client_options)
+                client = self.httpx.Client(**options)
+                self._clients[key] = client
+            return client
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        session: Optional[requests.Session] = None,
+        **kwargs,
+    ) -> requests.Response:
+        httpx = self.httpx
+        proxies = kwargs.get("proxies") or {}
+        scheme = urllib.parse.urlparse(request.url).scheme
+        verify = kwargs.get("verify")
+        client = self.get_client(
+            request.url,
+            verify=True if verify is None else verify,
+            cert=kwargs.get("cert"),
+            proxy=proxies.get(scheme),
+        )
+
+        stream = bool(kwargs.get("stream"))
+        start = datetime.datetime.now()
+        try:
+            response = self.send_with_retry(
+                client,
+                client.build_request(
+                    method=request.method,
+                    url=request.url,
+                    headers=list(request.headers.items()),
+                    content=request.body,
+                    timeout=kwargs.get("timeout"),
+                ),
+                retry=self.session_retry(session),
+                stream=stream,
+                follow_redirects=bool(kwargs.get("allow_redirects")),
+            )
+        except httpx.TimeoutException as error:
+            raise requests.exceptions.Timeout(error, request=request)
+        except httpx.ConnectError as error:
+            raise requests.exceptions.ConnectionError(error, request=request)
+        except httpx.HTTPError as error:
+            raise requests.exceptions.RequestException(error, request=request)
+        elapsed = datetime.datetime.now() - start
+
+        history = [
+            build_response(
+                request=request,
+                status_code=redirect.status_code,
+                headers=redirect.headers.multi_items(),
+                content=redirect.content,
+                url=str(redirect.url),
+                reason=redirect.reason_phrase,
+            )
+            for redirect in response.history
+        ]
+        result = build_response(
+            request=request,
+            status_code=response.status_code,
+            headers=response.headers.multi_items(),
+            content=None if stream else response.content,
+            url=str(response.url),
+            reason=response.reason_phrase,
+            elapsed=elapsed,
+            history=history,
+        )
+        if stream:
+            # body is read later through `raw`, same as like urllib3 response
+            result.raw = _HttpxStream(httpx, response)
+        return self.dispatch_response_hooks(request, result, session=session, **kwargs)
+
+    def send_with_retry(self, client, request, retry: Optional[Retry], **options):
+        """
+        Send `httpx.Request` with urllib3 retry policy, connection errors
+        and retryable status code are sent again after the backoff (or
+        ``Retry-After`` header). If the retries are exhausted because of
+        the status code, `requests.exceptions.RetryError` is raised
+
+        :param client: `httpx.Client` that send the request
+        :param request: `httpx.Request` that want to be send
+        :param retry: urllib3 `Retry`, None to send the request once
+        :param options: keyword arguments of `httpx.Client.send`
+        """
+        httpx = self.httpx
+        while True:
+            try:
+                response = client.send(request, **options)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as error:
+                if retry is None:
+                    raise
+                try:
+                    retry = retry.increment(
+                        request.method, str(request.url), error=error
+                    )
+                except MaxRetryError:
+                    raise error
+                retry.sleep()
+                continue
+
+            has_retry_after = "Retry-After" in response.headers
+            if retry is None or not retry.is_retry(
+                request.method, response.status_code, has_retry_after
+            ):
+                return response
+            try:
+                retry = retry.increment(request.method, str(request.url))
+            except MaxRetryError as error:
+                if not retry.raise_on_status:
+                    return response
+                response.close()
+                raise requests.exceptions.RetryError(error)
+            response.close()
+            retry.sleep(response)
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+class _HttpxStream:
+    """
+    Private file-like object that attached into response as `raw`
+    attribute when `httpx` response was streamed, so `requests`
+    (ex: `iter_content`) read the body same as like urllib3 response
+    """
+
+    def __init__(self, httpx, response) -> None:
+        self.httpx = httpx
+        self.response = response
+        self._buffer = b""
+        self._chunks: Optional[Iterable[bytes]] = None
+
+    def stream(self, chunk_size: Optional[int] = None, decode_content: bool = True):
+        """Yield chunks of body, decoded from content-encoding if set"""
+        httpx = self.httpx
+        if decode_content:
+            chunks = self.response.iter_bytes(chunk_size)
+        else:
+            chunks = self.response.iter_raw(chunk_size)
+        try:
+            yield from chunks
+        except httpx.TimeoutException as error:
+            raise requests.exceptions.ConnectionError(error)
+        except httpx.DecodingError as error:
+            raise requests.exceptions.ContentDecodingError(error)
+        except httpx.HTTPError as error:
+            raise requests.exceptions.ChunkedEncodingError(error)
+        finally:
+            self.close()
+
+    def read(self, amt: Optional[int] = None, decode_content: bool = True) -> bytes:
+        """Read up to ``amt`` bytes of the body, or the rest if None"""
+        if self._chunks is None:
+            self._chunks = self.stream(decode_content=decode_content)
+        while amt is None or len(self._buffer) < amt:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if amt is None:
+            amt = len(self._buffer)
+        data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self) -> None:
+        self.response.close()
+
+    def release_conn(self) -> None:
+        self.response.close()
+
+
+class InProcessTransport(BaseTransport):
+    """
+    Base class for transport that call the application
+    directly in the same process without opening socket.
+    Sub-class only need to implement `handle` method, while
+    redirection and response hooks are handled in here.
+    Since there's no network, the ``retry`` of `Http` isn't
+    applied and the body is always read at once (``stream``
+    doesn't defer reading it)
+
+    :param max_redirects: maximum numbers of redirection
+        that will be followed, by default set to 30
+    """
+
+    name = "in-process"
+    redirect_codes = (301, 302, 303, 307, 308)
+
+    def __init__(self, max_redirects: int = 30) -> None:
+        self.max_redirects = max_redirects
+
+    @abstractmethod
+    def handle(
+        self, request: requests.PreparedRequest
+    ) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """
+        Call the application with prepared request
+
+        Returned as tuple of status code, headers and body
+        """
+        raise NotImplementedError
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        session: Optional[requests.Session] = None,
+        **kwargs,
+    ) -> requests.Response:
+        history: List[requests.Response] = []
+        while True:
+            start = datetime.datetime.now()
+            status_code, headers, content = self.handle(request)
+            response = build_response(
+                request=request,
+                status_code=status_code,
+                headers=headers,
+                content=content,
+                elapsed=datetime.datetime.now() - start,
+                history=list(history),
+            )
+            location = response.headers.get("location")
+            if (
+                not kwargs.get("allow_redirects")
+                or status_code not in self.redirect_codes
+                or location is None
+            ):
+                break
+            if len(history) >= self.max_redirects:
+                raise requests.exceptions.TooManyRedirects(
+                    f"Exceeded {self.max_redirects} redirects.", response=response
+                )
+            history.append(response)
+            request = self.redirect_request(request, status_code, location)
+
+        return self.dispatch_response_hooks(
+            request, response, session=session, **kwargs
+        )
+
+    @staticmethod
+    def redirect_request(
+        request: requests.PreparedRequest, status_code: int, location: str
+    ) -> requests.PreparedRequest:
+        """Returned new prepared request to follow the redirection"""
+        redirect = request.copy()
+        redirect.prepare_url(urllib.parse.urljoin(request.url, location), None)
+        if status_code == 303 or (
+            status_code in (301, 302) and request.method == "POST"
+        ):
+            # same as like browser and requests did,
+            # change the method and drop the body
+            redirect.method = "GET"
+            redirect.body = None
+            for header in ("Content-Length", "Content-Type", "Transfer-Encoding"):
+                redirect.headers.pop(header, None)
+        return redirect
+
+    @staticmethod
+    def read_body(request: requests.PreparedRequest) -> bytes:
+        """Returned body of prepared request in bytes"""
+        body = request.body
+        if body is None:
+            return b""
+        if isinstance(body, str):
+            return body.encode("utf-8")
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            return bytes(body)
+        if hasattr(body, "read"):
+            return body.read()
+        return b"".join(
+            chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk)
+            for chunk in body
+        )
+
+
+class WSGITransport(InProcessTransport):
+    """
+    In-process transport that call WSGI application (such as
+    Flask or Django) directly, so the services can be tested
+    at function-call speed without opening any socket
+
+    :param app: WSGI application callable
+    :param script_name: mount point of application, by default set to empty
+    :param remote_addr: client address of request, by default set to 127.0.0.1
+    :param max_redirects: maximum numbers of redirection that will be followed
+    """
+
+    name = "wsgi"
+
+    def __init__(
+        self,
+        app: Callable,
+        script_name: str = "",
+        remote_addr: str = "127.0.0.1",
+        max_redirects: int = 30,
+    ) -> None:
+        super().__init__(max_redirects=max_redirects)
+        self.app = app
+        self.script_name = script_name
+        self.remote_addr = remote_addr
+
+    def build_environ(self, request: requests.PreparedRequest) -> dict:
+        """Returned WSGI environ based on prepared request"""
+        parse_url = urllib.parse.urlsplit(request.url)
+        body = self.read_body(request)
+        default_port = "443" if parse_url.scheme == "https" else "80"
+        environ = {
+            "REQUEST_METHOD": request.method,
+            "SCRIPT_NAME": self.script_name,
+            "PATH_INFO": urllib.parse.unquote(parse_url.path or "/", "latin-1"),
+            "QUERY_STRING": parse_url.query,
+            "SERVER_NAME": parse_url.hostname or "localhost",
+            "SERVER_PORT": str(parse_url.port or default_port),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": self.remote_addr,
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": parse_url.scheme,
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for key, value in request.headers.items():
+            key = key.upper().replace("-", "_")
+            if key == "CONTENT_TYPE":
+                environ["CONTENT_TYPE"] = value
+            elif key != "CONTENT_LENGTH":
+                environ[f"HTTP_{key}"] = value
+        return environ
+
+    def handle(
+        self, request: requests.PreparedRequest
+    ) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        response: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info is not None and response:
+                raise exc_info[1].with_traceback(exc_info[2])
+            response["status"] = status
+            response["headers"] = headers
+            return chunks.append
+
+        result = self.app(self.build_environ(request), start_response)
+        try:
+            for chunk in result:
+                chunks.append(chunk)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+        status_code = int(response["status"].split(" ", 1)[0])
+        return status_code, list(response["headers"]), b"".join(chunks)
+
+
+class ASGITransport(InProcessTransport):
+    """
+    In-process transport that call ASGI application (such
+    as Starlette or FastAPI) directly in event loop, so the
+    services can be tested without opening any socket
+
+    :param app: ASGI application callable
+    :param root_path: mount point of application, by default set to empty
+    :param client: client address of request, by default set to 127.0.0.1
+    :param max_redirects: maximum numbers of redirection that will be followed
+    """
+
+    name = "asgi"
+
+    def __init__(
+        self,
+        app: Callable,
+        root_path: str = "",
+        client: Tuple[str, int] = ("127.0.0.1", 123),
+        max_redirects: int = 30,
+    ) -> None:
+        super().__init__(max_redirects=max_redirects)
+        self.app = app
+        self.root_path = root_path
+        self.client = client
+
+    def build_scope(self, request: requests.PreparedRequest) -> dict:
+        """Returned ASGI HTTP connection scope based on prepared request"""
+        parse_url = urllib.parse.urlsplit(request.url)
+        default_port = 443 if parse_url.scheme == "https" else 80
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": parse_url.scheme,
+            "path": urllib.parse.unquote(parse_url.path or "/"),
+            "raw_path": (parse_url.path or "/").encode("latin-1"),
+            "query_string": parse_url.query.encode("latin-1"),
+            "root_path": self.root_path,
+            "headers": [
+                (key.lower().encode("latin-1"), str(value).encode("latin-1"))
+                for key, value in request.headers.items()
+            ],
+            "client": self.client,
+            "server": (
+                parse_url.hostname or "localhost",
+                parse_url.port or default_port,
+            ),
+        }
+
+    async def call_app(
+        self, request: requests.PreparedRequest
+    ) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """Call ASGI application and collect the response messages"""
+        body = self.read_body(request)
+        request_complete = False
+        response: Dict[str, Any] = {"status": 500, "headers": []}
+        chunks: List[bytes] = []
+
+        async def receive():
+            nonlocal request_complete
+            if not request_complete:
+                request_complete = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    (key.decode("latin-1"), value.decode("latin-1"))
+                    for key, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(self.build_scope(request), receive, send)
+        return response["status"], response["headers"], b"".join(chunks)
+
+    def handle(
+        self, request: requests.PreparedRequest
+    ) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.call_app(request))
+
+        # already inside running event loop (ex: async test case),
+        # so run the application in other thread with its own loop
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.call_app(request)).result()
+
+
+def build_response(
+    request: requests.PreparedRequest,
+    status_code: int,
+    headers: Iterable[Tuple[str, str]],
+    content: Optional[bytes],
+    url: Optional[str] = None,
+    reason: Optional[str] = None,
+    elapsed: Optional[datetime.timedelta] = None,
+    history: Optional[list] = None,
+) -> requests.Response:
+    """
+    Helper to build `requests.Response` from the result of
+    other transport, with the body already loaded
+
+    :param request: prepared request that was sent
+    :param status_code: HTTP status code, integer type
+    :param headers: pair of header name and value, repeated
+        header will be combined same as like requests did
+    :param content: response body in bytes, None if the body will be
+        read from `raw` attribute that set by the caller (streamed)
+    :param url: final url of the response, by default set to request url
+    :param reason: reason phrase of status code, by default
+        set to standard phrase of related status code
+    :param elapsed: duration between send request and response arrived
+    :param history: list of redirection response
+
+    Returned as HTTP response object
+    """
+    response = requests.Response()
+    message = Message()
+    combined: Dict[str, str] = {}
+    for key, value in headers:
+        message[key] = value
+        if key.lower() in combined and key.lower() != "set-cookie":
+            combined[key.lower()] = f"{combined[key.lower()]}, {value}"
+        else:
+            combined[key.lower()] = value
+    response.headers = CaseInsensitiveDict(combined)
+
+    if not reason:
+        try:
+            reason = http.HTTPStatus(status_code).phrase
+        except ValueError:
+            reason = ""
+
+    response.status_code = status_code
+    response.reason = reason
+    response.url = url or request.url
+    response.request = request
+    response.history = history or []
+    response.elapsed = elapsed or datetime.timedelta(0)
+    if content is not None:
+        response._content = content
+        response._content_consumed = True
+
+    cookie_jar = RequestsCookieJar()
+    cookie_jar.extract_cookies(MockResponse(message), MockRequest(request))
+    response.cookies = cookie_jar
+    return response
+
+
+# name of transport that can be
+# selected per run or per request
+TRANSPORTS = {
+    RequestsTransport.name: RequestsTransport,
+    Http2Transport.name: Http2Transport,
+}
+
+_lock = threading.Lock()
+_instances: Dict[str, BaseTransport] = {}
+_default_transport: Optional[BaseTransport] = None
+
+
+def get_transport(transport: Union[str, BaseTransport, None] = None) -> BaseTransport:
+    """
+    Returned transport instance based on argument, name of
+    transport will be shared as one instance for whole process.
+    If argument is None, returned the default transport that
+    configured by `set_default_transport` or `MARITEST_TRANSPORT`
+    environment variable, otherwise using requests transport
+
+    :param transport: name of transport or transport instance
+    """
+    if isinstance(transport, BaseTransport):
+        return transport
+
+    if transport is None:
+        if _default_transport is not None:
+            return _default_transport
+        transport = os.environ.get("MARITEST_TRANSPORT", RequestsTransport.name)
+
+    if transport not in TRANSPORTS:
+        raise NotImplementedError(f"There's no transport with name {transport}")
+
+    with _lock:
+        instance = _instances.get(transport)
+        if instance is None:
+            instance = TRANSPORTS[transport]()
+            _instances[transport] = instance
+        return instance
+
+
+def set_default_transport(transport: Union[str, BaseTransport, None]) -> None:
+    """
+    Set default transport for all `Http` instances that
+    not given transport argument, set None to reset it
+
+    :param transport: name of transport or transport instance
+    """
+    global _default_transport
+    _default_transport = None if transport is None else get_transport(transport)
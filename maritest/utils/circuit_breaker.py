@@ -0,0 +1,210 @@
+import threading
+import time
+import urllib.parse
+
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict, Optional
+
+
+class CircuitState(str, Enum):
+    """Enum class that represent for circuit breaker state"""
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one HTTP endpoint. The breaker keeps
+    a sliding window of the latest request outcomes and will
+    trip into open state once the failure rate reach the threshold,
+    so every next request fail fast instead of waiting for
+    timeout and retry attempts
+
+    :param failure_threshold: ratio of failed request (0 - 1) inside
+        the window that will open the circuit, by default set to 0.5
+    :param window_size: numbers of latest outcomes that kept
+        to calculate the failure rate, by default set to 20
+    :param minimum_calls: minimum outcomes recorded in the window
+        before the failure rate is evaluated, by default set to 5
+    :param recovery_timeout: duration in seconds of open state
+        before allowing probe request (half-open), by default set to 30
+    :param half_open_max_calls: numbers of probe request that
+        allowed concurrently while in half-open state, by default set to 1
+    :param clock: callable that returned current time in seconds,
+        by default set to `time.monotonic`
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        window_size: int = 20,
+        minimum_calls: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < failure_threshold <= 1:
+            raise ValueError("failure_threshold must be in range of 0 - 1")
+
+        if window_size < 1 or minimum_calls < 1 or half_open_max_calls < 1:
+            raise ValueError(
+                "window_size, minimum_calls and half_open_max_calls must be positive"
+            )
+
+        self.failure_threshold = failure_threshold
+        self.window_size = window_size
+        self.minimum_calls = min(minimum_calls, window_size)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._window: deque = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+    def __repr__(self) -> str:
+        return f"<CircuitBreaker:{self.state.value}=>{self.failure_rate:.2f}>"
+
+    @property
+    def state(self) -> CircuitState:
+        """Property method to return current state of circuit"""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    @property
+    def failure_rate(self) -> float:
+        """Property method to return failure rate inside the window"""
+        with self._lock:
+            return self._failure_rate()
+
+    @property
+    def retry_after(self) -> float:
+        """Property method to return remaining seconds before circuit half-open"""
+        with self._lock:
+            if self._state != CircuitState.OPEN:
+                return 0.0
+            remaining = self._opened_at + self.recovery_timeout - self.clock()
+            return max(remaining, 0.0)
+
+    def allow_request(self) -> bool:
+        """
+        Check whether request is allowed to be send, for half-open
+        state it will reserve one of probe slot. Returned False
+        if the circuit is open or all probe slots are taken
+        """
+        with self._lock:
+            self._refresh_state()
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN:
+                if self._probes < self.half_open_max_calls:
+                    self._probes += 1
+                    return True
+            return False
+
+    def record_success(self) -> None:
+        """Record succeed request, probe success will close the circuit"""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._reset(CircuitState.CLOSED)
+            else:
+                self._window.append(False)
+
+    def record_failure(self) -> None:
+        """Record failed request, probe failure will re-open the circuit"""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._reset(CircuitState.OPEN)
+                return
+
+            self._window.append(True)
+            if (
+                self._state == CircuitState.CLOSED
+                and len(self._window) >= self.minimum_calls
+                and self._failure_rate() >= self.failure_threshold
+            ):
+                self._reset(CircuitState.OPEN)
+
+    def reset(self) -> None:
+        """Force the circuit into closed state and clear the window"""
+        with self._lock:
+            self._reset(CircuitState.CLOSED)
+
+    def _failure_rate(self) -> float:
+        if not self._window:
+            return 0.0
+        return sum(self._window) / len(self._window)
+
+    def _refresh_state(self) -> None:
+        # open state only move into half-open lazily
+        # whenever someone ask for it after recovery timeout
+        if (
+            self._state == CircuitState.OPEN
+            and self.clock() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+
+    def _reset(self, state: CircuitState) -> None:
+        self._state = state
+        self._window.clear()
+        self._probes = 0
+        if state == CircuitState.OPEN:
+            self._opened_at = self.clock()
+
+
+class CircuitBreakerRegistry:
+    """
+    Collection of circuit breaker for each endpoint (scheme
+    and host of url), all breakers created by registry will
+    share the same configuration based on keyword arguments
+
+    :param options: keyword arguments that passed
+        into `CircuitBreaker` constructor
+    """
+
+    def __init__(self, **options) -> None:
+        self.options = options
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def __len__(self) -> int:
+        return len(self._breakers)
+
+    def __contains__(self, url: str) -> bool:
+        return self.endpoint(url) in self._breakers
+
+    @staticmethod
+    def endpoint(url: str) -> str:
+        """Given url, returned endpoint key of scheme and host"""
+        parse_url = urllib.parse.urlparse(url)
+        return f"{parse_url.scheme}://{parse_url.netloc}".lower()
+
+    def get(self, url: str) -> CircuitBreaker:
+        """Returned circuit breaker for related url, create it if not exists"""
+        endpoint = self.endpoint(url)
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(**self.options)
+                self._breakers[endpoint] = breaker
+            return breaker
+
+    def reset(self, url: Optional[str] = None) -> None:
+        """Remove breaker for related url, or remove all of them if not set"""
+        with self._lock:
+            if url is None:
+                self._breakers.clear()
+            else:
+                self._breakers.pop(self.endpoint(url), None)
+
+
+# default registry that shared for all Http
+# instances whenever circuit breaker is enabled
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,229 @@
+import zlib
+
+from typing import Dict, Iterable, List, Optional, Union
+
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .digest import CHUNK_SIZE, BodyDigest, read_ahead
+
+# content-encoding that can be decoded, ``br`` and ``zstd`` are only
+# available if `brotli` and `zstandard` packages were installed
+AVAILABLE_ENCODINGS = tuple(encoding.strip() for encoding in ACCEPT_ENCODING.split(","))
+
+
+def accept_encoding(encodings: Union[bool, str, Iterable[str]] = True) -> str:
+    """
+    Returned value of ``Accept-Encoding`` header
+
+    :param encodings: True for all available encodings, False for
+        ``identity`` only, or name of encodings such as ``gzip``, ``br``
+
+    Raise ValueError if one of encodings can't be decoded
+    """
+    if encodings is True:
+        return ", ".join(AVAILABLE_ENCODINGS)
+    if encodings is False:
+        return "identity"
+    if isinstance(encodings, str):
+        encodings = [encoding.strip() for encoding in encodings.split(",")]
+    encodings = list(encodings)
+    for encoding in encodings:
+        if encoding not in AVAILABLE_ENCODINGS and encoding != "identity":
+            raise ValueError(
+                f"Content-encoding {encoding} is not available, "
+                f"install `brotli` for br or `zstandard` for zstd"
+            )
+    return ", ".join(encodings)
+
+
+class _DeflateDecoder:
+    """
+    Private decoder of deflate encoding, some servers send raw
+    deflate stream instead of zlib format, so it's detected on the
+    first chunk the same way as urllib3 does
+    """
+
+    def __init__(self) -> None:
+        self._first = True
+        self._decoder = zlib.decompressobj()
+
+    def decompress(self, data: bytes) -> bytes:
+        if not self._first:
+            return self._decoder.decompress(data)
+        self._first = False
+        try:
+            return self._decoder.decompress(data)
+        except zlib.error:
+            self._decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._decoder.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._decoder.flush()
+
+
+class _GzipDecoder:
+    """Private decoder of gzip encoding that support multiple members"""
+
+    def __init__(self) -> None:
+        self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes) -> bytes:
+        output = []
+        while data:
+            output.append(self._decoder.decompress(data))
+            data = self._decoder.unused_data
+            if not data or not self._decoder.eof:
+                break
+            self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        return b"".join(output)
+
+    def flush(self) -> bytes:
+        return self._decoder.flush()
+
+
+class _BrotliDecoder:
+    """Private decoder of br encoding, with `brotli` or `brotlicffi` package"""
+
+    def __init__(self) -> None:
+        try:
+            import brotli
+        except ImportError:
+            try:
+                import brotlicffi as brotli
+            except ImportError as e:
+                raise ImportError(f"Decoding br content need `brotli` package {e}")
+        self._decoder = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        if hasattr(self._decoder, "decompress"):
+            return self._decoder.decompress(data)
+        return self._decoder.process(data)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def new_decoder(encoding: str):
+    """
+    Returned streaming decoder of content-encoding, the
+    decoder has ``decompress`` and ``flush`` methods
+
+    :param encoding: name of encoding, such as ``gzip``, ``deflate``, ``br`` or ``zstd``
+    """
+    if encoding in ("gzip", "x-gzip"):
+        return _GzipDecoder()
+    if encoding == "deflate":
+        return _DeflateDecoder()
+    if encoding == "br":
+        return _BrotliDecoder()
+    if encoding == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(f"Decoding zstd content need `zstandard` package {e}")
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise ValueError(f"Content-encoding {encoding} is not supported")
+
+
+class BodySize:
+    """
+    Size of response body on the wire and after decoded
+
+    :param encoding: content-encoding of response, ``identity`` if not encoded
+    :param wire: size of body as it was sent on the wire in bytes,
+        None if it couldn't be known
+    :param decoded: size of body after decoded in bytes
+    """
+
+    def __init__(self, encoding: str, wire: Optional[int], decoded: int) -> None:
+        self.encoding = encoding
+        self.wire = wire
+        self.decoded = decoded
+
+    def __repr__(self) -> str:
+        return f"<BodySize:{self.encoding} {self.wire}=>{self.decoded} bytes>"
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """Property method to return ratio of decoded size to wire size"""
+        if not self.wire:
+            return None
+        return self.decoded / self.wire
+
+
+def content_encodings(headers) -> List[str]:
+    """Returned list of content-encoding in the order they were applied"""
+    value = headers.get("Content-Encoding", "")
+    return [
+        encoding.strip().lower()
+        for encoding in value.split(",")
+        if encoding.strip() and encoding.strip().lower() != "identity"
+    ]
+
+
+def measure_body(
+    response,
+    chunk_size: int = CHUNK_SIZE,
+    digests: Optional[Dict[bool, BodyDigest]] = None,
+) -> BodySize:
+    """
+    Measure size of response body on the wire and after decoded.
+    If the response was requested with ``stream=True``, the encoded
+    body is read from the network and decoded chunk by chunk without
+    being held in memory, otherwise the bytes that read by urllib3
+    (or ``Content-Length`` header) is used as the size on the wire
+
+    :param response: response of `requests`
+    :param chunk_size: size of chunk in bytes
+    :param digests: digests of streamed body that computed in the
+        same pass, keyed by whether it's computed from decoded body
+        (True) or from body on the wire (False)
+
+    Returned as `BodySize`
+    """
+    encodings = content_encodings(response.headers)
+    encoding = ", ".join(encodings) or "identity"
+
+    # private attribute of `requests`, False until the body was read
+    if response._content is not False:
+        decoded = len(response.content or b"")
+        wire: Optional[int] = None
+        tell = getattr(response.raw, "tell", None)
+        if callable(tell) and (tell() or not decoded):
+            wire = tell()
+        elif not encodings:
+            wire = decoded
+        elif "Content-Length" in response.headers:
+            wire = int(response.headers["Content-Length"])
+        return BodySize(encoding, wire, decoded)
+
+    if response._content_consumed:
+        raise ValueError("Body of response was already consumed")
+
+    digests = digests or {}
+    wire_digest, decoded_digest = digests.get(False), digests.get(True)
+    # decoded in reverse order of the encodings that applied
+    decoders = [new_decoder(name) for name in reversed(encodings)]
+    wire = decoded = 0
+    chunks = read_ahead(response.raw.stream(chunk_size, decode_content=False))
+    try:
+        for chunk in chunks:
+            wire += len(chunk)
+            if wire_digest is not None:
+                wire_digest.update(chunk)
+            for decoder in decoders:
+                chunk = decoder.decompress(chunk)
+            decoded += len(chunk)
+            if decoded_digest is not None:
+                decoded_digest.update(chunk)
+    finally:
+        chunks.close()
+    for index, decoder in enumerate(decoders):
+        chunk = decoder.flush()
+        for rest in decoders[index + 1 :]:
+            chunk = rest.decompress(chunk)
+        decoded += len(chunk)
+        if decoded_digest is not None:
+            decoded_digest.update(chunk)
+    response._content_consumed = True
+    return BodySize(encoding, wire, decoded)
@@ -0,0 +1,257 @@
+import base64
+import binascii
+import hashlib
+import queue
+import threading
+import zlib
+
+from typing import Dict, Iterable, Iterator, Optional
+
+# default size of chunk that read from the body
+CHUNK_SIZE = 64 * 1024
+
+# algorithm names of digest headers (RFC 3230 and RFC 9530)
+HEADER_ALGORITHMS = {
+    "md5": "md5",
+    "sha": "sha1",
+    "sha-256": "sha256",
+    "sha-512": "sha512",
+}
+
+# marker of the end of body in the queue
+_END = object()
+
+
+class CRC32:
+    """Incremental CRC-32 checksum with the same interface as `hashlib` object"""
+
+    name = "crc32"
+    digest_size = 4
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def update(self, data: bytes) -> None:
+        self.value = zlib.crc32(data, self.value)
+
+    def digest(self) -> bytes:
+        return self.value.to_bytes(4, "big")
+
+    def hexdigest(self) -> str:
+        return f"{self.value:08x}"
+
+
+def new_hasher(algorithm: str):
+    """Returned new hash object of algorithm, ``crc32`` or any of `hashlib`"""
+    if algorithm == "crc32":
+        return CRC32()
+    return hashlib.new(algorithm)
+
+
+class BodyDigest:
+    """
+    Digests of response body that computed in one pass,
+    every chunk is fed into all hash objects while it's read
+
+    :param algorithms: name of algorithms, such as
+        ``sha256``, ``md5`` or ``crc32``
+    :param decoded: whether the digests are computed from
+        decoded body (content-encoding was removed)
+    """
+
+    def __init__(self, algorithms: Iterable[str], decoded: bool = True) -> None:
+        self.hashers = {algorithm: new_hasher(algorithm) for algorithm in algorithms}
+        self.decoded = decoded
+        self.size = 0
+
+    def __repr__(self) -> str:
+        return f"<BodyDigest:{sorted(self.hashers)} {self.size} bytes>"
+
+    def __contains__(self, algorithm: str) -> bool:
+        return algorithm in self.hashers
+
+    @property
+    def algorithms(self) -> frozenset:
+        """Property method to return computed algorithms"""
+        return frozenset(self.hashers)
+
+    def update(self, chunk: bytes) -> None:
+        """Feed one chunk of body into all hash objects"""
+        for hasher in self.hashers.values():
+            hasher.update(chunk)
+        self.size += len(chunk)
+
+    def digest(self, algorithm: str) -> bytes:
+        """Returned digest of body in bytes"""
+        return self.hashers[algorithm].digest()
+
+    def hexdigest(self, algorithm: str) -> str:
+        """Returned digest of body in hexadecimal"""
+        return self.hashers[algorithm].hexdigest()
+
+
+def iter_body(
+    response, chunk_size: int = CHUNK_SIZE, decode_content: bool = True
+) -> Iterator[bytes]:
+    """
+    Yielded body of response chunk by chunk, read from the
+    network if the response was requested with ``stream=True``
+
+    :param response: response of `requests`
+    :param chunk_size: size of chunk in bytes
+    :param decode_content: remove the content-encoding (ex: gzip)
+        of body, or keep it as it was sent on the wire
+    """
+    # private attribute of `requests`, False until the body was read
+    if response._content is not False:
+        encoding = response.headers.get("Content-Encoding", "identity")
+        if not decode_content and encoding != "identity":
+            raise ValueError(
+                "Encoded body was already decoded, send the request with stream=True"
+            )
+        content = memoryview(response.content or b"")
+        for start in range(0, len(content), chunk_size):
+            yield content[start : start + chunk_size]
+        return
+
+    if response._content_consumed:
+        raise ValueError(
+            "Body of response was already consumed, compute all digests at once"
+        )
+    if decode_content:
+        yield from response.iter_content(chunk_size)
+    else:
+        yield from response.raw.stream(chunk_size, decode_content=False)
+        response._content_consumed = True
+
+
+def _read(
+    chunks: Iterator[bytes], pending: queue.Queue, stopped: threading.Event
+) -> None:
+    def put(item) -> bool:
+        # consumer may stop early, so never block forever on full queue
+        while not stopped.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        for chunk in chunks:
+            if not put(chunk):
+                break
+        else:
+            put(_END)
+    except BaseException as error:
+        put(error)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            # release the connection when it's stopped early
+            close()
+
+
+def read_ahead(chunks: Iterator[bytes], queue_size: int = 8) -> Iterator[bytes]:
+    """
+    Yielded chunks that read by another thread into bounded queue, so
+    reading the next chunk from network overlap with processing the
+    current one. If the consumer stop early (or raised), the reader
+    thread is stopped and joined when this generator is closed
+
+    :param chunks: iterator of chunks (ex: `iter_body`)
+    :param queue_size: maximum numbers of chunk that read ahead
+    """
+    pending: queue.Queue = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+    reader = threading.Thread(
+        target=_read, args=(chunks, pending, stopped), daemon=True
+    )
+    reader.start()
+    try:
+        while True:
+            chunk = pending.get()
+            if chunk is _END:
+                break
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield chunk
+    finally:
+        stopped.set()
+        reader.join()
+
+
+def digest_body(
+    response,
+    algorithms: Iterable[str] = ("sha256",),
+    chunk_size: int = CHUNK_SIZE,
+    queue_size: int = 8,
+    decode_content: bool = True,
+) -> BodyDigest:
+    """
+    Compute digests of response body incrementally. If the response
+    was requested with ``stream=True``, the body is read by another
+    thread into bounded queue while the chunks are hashed, so hashing
+    overlap with network read (`hashlib` release the GIL for large
+    data) and the memory stays constant (``chunk_size * queue_size``)
+
+    :param response: response of `requests`
+    :param algorithms: name of algorithms, by default only ``sha256``
+    :param chunk_size: size of chunk in bytes, by default set to 64 KiB
+    :param queue_size: maximum numbers of chunk that read ahead
+    :param decode_content: compute from decoded body, or from body as
+        it was sent on the wire (for digest headers)
+
+    Returned as `BodyDigest`
+    """
+    digest = BodyDigest(algorithms, decoded=decode_content)
+    chunks = iter_body(response, chunk_size, decode_content)
+    if response._content is not False:
+        # the body was already in memory, nothing to overlap
+        for chunk in chunks:
+            digest.update(chunk)
+        return digest
+
+    chunks = read_ahead(chunks, queue_size)
+    try:
+        for chunk in chunks:
+            digest.update(chunk)
+    finally:
+        chunks.close()
+    return digest
+
+
+def parse_digest_headers(headers) -> Dict[str, Optional[bytes]]:
+    """
+    Parse expected digests of body from ``Content-MD5``, ``Digest``
+    (RFC 3230), ``Content-Digest`` and ``Repr-Digest`` (RFC 9530)
+    headers. Unsupported algorithms are ignored
+
+    :param headers: response headers
+
+    Returned as mapping of algorithm name (`hashlib`) and digest in bytes
+    """
+    expected: Dict[str, Optional[bytes]] = {}
+    content_md5 = headers.get("Content-MD5")
+    if content_md5:
+        expected["md5"] = _decode(content_md5)
+
+    for name in ("Digest", "Content-Digest", "Repr-Digest"):
+        value = headers.get(name)
+        if not value:
+            continue
+        for item in value.split(","):
+            algorithm, _, encoded = item.strip().partition("=")
+            algorithm = HEADER_ALGORITHMS.get(algorithm.strip().lower())
+            if algorithm is not None:
+                # RFC 9530 wrap the value as byte sequence (:base64:)
+                expected[algorithm] = _decode(encoded.strip().strip(":"))
+    return expected
+
+
+def _decode(value: str) -> Optional[bytes]:
+    try:
+        return base64.b64decode(value.strip(), validate=True)
+    except (binascii.Error, ValueError):
+        return None
@@ -0,0 +1,273 @@
+import ipaddress
+import socket
+import threading
+import time
+
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+
+
+def record_ttl(host: str, lifetime: float = 1.0) -> Optional[float]:
+    """
+    Returned TTL of the address record of host, only if
+    `dnspython` package was installed, otherwise None
+
+    :param host: host that will be queried
+    :param lifetime: maximum seconds of the query, since it doesn't
+        use the system resolver (ex: hosts file) and may not be
+        answered at all. By default set to 1 second
+    """
+    try:
+        import dns.resolver
+    except ImportError:
+        return None
+
+    try:
+        answer = dns.resolver.resolve(host, "A", lifetime=lifetime)
+    except Exception:
+        return None
+    return float(answer.rrset.ttl)
+
+
+class _CachedConnection:
+    """
+    Private mixin of urllib3 connection that resolve the
+    host with `DNSCache` before opening the socket. Only the
+    address for socket is replaced, so the host header, SNI
+    and certificate verification still use the original host.
+    If the address is unreachable, the next cached address is tried
+    """
+
+    dns_cache: "DNSCache"
+
+    def _new_conn(self):
+        host = self._dns_host
+        addresses = self.dns_cache.resolve_all(host, self.port)
+        try:
+            for index, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (OSError, ConnectTimeoutError):
+                    self.dns_cache.report_failure(host, address)
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+
+
+class DNSCache:
+    """
+    In-process DNS cache for HTTP target hosts. Since every `Http`
+    instance open a new connection, the host is resolved for every
+    request without this cache. The resolved addresses are kept until
+    the TTL expired, TTL of the record can be respected too (needs
+    `dnspython` package) with extra query. Static overrides are useful for pointing
+    the suites at a different environment without changing the urls.
+    Connection use the first cached address, and fail over to the next
+    one if it's unreachable. Address that failed is moved to the end,
+    and the host is resolved again once all of its addresses failed
+
+    :param ttl: maximum seconds the addresses are cached, by default
+        set to 300 seconds. If TTL of the record is shorter, it will be used
+    :param overrides: mapping of host and static address, for
+        example ``{"api.example.com": "10.0.0.12"}``
+    :param respect_record_ttl: query TTL of the record with `dnspython`
+        and use it if it's shorter than ``ttl``. The query is sent to the
+        DNS servers directly (not through the system resolver) on every
+        cache miss and counted as lookup time, by default set to False
+    :param record_lifetime: maximum seconds of the TTL query, by default
+        set to 1 second
+    :param clock: function that returned current time in seconds,
+        by default set to `time.monotonic`
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        overrides: Optional[Dict[str, str]] = None,
+        respect_record_ttl: bool = False,
+        record_lifetime: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl < 0:
+            raise ValueError("ttl can't be negative")
+
+        self.ttl = ttl
+        self.overrides = {
+            host.lower().rstrip("."): address
+            for host, address in (overrides or {}).items()
+        }
+        self.respect_record_ttl = respect_record_ttl
+        self.record_lifetime = record_lifetime
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.lookup_time = 0.0
+        self.saved_time = 0.0
+        # host => (addresses, expired time, duration of lookup)
+        self._entries: Dict[str, Tuple[List[str], float, float]] = {}
+        # host => addresses that failed to connect since resolved
+        self._failures: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+        self.connection_classes = {
+            "http": type(
+                "CachedHTTPConnection",
+                (_CachedConnection, HTTPConnection),
+                {"dns_cache": self},
+            ),
+            "https": type(
+                "CachedHTTPSConnection",
+                (_CachedConnection, HTTPSConnection),
+                {"dns_cache": self},
+            ),
+        }
+        self.pool_classes = {
+            "http": type(
+                "CachedHTTPConnectionPool",
+                (HTTPConnectionPool,),
+                {"ConnectionCls": self.connection_classes["http"]},
+            ),
+            "https": type(
+                "CachedHTTPSConnectionPool",
+                (HTTPSConnectionPool,),
+                {"ConnectionCls": self.connection_classes["https"]},
+            ),
+        }
+
+    def __repr__(self) -> str:
+        return f"<DNSCache:{len(self._entries)} hosts>"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, host: str, port: int) -> List[str]:
+        """
+        Resolve the host with system resolver (respect hosts file)
+
+        Returned as list of addresses
+        """
+        addresses = []
+        for *_, sockaddr in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+            if sockaddr[0] not in addresses:
+                addresses.append(sockaddr[0])
+        return addresses
+
+    def resolve_all(self, host: str, port: int = 443) -> List[str]:
+        """
+        Resolve the host into addresses, from overrides,
+        cached addresses or lookup if it's expired
+
+        :param host: host of HTTP target
+        :param port: port of HTTP target
+
+        Returned as list of addresses in the order they should be
+        tried, raise `socket.gaierror` if the host can't be resolved
+        """
+        key = host.lower().rstrip(".")
+        if key in self.overrides:
+            return [self.overrides[key]]
+        try:
+            ipaddress.ip_address(key.strip("[]"))
+            return [host]
+        except ValueError:
+            pass
+
+        entry = self._entries.get(key)
+        if entry is not None and self.clock() < entry[1]:
+            with self._lock:
+                self.hits += 1
+                self.saved_time += entry[2]
+            return list(entry[0])
+
+        start = time.perf_counter()
+        addresses = self.lookup(host, port)
+        ttl = self.ttl
+        if self.respect_record_ttl:
+            # extra query that blocks the connection as well,
+            # so it's counted as lookup time (and the saved time)
+            ttl = min(ttl, record_ttl(host, self.record_lifetime) or ttl)
+        duration = time.perf_counter() - start
+
+        with self._lock:
+            self.misses += 1
+            self.lookup_time += duration
+            self._entries[key] = (addresses, self.clock() + ttl, duration)
+            self._failures.pop(key, None)
+        return list(addresses)
+
+    def resolve(self, host: str, port: int = 443) -> str:
+        """
+        Resolve the host into address that should be tried
+        first, see `resolve_all`
+
+        :param host: host of HTTP target
+        :param port: port of HTTP target
+        """
+        return self.resolve_all(host, port)[0]
+
+    def report_failure(self, host: str, address: str) -> None:
+        """
+        Report address of host that failed to connect, it's moved
+        to the end of cached addresses so the next connection try
+        the other one first. Once all addresses failed, the host
+        is removed from the cache and resolved again
+
+        :param host: host of HTTP target
+        :param address: address that failed to connect
+        """
+        key = host.lower().rstrip(".")
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or address not in entry[0]:
+                return
+            failures = self._failures.setdefault(key, set())
+            failures.add(address)
+            if failures.issuperset(entry[0]):
+                del self._entries[key]
+                del self._failures[key]
+                return
+            addresses = [item for item in entry[0] if item != address] + [address]
+            self._entries[key] = (addresses, entry[1], entry[2])
+
+    def invalidate(self, host: Optional[str] = None) -> None:
+        """Remove cached addresses of host, or all of them if host wasn't given"""
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+                self._failures.clear()
+            else:
+                self._entries.pop(host.lower().rstrip("."), None)
+                self._failures.pop(host.lower().rstrip("."), None)
+
+    def stats(self) -> dict:
+        """
+        Returned metrics of the cache, consist of hits, misses,
+        total seconds spent on lookup and estimated seconds saved
+        (duration of the original lookup for every cache hit)
+        """
+        with self._lock:
+            return {
+                "hosts": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "lookup_time": self.lookup_time,
+                "saved_time": self.saved_time,
+            }
+
+    def install(self, adapter: HTTPAdapter) -> HTTPAdapter:
+        """
+        Install the cache into adapter of `requests`, the other
+        settings of adapter (ex: retry) are kept as it is
+
+        :param adapter: adapter that mounted in the session
+
+        Returned as the same adapter
+        """
+        adapter.poolmanager.pool_classes_by_scheme = self.pool_classes
+        return adapter
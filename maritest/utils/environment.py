@@ -0,0 +1,121 @@
+import threading
+import urllib.parse
+
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from requests.utils import get_netrc_auth
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+class EnvironmentCache:
+    """
+    Process-wide cache of environment settings per host. Resolving
+    the settings walks environment proxies, ``no_proxy`` rules, CA
+    bundle variables and read ``~/.netrc`` file from disk, which
+    rarely changed during the test run. So it's resolved once
+    per host and session settings, then reused for every request.
+    Call `invalidate` whenever the environment was changed
+
+    :param enabled: store the resolved settings, by default set
+        to True. If False, the settings is resolved every time
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._settings: Dict[tuple, Tuple[Any, dict]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<EnvironmentCache:{len(self)} hosts>"
+
+    def __len__(self) -> int:
+        return len(self._settings)
+
+    @staticmethod
+    def host(url: str) -> str:
+        """Returned scheme and host of url as cache key, in lowercase"""
+        parsed = urllib.parse.urlsplit(url)
+        return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+    def resolve(
+        self,
+        session: requests.Session,
+        url: str,
+        proxies: Optional[dict] = None,
+        stream: Optional[bool] = None,
+        verify: Optional[Any] = None,
+        cert: Optional[Any] = None,
+    ) -> Tuple[Any, dict]:
+        """
+        Resolve the environment settings for the url, same
+        as ``session.merge_environment_settings`` with netrc auth
+
+        :param session: session that the settings is merged with
+        :param url: url of HTTP target
+        :param proxies: proxies of the request
+        :param stream: stream option of the request
+        :param verify: SSL verification option of the request
+        :param cert: client certificate of the request
+
+        Returned as pair of netrc auth (None if there's no
+        netrc entry or session didn't trust environment) and
+        keyword arguments for sending the request
+        """
+        key = (
+            self.host(url),
+            _freeze(proxies or {}),
+            stream,
+            _freeze(verify),
+            _freeze(cert),
+            _freeze(dict(session.proxies)),
+            _freeze(session.verify),
+            _freeze(session.cert),
+            session.stream,
+            session.trust_env,
+        )
+        settings = self._settings.get(key) if self.enabled else None
+        if settings is None:
+            self.misses += 1
+            auth = get_netrc_auth(url) if session.trust_env else None
+            merged = session.merge_environment_settings(
+                url=url, proxies=proxies or {}, stream=stream, verify=verify, cert=cert
+            )
+            settings = (auth, merged)
+            if self.enabled:
+                with self._lock:
+                    self._settings[key] = settings
+        else:
+            self.hits += 1
+
+        auth, merged = settings
+        # the caller may modify it, keep the cached one untouched
+        return auth, dict(merged, proxies=dict(merged["proxies"]))
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """
+        Remove the cached settings of url's host,
+        or all of them if url wasn't given
+        """
+        with self._lock:
+            if url is None:
+                self._settings.clear()
+            else:
+                host = self.host(url)
+                for key in [key for key in self._settings if key[0] == host]:
+                    del self._settings[key]
+
+
+# shared cache that used by `Http`
+# and `RequestTemplate` by default
+environment_settings = EnvironmentCache()
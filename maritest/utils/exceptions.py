@@ -58,3 +58,45 @@ class MatcherResponse(Exception):
             )
         else:
             return f"\n Actual response from body was   => {self.actual}, \n And the message is       => {self.message}"
+
+
+class CircuitOpenError(Exception):
+    """
+    Custom exception class that will be
+    raise if the circuit breaker of related
+    endpoint is open and request wasn't sent
+    """
+
+    def __init__(self, endpoint: str, retry_after: float, message: str = None):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        self.message = message or "Circuit is open, request was not sent"
+
+    def __repr__(self) -> str:
+        return repr(self.message)
+
+    def __str__(self) -> str:
+        return (
+            f"\n Endpoint was          => {self.endpoint} \n Retry after was       => {self.retry_after:.2f} seconds \n "
+            f"And the message is    => {self.message} "
+        )
+
+
+class ExpectationError(AssertionError):
+    """
+    Custom exception class that will be
+    raise if one or more of chained expectation
+    failed, all failures are reported together
+    """
+
+    def __init__(self, failures: list, message: str = None):
+        self.failures = failures
+        self.message = message or f"{len(failures)} expectation(s) failed"
+        super().__init__(self.message)
+
+    def __repr__(self) -> str:
+        return repr(self.message)
+
+    def __str__(self) -> str:
+        formatted = "\n".join(f"   - {failure}" for failure in self.failures)
+        return f"\n And the message is    => {self.message} \n{formatted}"
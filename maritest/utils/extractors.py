@@ -0,0 +1,64 @@
+from typing import Any
+
+from .json_path import compile_path, format_path, resolve
+
+# supported source of extracted value
+SOURCES = ("json", "header", "cookie", "status")
+
+
+class Extractor:
+    """
+    Extract value from HTTP response to be used as variable
+    in the next request. The expression consist of source and
+    the selector, separated by colon such as :
+
+    - ``json:$.data[0].id`` -> value of JSON path in response body
+    - ``header:X-Request-Id`` -> value of response header
+    - ``cookie:session`` -> value of response cookie
+    - ``status`` -> status code of response
+
+    :param expression: extractor expression, string type
+    """
+
+    def __init__(self, expression: str) -> None:
+        if not isinstance(expression, str):
+            raise TypeError("extractor expression must be string object")
+
+        source, _, selector = expression.partition(":")
+        source = source.strip().lower()
+        if source not in SOURCES:
+            raise ValueError(f"There's no extractor source for {expression}")
+        if source != "status" and not selector:
+            raise ValueError(f"Extractor {expression} need a selector")
+
+        self.expression = expression
+        self.source = source
+        self.selector = selector.strip()
+        self.path = compile_path(self.selector) if source == "json" else None
+
+    def __repr__(self) -> str:
+        if self.source == "json":
+            return f"<Extractor:json=>{format_path(self.path)}>"
+        return f"<Extractor:{self.source}=>{self.selector}>"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, self.__class__) and self.expression == other.expression
+
+    def extract(self, http) -> Any:
+        """
+        Extract the value from `Http` instance, raise
+        LookupError if the value wasn't found
+
+        :param http: `Http` instance that already have response
+        """
+        if self.source == "json":
+            return resolve(http.get_json, self.path)
+        if self.source == "header":
+            value = http.get_headers.get(self.selector)
+        elif self.source == "cookie":
+            value = http.get_cookies.get(self.selector)
+        else:
+            return http.get_status_code
+        if value is None:
+            raise LookupError(f"{self.source} {self.selector} not found")
+        return value
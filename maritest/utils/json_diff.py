@@ -0,0 +1,317 @@
+import reprlib
+
+from collections import Counter
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .json_path import compile_path, format_path
+
+# segment that match any key or index
+WILDCARD = "*"
+
+# short representation of value in the report
+_repr = reprlib.Repr()
+_repr.maxstring = 60
+_repr.maxother = 60
+_repr.maxlist = _repr.maxdict = 4
+_repr.maxlevel = 2
+
+
+class DiffKind(str, Enum):
+    """Enum class that represent for kind of JSON difference"""
+
+    CHANGED = "changed"
+    TYPE = "type"
+    MISSING = "missing"
+    UNEXPECTED = "unexpected"
+
+
+class Difference:
+    """
+    One difference between actual and expected JSON object
+
+    :param path: JSON path of the difference (ex: ``$.data[0].id``)
+    :param kind: kind of difference, see `DiffKind`
+    :param actual: actual value, None if missing
+    :param expected: expected value, None if unexpected
+    """
+
+    __slots__ = ("path", "kind", "actual", "expected")
+
+    def __init__(
+        self, path: str, kind: DiffKind, actual: Any = None, expected: Any = None
+    ):
+        self.path = path
+        self.kind = kind
+        self.actual = actual
+        self.expected = expected
+
+    def __repr__(self) -> str:
+        return f"<Difference:{self}>"
+
+    def __str__(self) -> str:
+        if self.kind == DiffKind.MISSING:
+            return f"{self.path} is missing, expected {_repr.repr(self.expected)}"
+        if self.kind == DiffKind.UNEXPECTED:
+            return f"{self.path} is unexpected, was {_repr.repr(self.actual)}"
+        if self.kind == DiffKind.TYPE:
+            return (
+                f"{self.path} expected {type_name(self.expected)}, "
+                f"was {type_name(self.actual)}"
+            )
+        return f"{self.path} expected {_repr.repr(self.expected)}, was {_repr.repr(self.actual)}"
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Difference)
+            and (
+                self.path,
+                self.kind,
+                self.actual,
+                self.expected,
+            )
+            == (other.path, other.kind, other.actual, other.expected)
+        )
+
+
+def type_name(value: Any) -> str:
+    """Returned JSON type name of decoded value"""
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, (list, tuple)):
+        return "array"
+    if isinstance(value, str):
+        return "string"
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    return "number"
+
+
+class _PathTrie:
+    """
+    Private trie of compiled JSON paths, the walker keeps the
+    nodes that match the current path so checking whether a path
+    was listed is done per segment instead of per listed path
+    """
+
+    def __init__(self, paths: Iterable[str]) -> None:
+        self.root: Dict[Any, Any] = {}
+        for path in paths:
+            node = self.root
+            for segment in compile_path(path.replace("[*]", ".*")):
+                node = node.setdefault(segment, {})
+            node[None] = True
+
+    def __bool__(self) -> bool:
+        return bool(self.root)
+
+    @staticmethod
+    def step(nodes: Tuple[dict, ...], segment: Union[str, int]) -> Tuple[dict, ...]:
+        """Returned the nodes that match the path after the segment"""
+        matched = []
+        for node in nodes:
+            if segment in node:
+                matched.append(node[segment])
+            if WILDCARD in node:
+                matched.append(node[WILDCARD])
+        return tuple(matched)
+
+    @staticmethod
+    def matched(nodes: Tuple[dict, ...]) -> bool:
+        """Returned whether one of the nodes is the end of listed path"""
+        return any(None in node for node in nodes)
+
+
+def _fingerprint(
+    value: Any,
+    ignore_nodes: Tuple[dict, ...] = (),
+    unordered_nodes: Tuple[dict, ...] = (),
+    unordered_all: bool = False,
+) -> Any:
+    """
+    Returned hashable representation of decoded JSON value for
+    unordered comparison, equal values have the same fingerprint.
+    Ignored paths are left out, and unordered arrays are
+    represented regardless the order of their items
+    """
+    if isinstance(value, (dict, list, tuple)):
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        children = []
+        for segment, item in items:
+            child_ignore = _PathTrie.step(ignore_nodes, segment) if ignore_nodes else ()
+            if child_ignore and _PathTrie.matched(child_ignore):
+                continue
+            child_unordered = (
+                _PathTrie.step(unordered_nodes, segment) if unordered_nodes else ()
+            )
+            fingerprint = _fingerprint(
+                item, child_ignore, child_unordered, unordered_all
+            )
+            children.append(
+                (segment, fingerprint) if isinstance(value, dict) else fingerprint
+            )
+        if isinstance(value, dict):
+            return ("object", frozenset(children))
+        if unordered_all or _PathTrie.matched(unordered_nodes):
+            return ("array", frozenset(Counter(children).items()))
+        return ("array", tuple(children))
+    return (type_name(value), value)
+
+
+def _path(node: Optional[tuple]) -> str:
+    # materialize linked path of (parent, segment) only when reported
+    segments = []
+    while node is not None:
+        node, segment = node
+        segments.append(segment)
+    return format_path(tuple(reversed(segments)))
+
+
+def json_diff(
+    actual: Any,
+    expected: Any,
+    ignore_paths: Optional[Iterable[str]] = None,
+    unordered: Union[bool, Iterable[str]] = False,
+    max_diffs: Optional[int] = 10,
+) -> List[Difference]:
+    """
+    Compare decoded JSON objects structurally and report the
+    paths that differ. Identical subtrees are skipped by identity
+    check, and the whole document is compared once with ``==``
+    before walking it, so the equal document cost one comparison.
+    Otherwise every value is visited at most once (linear in the
+    document size) and the walk stops after ``max_diffs``
+
+    :param actual: actual object (ex: decoded response body)
+    :param expected: expected object
+    :param ignore_paths: JSON paths that not compared, ``*`` match any
+        key or index (ex: ``$.data[*].updated_at``)
+    :param unordered: True to compare all arrays regardless the order
+        of items, or JSON paths of arrays that compared without order
+    :param max_diffs: maximum numbers of reported difference, None
+        to report all of them. By default set to 10
+
+    Returned as list of `Difference`, empty if both objects are equal
+    """
+    try:
+        if actual is expected or actual == expected:
+            return []
+    except RecursionError:
+        # too deep for builtin comparison, walk it instead
+        pass
+
+    ignored = _PathTrie(ignore_paths or ())
+    unordered_all = unordered is True
+    unordered_paths = _PathTrie(() if isinstance(unordered, bool) else unordered)
+
+    differences: List[Difference] = []
+    # kind (None to compare, otherwise reported as it is), actual,
+    # expected, linked path, matched nodes of ignored and unordered paths
+    stack = [(None, actual, expected, None, (ignored.root,), (unordered_paths.root,))]
+    while stack and (max_diffs is None or len(differences) < max_diffs):
+        kind, actual, expected, path, ignore_nodes, unordered_nodes = stack.pop()
+        if kind is not None:
+            differences.append(Difference(_path(path), kind, actual, expected))
+            continue
+        if actual is expected:
+            continue
+
+        # (kind, segment, actual item, expected item) in document order
+        children: List[Tuple[Optional[DiffKind], Any, Any, Any]] = []
+        if isinstance(expected, dict) and isinstance(actual, dict):
+            for key, expected_item in expected.items():
+                if key in actual:
+                    children.append((None, key, actual[key], expected_item))
+                else:
+                    children.append((DiffKind.MISSING, key, None, expected_item))
+            for key, actual_item in actual.items():
+                if key not in expected:
+                    children.append((DiffKind.UNEXPECTED, key, actual_item, None))
+        elif isinstance(expected, list) and isinstance(actual, list):
+            if unordered_all or _PathTrie.matched(unordered_nodes):
+                children = _unordered_items(
+                    actual, expected, ignore_nodes, unordered_nodes, unordered_all
+                )
+            else:
+                for index, (actual_item, expected_item) in enumerate(
+                    zip(actual, expected)
+                ):
+                    children.append((None, index, actual_item, expected_item))
+                for index in range(len(actual), len(expected)):
+                    children.append((DiffKind.MISSING, index, None, expected[index]))
+                for index in range(len(expected), len(actual)):
+                    children.append((DiffKind.UNEXPECTED, index, actual[index], None))
+        elif type_name(actual) != type_name(expected):
+            differences.append(Difference(_path(path), DiffKind.TYPE, actual, expected))
+            continue
+        elif actual != expected:
+            differences.append(
+                Difference(_path(path), DiffKind.CHANGED, actual, expected)
+            )
+            continue
+
+        # reversed so the differences are reported in document order
+        for kind, segment, actual_item, expected_item in reversed(children):
+            child_ignore = _PathTrie.step(ignore_nodes, segment) if ignore_nodes else ()
+            if child_ignore and _PathTrie.matched(child_ignore):
+                continue
+            child_unordered = (
+                _PathTrie.step(unordered_nodes, segment) if unordered_nodes else ()
+            )
+            stack.append(
+                (
+                    kind,
+                    actual_item,
+                    expected_item,
+                    (path, segment),
+                    child_ignore,
+                    child_unordered,
+                )
+            )
+    return differences
+
+
+def _unordered_items(
+    actual: list,
+    expected: list,
+    ignore_nodes: Tuple[dict, ...] = (),
+    unordered_nodes: Tuple[dict, ...] = (),
+    unordered_all: bool = False,
+) -> List[tuple]:
+    """
+    Match items of arrays regardless the order by fingerprint,
+    returned the unmatched items as missing or unexpected child.
+    Ignored paths inside the items are left out of the fingerprint,
+    so the items that only differ in them are matched
+    """
+
+    def fingerprints(items: list) -> List[Tuple[int, Any, Any]]:
+        result = []
+        for index, item in enumerate(items):
+            child_ignore = _PathTrie.step(ignore_nodes, index) if ignore_nodes else ()
+            if child_ignore and _PathTrie.matched(child_ignore):
+                continue
+            child_unordered = (
+                _PathTrie.step(unordered_nodes, index) if unordered_nodes else ()
+            )
+            fingerprint = _fingerprint(
+                item, child_ignore, child_unordered, unordered_all
+            )
+            result.append((index, item, fingerprint))
+        return result
+
+    actual_items = fingerprints(actual)
+    remaining = Counter(fingerprint for _, _, fingerprint in actual_items)
+    children = []
+    for index, item, fingerprint in fingerprints(expected):
+        if remaining[fingerprint]:
+            remaining[fingerprint] -= 1
+        else:
+            children.append((DiffKind.MISSING, index, None, item))
+    for index, item, fingerprint in actual_items:
+        if remaining[fingerprint]:
+            remaining[fingerprint] -= 1
+            children.append((DiffKind.UNEXPECTED, index, item, None))
+    return children
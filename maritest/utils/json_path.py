@@ -0,0 +1,85 @@
+import re
+
+from functools import lru_cache
+from typing import Any, Tuple, Union
+
+# token of single path segment, either
+# dotted key, bracket index or quoted key
+_TOKEN = re.compile(
+    r"""\.(?P<key>[^.\[\]]+)|\[(?P<index>-?\d+)\]|\[(?P<quote>['"])(?P<quoted>.*?)(?P=quote)\]"""
+)
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> Tuple[Union[str, int], ...]:
+    """
+    Compile simple JSON path expression into tuple of keys
+    and indexes, the result is cached so the same expression
+    only parsed once. Supported syntax such as :
+
+    - ``$.data[0].id`` or ``data[0].id``
+    - ``$['key with space'].value``
+
+    :param path: JSON path expression, string type
+
+    Returned as tuple of segments
+    """
+    if not isinstance(path, str):
+        raise TypeError("JSON path must be string object")
+
+    expression = path.strip()
+    if expression.startswith("$"):
+        expression = expression[1:]
+    if expression and not expression.startswith((".", "[")):
+        expression = f".{expression}"
+
+    segments = []
+    position = 0
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if match is None:
+            raise ValueError(f"Invalid JSON path expression => {path}")
+        if match.group("key") is not None:
+            segments.append(match.group("key"))
+        elif match.group("index") is not None:
+            segments.append(int(match.group("index")))
+        else:
+            segments.append(match.group("quoted"))
+        position = match.end()
+    return tuple(segments)
+
+
+def resolve(obj: Any, path: Union[str, Tuple[Union[str, int], ...]]) -> Any:
+    """
+    Resolve value of decoded JSON object based on path
+
+    :param obj: decoded JSON object (dict or list)
+    :param path: JSON path expression or compiled path
+
+    Returned as the value, raise LookupError if not found
+    """
+    segments = compile_path(path) if isinstance(path, str) else path
+    current = obj
+    for segment in segments:
+        if isinstance(current, dict):
+            if segment not in current:
+                raise KeyError(segment)
+            current = current[segment]
+        elif isinstance(current, list) and isinstance(segment, int):
+            current = current[segment]
+        else:
+            raise LookupError(segment)
+    return current
+
+
+def format_path(segments: Tuple[Union[str, int], ...]) -> str:
+    """Returned compiled path as JSON path expression"""
+    formatted = "$"
+    for segment in segments:
+        if isinstance(segment, int):
+            formatted += f"[{segment}]"
+        elif re.fullmatch(r"[A-Za-z_][A-Za-z0-9_-]*", segment):
+            formatted += f".{segment}"
+        else:
+            formatted += f"[{segment!r}]"
+    return formatted
@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+
+import requests
+from lxml import etree
+
+from .digest import CHUNK_SIZE, iter_body
+
+
+class _LinkCollector:
+    """
+    Private target of lxml parser that only collect ``href`` of anchor,
+    the parser call it for every tag instead of building the tree
+    """
+
+    def __init__(self) -> None:
+        self.links: List[str] = []
+
+    def start(self, tag: str, attrib) -> None:
+        if tag == "a":
+            href = attrib.get("href")
+            if href is not None:
+                self.links.append(href)
+
+    def close(self) -> List[str]:
+        return self.links
+
+
+def extract_links(chunks: Iterable[bytes]) -> List[str]:
+    """
+    Extract ``href`` link of anchors from HTML document, the
+    document is parsed incrementally chunk by chunk without
+    building the tree, so the memory doesn't grow with the
+    size of document
+
+    :param chunks: HTML document as iterable of bytes
+
+    Returned as list of links in the order they were found
+    """
+    parser = etree.HTMLParser(target=_LinkCollector())
+    for chunk in chunks:
+        if chunk:
+            parser.feed(bytes(chunk))
+    return parser.close()
+
+
+def response_links(response, chunk_size: int = CHUNK_SIZE) -> List[str]:
+    """
+    Extract ``href`` link of anchors from response body. If the
+    response was requested with ``stream=True``, the body is parsed
+    while it's read from the network, note the body can't be read
+    again after that
+
+    :param response: response of `requests`
+    :param chunk_size: size of chunk in bytes
+    """
+    # private attribute of `requests`, False until the body was read
+    if response._content is not False:
+        return extract_links([response.content or b""])
+    return extract_links(iter_body(response, chunk_size))
+
+
+def unexpected_links(
+    links: Iterable[str], expected_values: Union[str, Iterable[str]]
+) -> List[str]:
+    """
+    Returned absolute (http and https) links that not in expected
+    values. If expected values is a string, the link must be a part
+    of it, otherwise the link is looked up in the set of expected values
+
+    :param links: links that found in the document
+    :param expected_values: string or collection of expected links
+    """
+    if isinstance(expected_values, str):
+        contains = expected_values.__contains__
+    else:
+        contains = frozenset(expected_values).__contains__
+    return [
+        link
+        for link in links
+        if link.startswith(("https", "http")) and not contains(link)
+    ]
+
+
+def check_links(
+    links: Iterable[str],
+    max_workers: int = 8,
+    timeout: Optional[float] = 10,
+    session: Optional[requests.Session] = None,
+) -> Dict[str, Union[int, Exception]]:
+    """
+    Send HEAD request to every absolute (http and https) link
+    concurrently, every link is only requested once even if it
+    was found more than once. Redirects are followed
+
+    :param links: links that will be checked
+    :param max_workers: maximum numbers of concurrent requests, by default set to 8
+    :param timeout: timeout of each request in seconds, by default set to 10
+    :param session: session that used to send the requests, by
+        default new session is created and closed after that
+
+    Returned as dict of link and its status code, or
+    the exception if the request couldn't be sent
+    """
+    unique = list(
+        dict.fromkeys(link for link in links if link.startswith(("https", "http")))
+    )
+    if not unique:
+        return {}
+
+    owned = session is None
+    if session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    def head(link: str) -> Union[int, Exception]:
+        try:
+            return session.head(link, timeout=timeout, allow_redirects=True).status_code
+        except requests.RequestException as error:
+            return error
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as executor:
+            return dict(zip(unique, executor.map(head, unique)))
+    finally:
+        if owned:
+            session.close()
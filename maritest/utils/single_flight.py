@@ -0,0 +1,152 @@
+import threading
+
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import requests
+
+from requests.structures import CaseInsensitiveDict
+
+
+class SharedResponse:
+    """
+    Response view that shared between coalesced request. The body
+    is already loaded by the leader request, so every waiter can
+    read it concurrently, while the JSON body only decoded once.
+    Decoded JSON is shared object, treat it as read-only. Waiters
+    receive their own copy of response object (see `copy`), so closing
+    it doesn't affect the leader or the other waiters
+
+    :param response: HTTP response object from the leader request
+    """
+
+    def __init__(self, response: requests.Response) -> None:
+        self.response = response
+        self._lock = threading.Lock()
+        self._json: Any = None
+        self._decoded = False
+
+    def json(self) -> Any:
+        """Returned decoded JSON body, only decoded at first call"""
+        if not self._decoded:
+            with self._lock:
+                if not self._decoded:
+                    self._json = self.response.json()
+                    self._decoded = True
+        return self._json
+
+    def copy(self) -> requests.Response:
+        """
+        Returned new response object for the waiter, the body bytes
+        are shared while the headers and cookies are copied
+        """
+        response = requests.Response.__new__(requests.Response)
+        response.__dict__.update(self.response.__dict__)
+        response.headers = CaseInsensitiveDict(self.response.headers)
+        response.cookies = self.response.cookies.copy()
+        response.history = list(self.response.history)
+        return response
+
+
+class _Call:
+    """Private class that represent one in-flight call"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Any = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Helper to coalesced identical in-flight call, only the first
+    caller (leader) of a key will run the function, and all
+    callers that come while leader is running will wait
+    and receive the same result (or the same exception)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run function for related key once for concurrent callers
+
+        :param key: hashable object that identify the call
+        :param func: callable without argument that will be run
+
+        Returned as tuple of result and flag whether it was shared
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, call.waiters > 0
+
+
+def _freeze(value: Any) -> Hashable:
+    # hashable form of send option, such as proxies dict or timeout tuple
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def request_key(request: requests.PreparedRequest, **options) -> Tuple:
+    """
+    Returned coalescing key of prepared request, consist of
+    method, full url (with query string), request headers and
+    the send options (ex: allow_redirects, timeout, verify, proxies
+    and stream), so requests with different options aren't shared
+
+    :param request: prepared request
+    :param options: keyword arguments that used to send the request
+    """
+    headers = tuple(
+        sorted((key.lower(), str(value)) for key, value in request.headers.items())
+    )
+    return request.method, request.url, headers, _freeze(options)
+
+
+def load_shared_response(response: requests.Response) -> SharedResponse:
+    """
+    Read the whole response body before fan-out into waiters,
+    so no one read the underlying stream concurrently
+    """
+    _ = response.content
+    return SharedResponse(response)
+
+
+# default group for coalesced GET request
+# that shared for all Http instances
+in_flight = SingleFlight()
@@ -0,0 +1,252 @@
+import copy
+import re
+
+from typing import Any, Dict, FrozenSet, List, Union
+
+# placeholder of variable, such as ${user_id}
+_PLACEHOLDER = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+class _Constant:
+    """Private node for value without any placeholder"""
+
+    variables: FrozenSet[str] = frozenset()
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def render(self, variables: Dict[str, Any]) -> Any:
+        # container is copied, so the caller can't change the template
+        if isinstance(self.value, (dict, list)):
+            return copy.deepcopy(self.value)
+        return self.value
+
+    def partial(self, variables: Dict[str, Any]):
+        return self
+
+
+class _Variable:
+    """Private node for string that only one placeholder, keep the value type"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.variables = frozenset([name])
+
+    def render(self, variables: Dict[str, Any]) -> Any:
+        try:
+            return variables[self.name]
+        except KeyError:
+            raise KeyError(f"Variable `{self.name}` wasn't defined")
+
+    def partial(self, variables: Dict[str, Any]):
+        if self.name in variables:
+            return _Constant(variables[self.name])
+        return self
+
+
+class _String:
+    """Private node for string that mixed with literal and placeholder"""
+
+    def __init__(self, segments: List[Union[str, _Variable]]) -> None:
+        self.segments = segments
+        self.variables = frozenset(
+            segment.name for segment in segments if isinstance(segment, _Variable)
+        )
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        return "".join(
+            segment if isinstance(segment, str) else str(segment.render(variables))
+            for segment in self.segments
+        )
+
+    def partial(self, variables: Dict[str, Any]):
+        segments: List[Union[str, _Variable]] = []
+        for segment in self.segments:
+            if isinstance(segment, _Variable) and segment.name in variables:
+                segment = str(variables[segment.name])
+            if isinstance(segment, str) and segments and isinstance(segments[-1], str):
+                segments[-1] += segment
+            else:
+                segments.append(segment)
+        return _compile_segments(segments)
+
+
+class _Dict:
+    """Private node for dict that one of the value has placeholder"""
+
+    def __init__(self, items: Dict[Any, Any]) -> None:
+        self.items = items
+        self.variables = frozenset().union(*(node.variables for node in items.values()))
+
+    def render(self, variables: Dict[str, Any]) -> dict:
+        return {key: node.render(variables) for key, node in self.items.items()}
+
+    def partial(self, variables: Dict[str, Any]):
+        return _compile_container(
+            {key: node.partial(variables) for key, node in self.items.items()}
+        )
+
+
+class _List:
+    """Private node for list that one of the item has placeholder"""
+
+    def __init__(self, items: List[Any]) -> None:
+        self.items = items
+        self.variables = frozenset().union(*(node.variables for node in items))
+
+    def render(self, variables: Dict[str, Any]) -> list:
+        return [node.render(variables) for node in self.items]
+
+    def partial(self, variables: Dict[str, Any]):
+        return _compile_container([node.partial(variables) for node in self.items])
+
+
+def _dump(node) -> Any:
+    # JSON representation of compiled node, see `Template.dump`
+    if isinstance(node, _Constant):
+        return {"value": node.value}
+    if isinstance(node, _Variable):
+        return {"variable": node.name}
+    if isinstance(node, _String):
+        return {
+            "string": [
+                segment if isinstance(segment, str) else segment.name
+                for segment in node.segments
+            ],
+            "placeholders": [
+                index
+                for index, segment in enumerate(node.segments)
+                if isinstance(segment, _Variable)
+            ],
+        }
+    if isinstance(node, _Dict):
+        return {"dict": [[key, _dump(item)] for key, item in node.items.items()]}
+    return {"list": [_dump(item) for item in node.items]}
+
+
+def _load(data: Dict[str, Any]):
+    if "value" in data:
+        return _Constant(data["value"])
+    if "variable" in data:
+        return _Variable(data["variable"])
+    if "string" in data:
+        placeholders = set(data["placeholders"])
+        return _String(
+            [
+                _Variable(segment) if index in placeholders else segment
+                for index, segment in enumerate(data["string"])
+            ]
+        )
+    if "dict" in data:
+        return _Dict({key: _load(item) for key, item in data["dict"]})
+    return _List([_load(item) for item in data["list"]])
+
+
+def _compile_segments(segments: List[Union[str, _Variable]]):
+    if not segments:
+        return _Constant("")
+    if len(segments) == 1:
+        segment = segments[0]
+        return _Constant(segment) if isinstance(segment, str) else segment
+    return _String(segments)
+
+
+def _compile_container(nodes: Union[dict, list]):
+    # container without any placeholder is
+    # folded into constant to skip rendering
+    values = nodes.values() if isinstance(nodes, dict) else nodes
+    if all(isinstance(node, _Constant) for node in values):
+        if isinstance(nodes, dict):
+            return _Constant({key: node.value for key, node in nodes.items()})
+        return _Constant([node.value for node in nodes])
+    return _Dict(nodes) if isinstance(nodes, dict) else _List(nodes)
+
+
+def _compile(value: Any):
+    if isinstance(value, str):
+        segments: List[Union[str, _Variable]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(value):
+            if match.start() > position:
+                segments.append(value[position : match.start()])
+            segments.append(_Variable(match.group(1)))
+            position = match.end()
+        if position < len(value):
+            segments.append(value[position:])
+        return _compile_segments(segments)
+    if isinstance(value, dict):
+        return _compile_container({key: _compile(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return _compile_container([_compile(item) for item in value])
+    return _Constant(value)
+
+
+class Template:
+    """
+    Precompiled template of string or nested object (dict
+    and list) with ``${name}`` placeholder. The source is
+    parsed once, and rendering only join the literal parts with
+    the variables. String that only has one placeholder will keep
+    the type of variable value (ex: integer stay integer)
+
+    :param source: string, dict, list or any object as template
+    """
+
+    def __init__(self, source: Any) -> None:
+        self.source = source
+        self.root = _compile(source)
+
+    def __repr__(self) -> str:
+        return f"<Template:{sorted(self.variables)}>"
+
+    @property
+    def variables(self) -> FrozenSet[str]:
+        """Property method to return name of variables in the template"""
+        return self.root.variables
+
+    @property
+    def is_static(self) -> bool:
+        """Property method to return whether template has no placeholder"""
+        return not self.root.variables
+
+    def render(self, variables: Dict[str, Any] = None) -> Any:
+        """
+        Render template with variables, raise KeyError
+        if one of the variables wasn't defined. The result
+        is a new object, it's safe to be modified by the caller
+
+        :param variables: mapping of variable name and value
+        """
+        return self.root.render(variables or {})
+
+    def partial(self, variables: Dict[str, Any]) -> "Template":
+        """
+        Returned new template that known variables already
+        substituted, the unknown one still as placeholder
+
+        :param variables: mapping of variable name and value
+        """
+        template = Template.__new__(Template)
+        template.source = self.source
+        template.root = self.root.partial(variables)
+        return template
+
+    def dump(self) -> Any:
+        """
+        Returned JSON serializable representation of compiled
+        template, the substituted values are kept as they are
+        (not parsed again), so it can be restored with `load`
+        """
+        return {"source": self.source, "root": _dump(self.root)}
+
+    @classmethod
+    def load(cls, data: Dict[str, Any]) -> "Template":
+        """
+        Restore compiled template from `dump` without parsing it
+
+        :param data: returned value of `dump`
+        """
+        template = cls.__new__(cls)
+        template.source = data["source"]
+        template.root = _load(data["root"])
+        return template
@@ -0,0 +1,193 @@
+import os
+import ssl
+import threading
+
+from typing import Any, Dict, Optional, Tuple, Union
+
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from urllib3.util.ssl_ import create_urllib3_context
+
+
+class _ResumableSSLSocket(ssl.SSLSocket):
+    """
+    Private SSL socket that give its TLS session back to
+    the context, so the next connection to the same host
+    could resume it instead of doing full handshake
+    """
+
+    def do_handshake(self, block: bool = False) -> None:
+        super().do_handshake(block)
+        self.context.handshake_completed(self)
+
+    def close(self) -> None:
+        # TLS 1.3 session ticket is sent after the handshake,
+        # so the session is saved once more before closing
+        self.context.save_session(self)
+        super().close()
+
+
+class ResumableSSLContext(ssl.SSLContext):
+    """
+    Client SSL context that keeps the latest TLS session of
+    every host and pass it when wrapping the next socket to
+    the same host (TLS session resumption)
+    """
+
+    sslsocket_class = _ResumableSSLSocket
+
+    def __init__(self, protocol: int = ssl.PROTOCOL_TLS_CLIENT) -> None:
+        self.sessions: Dict[str, ssl.SSLSession] = {}
+        self.handshakes = 0
+        self.resumed = 0
+        self._lock = threading.Lock()
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None and server_hostname is not None:
+            session = self.sessions.get(server_hostname)
+        return super().wrap_socket(
+            sock, *args, server_hostname=server_hostname, session=session, **kwargs
+        )
+
+    def handshake_completed(self, sock: ssl.SSLSocket) -> None:
+        with self._lock:
+            self.handshakes += 1
+            if sock.session_reused:
+                self.resumed += 1
+        self.save_session(sock)
+
+    def save_session(self, sock: ssl.SSLSocket) -> None:
+        if sock.server_side or not sock.server_hostname:
+            return
+        try:
+            session = sock.session
+        except (ValueError, OSError):
+            return
+        if session is not None and (session.has_ticket or session.id):
+            with self._lock:
+                self.sessions[sock.server_hostname] = session
+
+    def stats(self) -> dict:
+        """Returned numbers of handshakes, resumed sessions and cached hosts"""
+        with self._lock:
+            return {
+                "handshakes": self.handshakes,
+                "resumed": self.resumed,
+                "hosts": len(self.sessions),
+            }
+
+
+class SSLContextCache:
+    """
+    Process-wide cache of preconfigured SSL contexts, keyed by
+    verification settings and client certificate. The CA bundle
+    is only loaded once per key instead of every connection, and
+    the context resume TLS session of the host it already connected
+    """
+
+    def __init__(self) -> None:
+        self._contexts: Dict[Tuple[Any, Any], ResumableSSLContext] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<SSLContextCache:{len(self)} contexts>"
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    @staticmethod
+    def create(
+        verify: Union[bool, str] = True,
+        cert: Optional[Union[str, Tuple[str, str]]] = None,
+    ) -> ResumableSSLContext:
+        """
+        Create SSL context with the same defaults as urllib3
+
+        :param verify: True to verify with default CA bundle, path of
+            CA bundle file or directory, or False to skip the verification
+        :param cert: path of client certificate, or pair of
+            certificate and private key path
+        """
+        defaults = create_urllib3_context()
+        context = ResumableSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.options |= defaults.options
+        context.minimum_version = defaults.minimum_version
+
+        if verify is False:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        else:
+            location = DEFAULT_CA_BUNDLE_PATH if verify is True else verify
+            if not location or not os.path.exists(location):
+                raise OSError(
+                    f"Could not find a suitable TLS CA certificate bundle, "
+                    f"invalid path: {location}"
+                )
+            if os.path.isdir(location):
+                context.load_verify_locations(capath=location)
+            else:
+                context.load_verify_locations(cafile=location)
+
+        if cert:
+            if isinstance(cert, str):
+                context.load_cert_chain(cert)
+            else:
+                context.load_cert_chain(cert[0], cert[1])
+        return context
+
+    def get(
+        self,
+        verify: Union[bool, str] = True,
+        cert: Optional[Union[str, Tuple[str, str]]] = None,
+    ) -> ResumableSSLContext:
+        """Returned cached SSL context of the settings, create it if not exist"""
+        if verify is None:
+            verify = True
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        key = (verify, cert)
+        context = self._contexts.get(key)
+        if context is None:
+            with self._lock:
+                context = self._contexts.get(key)
+                if context is None:
+                    context = self._contexts[key] = self.create(*key)
+        return context
+
+    def clear(self) -> None:
+        """Remove all cached contexts, ex: after CA bundle was changed"""
+        with self._lock:
+            self._contexts.clear()
+
+
+class TLSAdapter(HTTPAdapter):
+    """
+    Adapter of `requests` that use the SSL context
+    from `SSLContextCache` for HTTPS connection
+
+    :param cache: cache of SSL context, by default
+        using the shared `ssl_contexts`
+    :param kwargs: keyword arguments of `HTTPAdapter` (ex: max_retries)
+    """
+
+    def __init__(self, cache: Optional[SSLContextCache] = None, **kwargs) -> None:
+        self.ssl_contexts = ssl_contexts if cache is None else cache
+        super().__init__(**kwargs)
+
+    def cert_verify(self, conn, url: str, verify, cert) -> None:
+        if not url.lower().startswith("https"):
+            return super().cert_verify(conn, url, verify, cert)
+
+        # verification and client certificate are already
+        # configured in the context, so the CA bundle
+        # won't be loaded for every new connection
+        conn.conn_kw["ssl_context"] = self.ssl_contexts.get(verify, cert)
+        conn.cert_reqs = "CERT_REQUIRED" if verify is not False else "CERT_NONE"
+        conn.ca_certs = None
+        conn.ca_cert_dir = None
+        conn.cert_file = None
+        conn.key_file = None
+
+
+# shared cache that used by `TLSAdapter` by default
+ssl_contexts = SSLContextCache()
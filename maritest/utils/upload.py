@@ -0,0 +1,209 @@
+import mimetypes
+import mmap
+import os
+import uuid
+
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .digest import CHUNK_SIZE
+
+
+class FileBody:
+    """
+    Request body that streamed from file, the file is read chunk by
+    chunk while it's sent so the whole file is never held in memory.
+    Since the size is known, ``Content-Length`` header is sent instead
+    of chunked transfer encoding, and the body can be iterated again
+    (ex: when the request is retried)
+
+    :param path: path of file
+    :param chunk_size: size of chunk in bytes, by default set to 64 KiB
+    :param use_mmap: map the file into memory and send slices of it
+        without copying into Python bytes, by default set to False
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        chunk_size: int = CHUNK_SIZE,
+        use_mmap: bool = False,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+
+    def __repr__(self) -> str:
+        return f"<FileBody:{self.path}>"
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.path)
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        with open(self.path, "rb") as f:
+            if self.use_mmap and len(self):
+                yield from self._iter_mmap(f)
+                return
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def _iter_mmap(self, f) -> Iterator[memoryview]:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            for start in range(0, len(view), self.chunk_size):
+                yield view[start : start + self.chunk_size]
+        finally:
+            view.release()
+            try:
+                mapped.close()
+            except BufferError:
+                # the last slice is still referenced by the sender,
+                # the mapping is closed when it's garbage collected
+                pass
+
+
+class IterableBody:
+    """
+    Request body that streamed from iterable of bytes (ex: generator),
+    since the size isn't known the body is sent with chunked transfer
+    encoding. Note the body can only be iterated once, so it's not
+    resent if the request was retried
+
+    :param iterable: iterable of bytes or string (encoded as UTF-8)
+    """
+
+    def __init__(self, iterable: Iterable[Union[bytes, str]]) -> None:
+        self.iterable = iterable
+
+    def __repr__(self) -> str:
+        return "<IterableBody>"
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.iterable:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                yield chunk
+
+
+# value of multipart field, either plain value or tuple of filename,
+# content (path, `FileBody`, bytes or binary file) and content-type
+Field = Union[str, bytes, Tuple[str, Any], Tuple[str, Any, Optional[str]]]
+
+
+class MultipartEncoder:
+    """
+    Streaming encoder of ``multipart/form-data`` body, the parts are
+    generated while the body is sent and the files are read chunk by
+    chunk. The total size is computed upfront from the size of files,
+    so ``Content-Length`` header is sent without reading them. For example :
+
+    >>> body = MultipartEncoder({"name": "dataset", "file": ("data.csv", FileBody("data.csv"))})
+    >>> Http("POST", "https://api.com/upload", headers={}, data=body)
+
+    :param fields: mapping or sequence of field name and value, the
+        value of file is tuple of filename, content and optional
+        content-type. Content of file is path (string or path-like),
+        `FileBody`, bytes or seekable binary file object (read from the
+        current position)
+    :param boundary: boundary between the parts, by default generated randomly
+    :param chunk_size: size of chunk in bytes, by default set to 64 KiB
+    """
+
+    def __init__(
+        self,
+        fields: Union[Mapping[str, Field], Sequence[Tuple[str, Field]]],
+        boundary: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        items = fields.items() if isinstance(fields, Mapping) else fields
+        self.parts: List[Tuple[bytes, Any, int]] = [
+            self._part(name, value) for name, value in items
+        ]
+
+    def __repr__(self) -> str:
+        return f"<MultipartEncoder:{len(self.parts)} parts>"
+
+    @property
+    def content_type(self) -> str:
+        """Property method to return value of content-type header"""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _part(self, name: str, value: Field) -> Tuple[bytes, Any, int]:
+        # returned header of part, content and size of content
+        disposition = f'Content-Disposition: form-data; name="{_quote(name)}"'
+        if not isinstance(value, tuple):
+            content = value.encode("utf-8") if isinstance(value, str) else bytes(value)
+            header = f"--{self.boundary}\r\n{disposition}\r\n\r\n"
+            return header.encode("utf-8"), content, len(content)
+
+        filename, content = value[0], value[1]
+        content_type = value[2] if len(value) > 2 else None
+        content_type = (
+            content_type
+            or mimetypes.guess_type(filename)[0]
+            or "application/octet-stream"
+        )
+        if isinstance(content, (str, os.PathLike)):
+            content = FileBody(content, self.chunk_size)
+
+        if isinstance(content, (bytes, bytearray, memoryview, FileBody)):
+            size = len(content)
+        else:
+            # remaining size of seekable file object
+            position = content.tell()
+            size = content.seek(0, os.SEEK_END) - position
+            content.seek(position)
+
+        header = (
+            f'--{self.boundary}\r\n{disposition}; filename="{_quote(filename)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        )
+        return header.encode("utf-8"), content, size
+
+    def __len__(self) -> int:
+        return sum(len(header) + size + 2 for header, _, size in self.parts) + len(
+            self._closing
+        )
+
+    @property
+    def _closing(self) -> bytes:
+        return f"--{self.boundary}--\r\n".encode("utf-8")
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        for header, content, _ in self.parts:
+            yield header
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                yield content
+            elif isinstance(content, FileBody):
+                yield from content
+            else:
+                while True:
+                    chunk = content.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            yield b"\r\n"
+        yield self._closing
+
+
+def _quote(value: str) -> str:
+    # escape quote and line breaks in the header parameter
+    for character, escaped in (('"', "%22"), ("\r", "%0D"), ("\n", "%0A")):
+        value = value.replace(character, escaped)
+    return value
@@ -34,4 +34,16 @@ setup(
     install_requires=[
         "requests",
     ],
+    entry_points={
+        "console_scripts": [
+            "maritest=maritest.cli:main",
+        ],
+    },
+    extras_require={
+        "http2": ["httpx[http2]"],
+        "yaml": ["PyYAML"],
+        "dns": ["dnspython"],
+        "report": ["numpy", "pyarrow"],
+        "compression": ["brotli", "zstandard"],
+    },
 )
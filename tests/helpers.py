@@ -0,0 +1,53 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+class FakeClock:
+    """Clock that only move forward when the test set ``now``"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """Request handler that doesn't log every request into stderr"""
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(handler, port=0, host="127.0.0.1", ssl_context=None):
+    """Start local HTTP server in daemon thread and returned the server"""
+    server = HTTPServer((host, port), handler)
+    if ssl_context is not None:
+        server.socket = ssl_context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop_server(server):
+    server.shutdown()
+    server.server_close()
+
+
+class LocalServerTestCase(unittest.TestCase):
+    """
+    Test case that share one local HTTP server for all tests of
+    the class, the server is served by ``handler`` class attribute
+    """
+
+    handler = QuietHandler
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = start_server(cls.handler)
+        cls.port = cls.server.server_port
+        cls.base = f"http://127.0.0.1:{cls.port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_server(cls.server)
@@ -0,0 +1,129 @@
+import unittest
+import requests
+import requests_mock  # type: ignore
+from maritest.client import Http
+from maritest.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitState,
+)
+from maritest.utils.exceptions import CircuitOpenError
+from tests.helpers import FakeClock
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            failure_threshold=0.5,
+            window_size=4,
+            minimum_calls=4,
+            recovery_timeout=10,
+            clock=self.clock,
+        )
+
+    def test_open_after_failure_rate(self):
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.assertEqual(CircuitState.CLOSED, self.breaker.state)
+
+        self.breaker.record_failure()
+        self.assertEqual(CircuitState.OPEN, self.breaker.state)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(10, self.breaker.retry_after)
+
+    def test_half_open_probe_success(self):
+        for _ in range(4):
+            self.breaker.record_failure()
+
+        self.clock.now = 10
+        self.assertEqual(CircuitState.HALF_OPEN, self.breaker.state)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())  # only one probe
+
+        self.breaker.record_success()
+        self.assertEqual(CircuitState.CLOSED, self.breaker.state)
+        self.assertEqual(0.0, self.breaker.failure_rate)
+
+    def test_half_open_probe_failure(self):
+        for _ in range(4):
+            self.breaker.record_failure()
+
+        self.clock.now = 15
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertEqual(CircuitState.OPEN, self.breaker.state)
+        self.assertFalse(self.breaker.allow_request())
+
+    @unittest.expectedFailure
+    def test_invalid_threshold(self):
+        CircuitBreaker(failure_threshold=2)
+
+    def test_registry_per_endpoint(self):
+        registry = CircuitBreakerRegistry(window_size=2)
+        first = registry.get("https://github.com/some/path")
+        second = registry.get("https://GITHUB.com/other")
+        third = registry.get("https://httpbin.org/get")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertEqual(2, len(registry))
+        self.assertIn("https://github.com", registry)
+
+        registry.reset("https://github.com")
+        self.assertEqual(1, len(registry))
+
+
+class TestHttpCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.registry = CircuitBreakerRegistry(
+            window_size=2, minimum_calls=2, recovery_timeout=60
+        )
+
+    def request(self):
+        return Http(
+            method="GET",
+            url="https://dead.host/get",
+            headers={},
+            logger=False,
+            retry=False,
+            circuit_breaker=self.registry,
+        )
+
+    def test_circuit_open_fail_fast(self):
+        with requests_mock.Mocker() as m:
+            m.get("https://dead.host/get", exc=requests.exceptions.ConnectionError)
+            for _ in range(2):
+                with self.assertRaises(Exception):
+                    self.request()
+
+            with self.assertRaises(CircuitOpenError) as error:
+                self.request()
+
+            self.assertEqual(2, m.call_count)  # no more network call
+            self.assertEqual("https://dead.host", error.exception.endpoint)
+
+    def test_server_error_count_as_failure(self):
+        with requests_mock.Mocker() as m:
+            m.get("https://dead.host/get", status_code=503)
+            self.request()
+            request = self.request()
+
+            self.assertEqual(CircuitState.OPEN, request.circuit_breaker.state)
+
+    def test_recover_after_probe(self):
+        with requests_mock.Mocker() as m:
+            m.get("https://dead.host/get", status_code=200)
+            breaker = self.registry.get("https://dead.host")
+            breaker.record_failure()
+            breaker.record_failure()
+            breaker.recovery_timeout = 0
+
+            request = self.request()
+            self.assertEqual(200, request.response.status_code)
+            self.assertEqual(CircuitState.CLOSED, breaker.state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from contextlib import redirect_stdout
+
+import requests_mock  # type: ignore
+from maritest.cli import collect_units, discover, main, parse_shard, shard_units
+
+SUITE = {
+    "name": "users api",
+    "base_url": "https://api.server",
+    "defaults": {"retry": False},
+    "tests": [
+        {
+            "name": "get user",
+            "request": {"method": "GET", "url": "/users/1"},
+            "assert": ["assert_is_2xx_status"],
+        },
+        {
+            "name": "missing user",
+            "request": {"method": "GET", "url": "/users/2"},
+            "assert": [{"assert_status_code_in": [404]}],
+        },
+    ],
+}
+
+MODULE = """
+import unittest
+
+
+class TestModule(unittest.TestCase):
+    def test_pass(self):
+        self.assertTrue(True)
+
+    def test_fail(self):
+        self.assertEqual(1, 2)
+"""
+
+MOCK_MODULE = """
+import time
+import unittest
+import requests
+import requests_mock
+
+
+class TestMocked(unittest.TestCase):
+    def request(self, path):
+        with requests_mock.Mocker() as m:
+            m.get(f"https://mocked.server/{path}", text=path)
+            time.sleep(0.02)
+            self.assertEqual(requests.get(f"https://mocked.server/{path}").text, path)
+
+    def test_first(self):
+        self.request("first")
+
+    def test_second(self):
+        self.request("second")
+
+    def test_third(self):
+        self.request("third")
+"""
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # cached plans are written into temporary directory
+        self.environ = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": self.directory})
+        self.environ.start()
+        self.suite_path = os.path.join(self.directory, "users.json")
+        with open(self.suite_path, "w") as f:
+            json.dump(SUITE, f)
+
+        self.mocker = requests_mock.Mocker()
+        self.mocker.start()
+        self.mocker.get("https://api.server/users/1", json={"id": 1})
+        self.mocker.get("https://api.server/users/2", status_code=404)
+
+    def tearDown(self):
+        self.mocker.stop()
+        self.environ.stop()
+        shutil.rmtree(self.directory)
+
+    def run_main(self, *argv):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = main(list(argv))
+        return code, output.getvalue()
+
+    def test_run_suite_with_json_output(self):
+        code, output = self.run_main(self.suite_path, "--format", "json")
+        report = json.loads(output)
+        self.assertEqual(code, 0)
+        self.assertEqual(report["summary"]["total"], 2)
+        self.assertEqual(report["summary"]["failed"], 0)
+        self.assertEqual(
+            sorted(result["name"] for result in report["results"]),
+            [f"{self.suite_path}::get user", f"{self.suite_path}::missing user"],
+        )
+
+    def test_run_python_module(self):
+        path = os.path.join(self.directory, "test_module.py")
+        with open(path, "w") as f:
+            f.write(MODULE)
+
+        code, output = self.run_main(path, "--concurrency", "1")
+        self.assertEqual(code, 1)
+        self.assertIn("PASSED", output)
+        self.assertIn("AssertionError: 1 != 2", output)
+        self.assertIn("1 passed, 1 failed", output)
+
+    def test_python_tests_not_run_concurrently(self):
+        path = os.path.join(self.directory, "test_mocked.py")
+        with open(path, "w") as f:
+            f.write(MOCK_MODULE)
+
+        code, output = self.run_main(path, "--concurrency", "8")
+        self.assertEqual(code, 0, output)
+        self.assertIn("3 passed, 0 failed", output)
+
+    def test_write_output_into_file(self):
+        report_path = os.path.join(self.directory, "report.json")
+        code, output = self.run_main(
+            self.suite_path, "--format", "json", "--output", report_path
+        )
+        with open(report_path) as f:
+            report = json.load(f)
+        self.assertEqual(code, 0)
+        self.assertEqual(output, "")
+        self.assertEqual(report["summary"]["passed"], 2)
+
+    def test_discover_directory(self):
+        path = os.path.join(self.directory, "test_module.py")
+        with open(path, "w") as f:
+            f.write(MODULE)
+        with open(os.path.join(self.directory, "helper.py"), "w") as f:
+            f.write("")
+        os.mkdir(os.path.join(self.directory, "fixtures"))
+        with open(os.path.join(self.directory, "fixtures", "users.json"), "w") as f:
+            json.dump([{"id": 1}], f)
+        with open(os.path.join(self.directory, "fixtures", "user.json"), "w") as f:
+            json.dump({"id": 1}, f)
+        suffix_path = os.path.join(self.directory, "empty.suite.json")
+        with open(suffix_path, "w") as f:
+            json.dump({"name": "empty"}, f)
+
+        self.assertEqual(
+            discover([self.directory]), [suffix_path, path, self.suite_path]
+        )
+        code, output = self.run_main(self.directory)
+        self.assertIn("3 passed, 1 failed", output)
+
+    def test_shard_units(self):
+        units = collect_units([self.suite_path])
+        shards = [shard_units(units, index, 3) for index in range(1, 4)]
+        self.assertEqual(len(units), 2)
+        self.assertEqual(sorted(unit for shard in shards for unit in shard), units)
+        self.assertEqual(
+            shards, [shard_units(units, index, 3) for index in range(1, 4)]
+        )
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+
+    @unittest.expectedFailure
+    def test_parse_invalid_shard(self):
+        parse_shard("5/4")
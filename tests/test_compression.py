@@ -0,0 +1,137 @@
+import gzip
+import hashlib
+import io
+import unittest
+import zlib
+
+import requests_mock  # type: ignore
+from maritest.assertion import Assert
+from maritest.utils.compression import (
+    AVAILABLE_ENCODINGS,
+    accept_encoding,
+    measure_body,
+    new_decoder,
+)
+
+BODY = b'{"id": 1, "name": "maritest"}' * 10000
+GZIP_BODY = gzip.compress(BODY)
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.mocker = requests_mock.Mocker()
+        self.mocker.start()
+
+    def tearDown(self):
+        self.mocker.stop()
+
+    def request(self, stream=False, **kwargs):
+        return Assert(
+            "GET",
+            "https://api.server/users",
+            headers={},
+            logger=False,
+            stream=stream,
+            **kwargs
+        )
+
+    def test_accept_encoding(self):
+        self.assertEqual(accept_encoding(True), ", ".join(AVAILABLE_ENCODINGS))
+        self.assertEqual(accept_encoding("gzip,identity"), "gzip, identity")
+        self.assertEqual(accept_encoding(["deflate"]), "deflate")
+        self.assertEqual(accept_encoding(False), "identity")
+        with self.assertRaises(ValueError):
+            accept_encoding(["compress"])
+
+    def test_accept_encoding_header_sent(self):
+        adapter = self.mocker.get("https://api.server/users", content=BODY)
+        self.request(accept_encoding="gzip")
+        self.assertEqual(adapter.last_request.headers["Accept-Encoding"], "gzip")
+
+    def test_decoders(self):
+        decoder = new_decoder("gzip")
+        multiple = gzip.compress(b"first ") + gzip.compress(b"second")
+        decoded = decoder.decompress(multiple[:10]) + decoder.decompress(multiple[10:])
+        self.assertEqual(decoded, b"first second")
+
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        deflated = raw.compress(BODY) + raw.flush()
+        self.assertEqual(new_decoder("deflate").decompress(deflated), BODY)
+        self.assertEqual(new_decoder("deflate").decompress(zlib.compress(BODY)), BODY)
+
+    @unittest.expectedFailure
+    def test_unsupported_decoder(self):
+        new_decoder("compress")
+
+    def test_streamed_body_size(self):
+        self.mocker.get(
+            "https://api.server/users",
+            body=io.BytesIO(GZIP_BODY),
+            headers={"Content-Encoding": "gzip"},
+        )
+        request = self.request(stream=True)
+        size = request.body_size()
+        self.assertEqual(
+            (size.encoding, size.wire, size.decoded),
+            ("gzip", len(GZIP_BODY), len(BODY)),
+        )
+        self.assertGreater(size.ratio, 10)
+        self.assertIs(request.body_size(), size)
+
+        self.assertEqual(
+            request.assert_content_encoding("GZIP", "compressed"), "compressed"
+        )
+        self.assertEqual(request.assert_wire_size(len(GZIP_BODY), "small"), "small")
+        self.assertEqual(request.assert_decoded_size(len(BODY), "small"), "small")
+
+    def test_record_after_streamed_body_size(self):
+        self.mocker.get(
+            "https://api.server/users",
+            body=io.BytesIO(GZIP_BODY),
+            headers={"Content-Encoding": "gzip"},
+        )
+        request = self.request(stream=True)
+        self.assertEqual(request.body_size().decoded, len(BODY))
+        record = request.to_record(release=False)
+        self.assertEqual(record.size, len(BODY))
+        self.assertEqual(record.digest, hashlib.sha256(BODY).digest())
+
+        # digest of the body on the wire also keep the decoded one
+        self.mocker.get(
+            "https://api.server/users",
+            body=io.BytesIO(GZIP_BODY),
+            headers={"Content-Encoding": "gzip"},
+        )
+        request = self.request(stream=True)
+        wire = request.digest_body("md5", decode_content=False)
+        self.assertEqual(wire.hexdigest("md5"), hashlib.md5(GZIP_BODY).hexdigest())
+        self.assertEqual(request.body_size().wire, len(GZIP_BODY))
+        record = request.to_record()
+        self.assertEqual(
+            (record.size, record.digest), (len(BODY), hashlib.sha256(BODY).digest())
+        )
+
+    def test_body_size_in_memory(self):
+        self.mocker.get(
+            "https://api.server/users",
+            body=io.BytesIO(GZIP_BODY),
+            headers={"Content-Encoding": "gzip"},
+        )
+        request = self.request()
+        self.assertEqual(request.get_content, BODY)
+        size = measure_body(request.response)
+        self.assertEqual((size.wire, size.decoded), (len(GZIP_BODY), len(BODY)))
+
+    @unittest.expectedFailure
+    def test_wire_size_exceeded(self):
+        self.mocker.get("https://api.server/users", content=BODY)
+        self.request().assert_wire_size(len(BODY) - 1, "bloated payload")
+
+    @unittest.expectedFailure
+    def test_compression_dropped(self):
+        self.mocker.get("https://api.server/users", content=BODY)
+        self.request().assert_content_encoding("gzip", "not compressed")
+
+
+if __name__ == "__main__":
+    unittest.main()
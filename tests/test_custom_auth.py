@@ -1,13 +1,22 @@
+import threading
+import time
 import unittest
 import requests
 import requests_mock  # type: ignore
+from concurrent.futures import ThreadPoolExecutor
 from maritest.custom_auth import (
     ApiKeyAuth,
     BasicAuth,
     BearerAuth,
     BasicAuthToken,
     DigestAuth,
+    OAuth2Auth,
+    CachedDigestAuth,
+    DigestChallengeCache,
 )
+from maritest.client import Http
+from requests.utils import parse_dict_header
+from tests.helpers import FakeClock
 
 
 class TestCustomAuth(unittest.TestCase):
@@ -133,6 +142,202 @@ class TestCustomAuth(unittest.TestCase):
         self.assertIsInstance(custom_api_key.key, str)
         self.assertIsInstance(custom_api_key.value, str)
 
+    def test_precomputed_token_header(self):
+        basic_auth = BasicAuthToken(token="password token")
+        request = basic_auth(requests.Request("GET", "https://github.com").prepare())
+
+        self.assertEqual(basic_auth.header, request.headers["Authorization"])
+        self.assertEqual("Bearer testtest", BearerAuth("testtest").header)
+
+
+class TestOAuth2Auth(unittest.TestCase):
+    token_url = "https://auth.server/token"
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def prepare(self):
+        return requests.Request("GET", "https://api.server/resource").prepare()
+
+    def test_token_cached(self):
+        oauth = OAuth2Auth(
+            token_url=self.token_url,
+            client_id="client",
+            client_secret="secret",
+            clock=self.clock,
+        )
+        with requests_mock.Mocker() as m:
+            m.post(self.token_url, json={"access_token": "abc", "expires_in": 300})
+            for _ in range(5):
+                request = oauth(self.prepare())
+
+            self.assertEqual(1, m.call_count)
+            self.assertIn("grant_type=client_credentials", m.last_request.text)
+
+        self.assertEqual("Bearer abc", request.headers["Authorization"])
+        self.assertFalse(oauth.is_expired)
+
+    def test_token_expired(self):
+        oauth = OAuth2Auth(
+            token_url=self.token_url,
+            client_id="client",
+            refresh_margin=0,
+            clock=self.clock,
+        )
+        with requests_mock.Mocker() as m:
+            m.post(
+                self.token_url,
+                [
+                    {"json": {"access_token": "first", "expires_in": 10}},
+                    {"json": {"access_token": "second", "expires_in": 10}},
+                ],
+            )
+            oauth(self.prepare())
+            self.clock.now = 11
+            request = oauth(self.prepare())
+
+            self.assertEqual(2, m.call_count)
+            self.assertIn("client_id=client", m.last_request.text)
+
+        self.assertEqual("Bearer second", request.headers["Authorization"])
+
+    def test_proactive_background_refresh(self):
+        oauth = OAuth2Auth(
+            token_url=self.token_url,
+            client_id="client",
+            client_secret="secret",
+            refresh_token="refresh-1",
+            refresh_margin=30,
+            clock=self.clock,
+        )
+        with requests_mock.Mocker() as m:
+            m.post(
+                self.token_url,
+                [
+                    {
+                        "json": {
+                            "access_token": "first",
+                            "expires_in": 60,
+                            "refresh_token": "refresh-2",
+                        }
+                    },
+                    {"json": {"access_token": "second", "expires_in": 60}},
+                ],
+            )
+            oauth(self.prepare())
+            self.clock.now = 40
+
+            # still use the cached token while refreshing
+            request = oauth(self.prepare())
+            self.assertEqual("Bearer first", request.headers["Authorization"])
+            oauth.wait(timeout=5)
+
+            self.assertEqual(2, m.call_count)
+            self.assertIn("refresh_token=refresh-2", m.last_request.text)
+
+        self.assertEqual("Bearer second", oauth.header)
+        self.assertEqual(2, oauth.refresh_count)
+
+    def test_concurrent_refresh_deduplicated(self):
+        oauth = OAuth2Auth(token_url=self.token_url, client_id="client")
+        barrier = threading.Barrier(5)
+
+        def callback(request, context):
+            time.sleep(0.2)
+            return {"access_token": "abc", "expires_in": 300}
+
+        def worker(_):
+            barrier.wait()
+            return oauth(self.prepare()).headers["Authorization"]
+
+        with requests_mock.Mocker() as m:
+            m.post(self.token_url, json=callback)
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                headers = list(executor.map(worker, range(5)))
+
+            self.assertEqual(1, m.call_count)
+
+        self.assertEqual(["Bearer abc"] * 5, headers)
+
+    @unittest.expectedFailure
+    def test_invalid_token_response(self):
+        oauth = OAuth2Auth(token_url=self.token_url, client_id="client")
+        with requests_mock.Mocker() as m:
+            m.post(self.token_url, json={"error": "invalid_client"})
+            oauth(self.prepare())
+
+
+class TestCachedDigestAuth(unittest.TestCase):
+    url = "https://digest.server/resource"
+
+    def setUp(self):
+        self.challenges = DigestChallengeCache()
+        self.nonce_counts = []
+
+    def callback(self, request, context):
+        authorization = request.headers.get("Authorization")
+        if authorization is None:
+            context.status_code = 401
+            context.headers[
+                "WWW-Authenticate"
+            ] = 'Digest realm="maritest", nonce="abc123", qop="auth", opaque="xyz"'
+            return "challenge"
+
+        header = parse_dict_header(authorization[len("Digest ") :])
+        self.assertEqual("abc123", header["nonce"])
+        self.nonce_counts.append(int(header["nc"], 16))
+        context.status_code = 200
+        return "authenticated"
+
+    def request(self, auth):
+        return Http(
+            method="GET",
+            url=self.url,
+            headers={},
+            logger=False,
+            retry=False,
+            auth=auth,
+        )
+
+    def test_single_round_trip_after_challenge(self):
+        with requests_mock.Mocker() as m:
+            m.get(self.url, text=self.callback)
+            for _ in range(3):
+                # new auth instance and session for each request
+                auth = CachedDigestAuth("user", "pass", challenges=self.challenges)
+                request = self.request(auth)
+                self.assertEqual(200, request.response.status_code)
+
+            self.assertEqual(4, m.call_count)  # only one 401 challenge
+
+        self.assertEqual([1, 2, 3], self.nonce_counts)
+        self.assertEqual(1, len(self.challenges))
+
+    def test_nonce_count_across_threads(self):
+        auth = CachedDigestAuth("user", "pass", challenges=self.challenges)
+        with requests_mock.Mocker() as m:
+            m.get(self.url, text=self.callback)
+            self.request(auth)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: self.request(auth), range(8)))
+
+            self.assertEqual(10, m.call_count)
+
+        self.assertEqual(list(range(1, 10)), sorted(self.nonce_counts))
+
+    def test_rejected_challenge_invalidated(self):
+        auth = CachedDigestAuth("user", "pass", challenges=self.challenges)
+        with requests_mock.Mocker() as m:
+            m.get(
+                self.url,
+                status_code=401,
+                headers={"WWW-Authenticate": 'Digest realm="maritest", nonce="n"'},
+            )
+            request = self.request(auth)
+
+        self.assertEqual(401, request.response.status_code)
+        self.assertEqual(0, len(self.challenges))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import requests_mock  # type: ignore
+from maritest.datasets import DataDriven, Dataset
+from maritest.runner import CaseResult, Runner
+
+
+class TestDataset(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.directory, "users.csv")
+        with open(self.csv_path, "w") as f:
+            f.write("id,name\n1,ryan\n2,yui\n404,ghost\n")
+        self.jsonl_path = os.path.join(self.directory, "users.jsonl")
+        with open(self.jsonl_path, "w") as f:
+            f.write(json.dumps({"id": 1, "active": True}) + "\n\n")
+            f.write(json.dumps({"id": 2, "active": False}) + "\n")
+
+        self.mocker = requests_mock.Mocker()
+        self.mocker.start()
+        self.mocker.get("https://api.server/users/1", json={"id": 1})
+        self.mocker.get("https://api.server/users/2", json={"id": 2})
+        self.mocker.get("https://api.server/users/404", status_code=404)
+
+    def tearDown(self):
+        self.mocker.stop()
+        shutil.rmtree(self.directory)
+
+    def test_read_csv_lazily(self):
+        rows = iter(Dataset(self.csv_path))
+        self.assertEqual(next(rows), {"id": "1", "name": "ryan"})
+        self.assertEqual(len(list(rows)), 2)
+
+    def test_read_jsonl(self):
+        rows = list(Dataset(self.jsonl_path))
+        self.assertEqual(rows, [{"id": 1, "active": True}, {"id": 2, "active": False}])
+
+    def test_limit_rows(self):
+        self.assertEqual(len(list(Dataset(self.csv_path, limit=2))), 2)
+
+    @unittest.expectedFailure
+    def test_unknown_format(self):
+        Dataset(os.path.join(self.directory, "users.txt"))
+
+    def test_run_data_driven(self):
+        case = DataDriven(
+            name="get user",
+            dataset=Dataset(self.csv_path),
+            request={"method": "GET", "url": "${base_url}/users/${id}", "retry": False},
+            assertions=["assert_is_2xx_status"],
+        )
+        results = case.run(
+            runner=Runner(concurrency=2), variables={"base_url": "https://api.server"}
+        )
+        self.assertEqual(
+            [result.name for result in results],
+            ["get user[1]", "get user[2]", "get user[3]"],
+        )
+        self.assertEqual([result.passed for result in results], [True, True, False])
+
+    def test_missing_column_as_failed_result(self):
+        case = DataDriven(
+            name="get user",
+            dataset=[{"name": "ryan"}],
+            request={"method": "GET", "url": "https://api.server/users/${id}"},
+        )
+        results = case.run()
+        self.assertFalse(results[0].passed)
+        self.assertIn("KeyError", results[0].error)
+
+
+class TestRunnerBackpressure(unittest.TestCase):
+    def test_pull_items_lazily(self):
+        produced = []
+
+        def items():
+            for index in range(100):
+                produced.append(index)
+                yield index
+
+        def case(index):
+            # items pulled ahead of the running one are bounded
+            return CaseResult(name=str(index), passed=len(produced) - index <= 4)
+
+        runner = Runner(concurrency=2, max_pending=4)
+        results = list(runner.iterate(case, items()))
+        self.assertEqual(len(results), 100)
+        self.assertTrue(all(result.passed for result in results))
+
+    @unittest.expectedFailure
+    def test_invalid_max_pending(self):
+        Runner(concurrency=4, max_pending=2)
@@ -0,0 +1,140 @@
+import base64
+import gzip
+import hashlib
+import io
+import itertools
+import threading
+import unittest
+import zlib
+
+import requests_mock  # type: ignore
+from maritest.assertion import Assert
+from maritest.utils.digest import CRC32, digest_body, parse_digest_headers, read_ahead
+
+BODY = b"maritest" * 100000
+GZIP_BODY = gzip.compress(BODY)
+
+
+def b64(digest: bytes) -> str:
+    return base64.b64encode(digest).decode()
+
+
+class TestDigest(unittest.TestCase):
+    def setUp(self):
+        self.mocker = requests_mock.Mocker()
+        self.mocker.start()
+
+    def tearDown(self):
+        self.mocker.stop()
+
+    def request(self, stream=True, **kwargs):
+        self.mocker.get("https://api.server/file", **kwargs)
+        return Assert(
+            "GET", "https://api.server/file", headers={}, logger=False, stream=stream
+        )
+
+    def test_crc32(self):
+        checksum = CRC32()
+        checksum.update(BODY[:10])
+        checksum.update(BODY[10:])
+        self.assertEqual(checksum.hexdigest(), f"{zlib.crc32(BODY):08x}")
+
+    def test_streamed_body_digest(self):
+        request = self.request(body=io.BytesIO(BODY))
+        self.assertIs(request.response._content, False)
+
+        digest = request.digest_body("md5", "crc32")
+        self.assertEqual(digest.size, len(BODY))
+        self.assertEqual(digest.hexdigest("sha256"), hashlib.sha256(BODY).hexdigest())
+        self.assertEqual(
+            request.assert_body_md5(hashlib.md5(BODY).hexdigest(), "md5 matched"),
+            "md5 matched",
+        )
+        self.assertEqual(
+            request.assert_body_crc32(zlib.crc32(BODY), "crc matched"), "crc matched"
+        )
+        self.assertEqual(
+            request.to_record(release=False).digest, hashlib.sha256(BODY).digest()
+        )
+
+    @unittest.expectedFailure
+    def test_digest_after_body_consumed(self):
+        request = self.request(body=io.BytesIO(BODY))
+        request.digest_body("md5")
+        request.assert_body_digest("sha1", hashlib.sha1(BODY).hexdigest(), "consumed")
+
+    @unittest.expectedFailure
+    def test_body_sha256_mismatch(self):
+        request = self.request(stream=False, content=BODY)
+        request.assert_body_sha256(hashlib.sha256(b"other").hexdigest(), "not equal")
+
+    def test_digest_in_memory_body(self):
+        request = self.request(stream=False, content=BODY)
+        self.assertEqual(
+            request.assert_body_sha256(
+                hashlib.sha256(BODY).hexdigest().upper(), "equal"
+            ),
+            "equal",
+        )
+        self.assertEqual(request.get_content, BODY)
+
+    def test_digest_headers(self):
+        headers = {
+            "Content-MD5": b64(hashlib.md5(GZIP_BODY).digest()),
+            "Digest": f"SHA-256={b64(hashlib.sha256(GZIP_BODY).digest())}, UNIXsum=30637",
+            "Content-Digest": f"sha-512=:{b64(hashlib.sha512(GZIP_BODY).digest())}:",
+            "Content-Encoding": "gzip",
+        }
+        self.assertEqual(
+            set(parse_digest_headers(headers)), {"md5", "sha256", "sha512"}
+        )
+
+        # digest headers are computed over the body on the wire
+        request = self.request(body=io.BytesIO(GZIP_BODY), headers=headers)
+        self.assertEqual(
+            request.assert_digest_header("digest matched"), "digest matched"
+        )
+
+    @unittest.expectedFailure
+    def test_digest_header_mismatch(self):
+        headers = {"Content-MD5": b64(hashlib.md5(b"other").digest())}
+        self.request(body=io.BytesIO(BODY), headers=headers).assert_digest_header(
+            "mismatch"
+        )
+
+    @unittest.expectedFailure
+    def test_without_digest_header(self):
+        self.request(body=io.BytesIO(BODY)).assert_digest_header("no header")
+
+    def test_reader_error_raised(self):
+        class Response:
+            _content = False
+            _content_consumed = False
+            headers = {}
+
+            def iter_content(self, chunk_size):
+                yield b"first"
+                raise ConnectionError("connection reset")
+
+        with self.assertRaises(ConnectionError):
+            digest_body(Response())
+
+    def test_reader_stopped_early(self):
+        closed = threading.Event()
+
+        def endless():
+            try:
+                yield from itertools.repeat(b"chunk")
+            finally:
+                closed.set()
+
+        threads = threading.active_count()
+        chunks = read_ahead(endless(), queue_size=2)
+        self.assertEqual(list(itertools.islice(chunks, 3)), [b"chunk"] * 3)
+        chunks.close()
+        self.assertTrue(closed.is_set())
+        self.assertEqual(threading.active_count(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import socket
+import time
+import unittest
+from unittest import mock
+from maritest.client import Http
+from maritest.transport import RequestsTransport
+from maritest.utils.dns_cache import DNSCache
+from tests.helpers import (
+    FakeClock,
+    LocalServerTestCase,
+    QuietHandler,
+    start_server,
+    stop_server,
+)
+
+
+class Handler(QuietHandler):
+    def do_GET(self):
+        body = self.headers["Host"].encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+ADDRESSES = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 443))]
+
+
+class TestDNSCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = DNSCache(ttl=60, clock=self.clock, respect_record_ttl=False)
+
+    def test_cache_until_ttl_expired(self):
+        with mock.patch("socket.getaddrinfo", return_value=ADDRESSES) as lookup:
+            self.assertEqual(self.cache.resolve("API.server"), "10.0.0.1")
+            self.assertEqual(self.cache.resolve("api.server."), "10.0.0.1")
+            self.clock.now = 61
+            self.cache.resolve("api.server")
+
+        stats = self.cache.stats()
+        self.assertEqual(lookup.call_count, 2)
+        self.assertEqual((stats["hits"], stats["misses"], stats["hosts"]), (1, 2, 1))
+        self.assertGreaterEqual(stats["saved_time"], 0.0)
+
+    def test_use_shorter_record_ttl(self):
+        cache = DNSCache(ttl=60, clock=self.clock, respect_record_ttl=True)
+        with mock.patch("socket.getaddrinfo", return_value=ADDRESSES), mock.patch(
+            "maritest.utils.dns_cache.record_ttl", return_value=5.0
+        ):
+            cache.resolve("api.server")
+            self.clock.now = 6
+            cache.resolve("api.server")
+        self.assertEqual(cache.misses, 2)
+
+    def test_overrides_and_ip_address(self):
+        cache = DNSCache(overrides={"Api.Server": "10.0.0.9"})
+        with mock.patch("socket.getaddrinfo") as lookup:
+            self.assertEqual(cache.resolve("api.server"), "10.0.0.9")
+            self.assertEqual(cache.resolve("127.0.0.1"), "127.0.0.1")
+        lookup.assert_not_called()
+
+    def test_invalidate(self):
+        with mock.patch("socket.getaddrinfo", return_value=ADDRESSES):
+            self.cache.resolve("api.server")
+            self.cache.resolve("other.server")
+        self.cache.invalidate("api.server")
+        self.assertEqual(len(self.cache), 1)
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_record_ttl_counted_as_lookup_time(self):
+        cache = DNSCache(
+            ttl=60, clock=self.clock, respect_record_ttl=True, record_lifetime=0.5
+        )
+
+        def slow_record_ttl(host, lifetime):
+            self.assertEqual(lifetime, 0.5)
+            time.sleep(0.05)
+            return 5.0
+
+        with mock.patch("socket.getaddrinfo", return_value=ADDRESSES), mock.patch(
+            "maritest.utils.dns_cache.record_ttl", side_effect=slow_record_ttl
+        ) as query:
+            cache.resolve("api.server")
+            cache.resolve("api.server")
+        stats = cache.stats()
+        self.assertEqual(query.call_count, 1)
+        self.assertGreaterEqual(stats["lookup_time"], 0.05)
+        self.assertGreaterEqual(stats["saved_time"], 0.05)
+
+    def test_record_ttl_not_queried_by_default(self):
+        cache = DNSCache(ttl=60, clock=self.clock)
+        with mock.patch("socket.getaddrinfo", return_value=ADDRESSES), mock.patch(
+            "maritest.utils.dns_cache.record_ttl"
+        ) as query:
+            cache.resolve("api.server")
+        query.assert_not_called()
+
+    def test_fail_over_to_next_address(self):
+        addresses = ADDRESSES + [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.2", 443))
+        ]
+        with mock.patch("socket.getaddrinfo", return_value=addresses) as lookup:
+            self.assertEqual(
+                self.cache.resolve_all("api.server"), ["10.0.0.1", "10.0.0.2"]
+            )
+            self.cache.report_failure("api.server", "10.0.0.1")
+            self.assertEqual(self.cache.resolve("api.server"), "10.0.0.2")
+
+            # resolved again once all addresses failed
+            self.cache.report_failure("api.server", "10.0.0.2")
+            self.assertEqual(len(self.cache), 0)
+            self.assertEqual(self.cache.resolve("api.server"), "10.0.0.1")
+        self.assertEqual(lookup.call_count, 2)
+
+    @unittest.expectedFailure
+    def test_negative_ttl(self):
+        DNSCache(ttl=-1)
+
+
+class TestDNSCacheTransport(LocalServerTestCase):
+    handler = Handler
+
+    def test_override_host_keep_host_header(self):
+        cache = DNSCache(overrides={"api.staging.test": "127.0.0.1"})
+        request = Http(
+            "GET",
+            f"http://api.staging.test:{self.port}/users",
+            headers={},
+            logger=False,
+            retry=False,
+            transport=RequestsTransport(dns_cache=cache),
+        )
+        self.assertEqual(request.get_status_code, 200)
+        self.assertEqual(request.get_content, f"api.staging.test:{self.port}".encode())
+
+    def test_resolve_once_for_many_requests(self):
+        cache = DNSCache(respect_record_ttl=False)
+        transport = RequestsTransport(dns_cache=cache)
+        for _ in range(3):
+            Http(
+                "GET",
+                f"http://localhost:{self.port}/",
+                headers={},
+                logger=False,
+                retry=False,
+                transport=transport,
+            )
+        self.assertEqual((cache.misses, cache.hits), (1, 2))
+
+    def test_unreachable_address_fail_over(self):
+        # nothing listen on the port of closed socket
+        closed = socket.socket()
+        closed.bind(("127.0.0.2", 0))
+        port = closed.getsockname()[1]
+        closed.close()
+
+        cache = DNSCache(respect_record_ttl=False)
+        cache._entries["api.staging.test"] = (
+            ["127.0.0.2", "127.0.0.1"],
+            float("inf"),
+            0.0,
+        )
+        server = start_server(Handler, port)
+        try:
+            request = Http(
+                "GET",
+                f"http://api.staging.test:{port}/",
+                headers={},
+                logger=False,
+                retry=False,
+                transport=RequestsTransport(dns_cache=cache),
+            )
+        finally:
+            stop_server(server)
+        self.assertEqual(request.get_status_code, 200)
+        self.assertEqual(cache.resolve("api.staging.test"), "127.0.0.1")
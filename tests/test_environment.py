@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import requests
+import requests_mock  # type: ignore
+from maritest.client import Http
+from maritest.utils.environment import EnvironmentCache, environment_settings
+
+
+class TestEnvironmentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = EnvironmentCache()
+        self.session = requests.Session()
+
+    def test_resolve_once_per_host(self):
+        with mock.patch.dict(os.environ, {"HTTPS_PROXY": "http://proxy:3128"}):
+            _, first = self.cache.resolve(self.session, "https://api.server/users/1")
+        # environment change is ignored until the cache invalidated
+        _, second = self.cache.resolve(self.session, "https://api.server/users/2")
+
+        self.assertEqual(first["proxies"], {"https": "http://proxy:3128"})
+        self.assertEqual(second, first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        self.cache.invalidate("https://api.server/anything")
+        _, third = self.cache.resolve(self.session, "https://api.server/users/3")
+        self.assertEqual(third["proxies"], {})
+        self.assertEqual(len(self.cache), 1)
+
+    def test_different_settings_per_host_and_options(self):
+        self.cache.resolve(self.session, "https://api.server")
+        self.cache.resolve(self.session, "https://other.server")
+        self.cache.resolve(self.session, "https://api.server", verify=False)
+        self.assertEqual(self.cache.misses, 3)
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_cached_settings_not_modified_by_caller(self):
+        _, settings = self.cache.resolve(self.session, "https://api.server")
+        settings["proxies"]["https"] = "http://changed"
+        _, settings = self.cache.resolve(self.session, "https://api.server")
+        self.assertEqual(settings["proxies"], {})
+
+    def test_disabled_cache(self):
+        cache = EnvironmentCache(enabled=False)
+        cache.resolve(self.session, "https://api.server")
+        cache.resolve(self.session, "https://api.server")
+        self.assertEqual((cache.misses, len(cache)), (2, 0))
+
+    def test_netrc_auth_resolved_once(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, ".netrc")
+        with open(path, "w") as f:
+            f.write("machine api.server login ryan password secret\n")
+        try:
+            with mock.patch.dict(os.environ, {"NETRC": path}):
+                auth, _ = self.cache.resolve(self.session, "https://api.server")
+        finally:
+            shutil.rmtree(directory)
+        auth_again, _ = self.cache.resolve(self.session, "https://api.server")
+        self.assertEqual(auth, ("ryan", "secret"))
+        self.assertEqual(auth_again, auth)
+
+
+class TestHttpEnvironment(unittest.TestCase):
+    def test_http_use_cached_settings(self):
+        environment_settings.invalidate()
+        with requests_mock.Mocker() as mocker, mock.patch(
+            "maritest.utils.environment.get_netrc_auth", return_value=None
+        ) as netrc:
+            mocker.get("https://api.server/users", json={})
+            for _ in range(3):
+                Http("GET", "https://api.server/users", headers={}, logger=False)
+        self.assertEqual(netrc.call_count, 1)
@@ -0,0 +1,127 @@
+import unittest
+import requests_mock  # type: ignore
+from maritest.assertion import Assert
+from maritest.store import ResultStore
+from maritest.utils.exceptions import ExpectationError
+
+
+class TestExpectation(unittest.TestCase):
+    def setUp(self):
+        with requests_mock.Mocker() as m:
+            m.get(
+                "https://api.server/users",
+                json={"data": [{"id": 1, "name": "ryan"}], "total": 1},
+                headers={"Content-Type": "application/json", "X-Total": "1"},
+            )
+            self.request = Assert(
+                method="GET", url="https://api.server/users", headers={}, logger=False
+            )
+
+    def test_chained_expectation_passed(self):
+        expectation = (
+            self.request.expect()
+            .status_2xx()
+            .status(200, 201)
+            .header("X-Total", "1")
+            .content_type("application/json")
+            .json_path("$.data[0].name", "ryan")
+            .json_path("total")
+            .body_contains("ryan")
+            .response_time(60)
+        )
+        self.assertEqual(8, len(expectation))
+        self.assertEqual("all passed", expectation.verify("all passed"))
+
+    def test_all_failures_reported(self):
+        expectation = (
+            self.request.expect()
+            .status_4xx()
+            .header("X-Missing")
+            .json_path("$.data[0].id", 2)
+            .json_path("$.data[5]")
+            .json_equal({"data": []})
+        )
+        with self.assertRaises(ExpectationError) as error:
+            expectation.verify()
+
+        failures = error.exception.failures
+        self.assertEqual(5, len(failures))
+        self.assertIn("status code in range 400-499, was 200", failures[0])
+        self.assertIn("header 'X-Missing' exists, header wasn't set", failures[1])
+        self.assertIn("JSON path $.data[0].id equal to 2, was 1", failures[2])
+        self.assertIn("path not found", failures[3])
+        self.assertIsInstance(error.exception, AssertionError)
+
+    def test_json_decoded_once(self):
+        calls = []
+        expectation = self.request.expect()
+        for _ in range(3):
+            expectation.satisfy(
+                lambda view: calls.append(id(view.json)), "decoded JSON view"
+            )
+        expectation.verify()
+
+        self.assertEqual(1, len(set(calls)))
+
+    def test_check_exception_as_failure(self):
+        expectation = self.request.expect().satisfy(
+            lambda view: view.json["missing"], "custom check"
+        )
+        outcomes = expectation.evaluate()
+        self.assertIn("raised KeyError", outcomes[0][1])
+
+
+class TestBatchExpectation(unittest.TestCase):
+    def setUp(self):
+        self.store = ResultStore()
+        for index in range(998):
+            self.store.append("GET /users", 200, 0.1 + index / 10000)
+        self.store.append("GET /users", 404, 0.2, passed=False)
+        self.store.append("GET /orders", 503, 2.0, passed=False)
+
+    def test_batch_expectation_passed(self):
+        message = (
+            self.store.expect()
+            .status_2xx(ratio=0.99)
+            .status(200, 404, ratio=0.999)
+            .failure_rate(0.01)
+            .latency(95, 2.0)
+            .latency(50, 0.2, per_endpoint=False)
+            .verify("run was healthy")
+        )
+        self.assertEqual(message, "run was healthy")
+
+    def test_batch_expectation_failures(self):
+        expectation = (
+            self.store.expect()
+            .status_2xx(ratio=0.999)
+            .no_5xx()
+            .no_errors()
+            .latency(95, 0.3)
+        )
+        with self.assertRaises(ExpectationError) as context:
+            expectation.verify()
+        failures = context.exception.failures
+        self.assertEqual(len(failures), 3)
+        self.assertIn("was 99.8000% of 1000 responses", failures[0])
+        self.assertIn("found 1 responses", failures[1])
+        self.assertIn("GET /orders was 2.0 seconds", failures[2])
+        self.assertNotIn("GET /users", failures[2])
+
+    def test_batch_expectation_evaluated_once(self):
+        calls = []
+        group_by = self.store.group_by
+        self.store.group_by = lambda *args, **kwargs: calls.append(kwargs) or group_by(
+            *args, **kwargs
+        )
+        self.store.expect().latency(95, 5).latency(99, 5).latency(50, 5).evaluate()
+        self.assertEqual(calls, [{"percentiles": (50, 95, 99)}])
+
+    def test_empty_store(self):
+        outcomes = ResultStore().expect().status_2xx().no_5xx().evaluate()
+        self.assertEqual(outcomes[0][1], "there's no result")
+        self.assertIsNone(outcomes[1][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
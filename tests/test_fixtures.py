@@ -0,0 +1,155 @@
+import json
+import os
+import tempfile
+import unittest
+from maritest.client import Http
+from maritest.fixtures import Fixture, FixtureLoader
+from maritest.suite import compile_suite, load_plan
+from tests.helpers import LocalServerTestCase, QuietHandler
+
+
+class Handler(QuietHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.headers.get("Content-Type"), body))
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class TestFixtures(LocalServerTestCase):
+    handler = Handler
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server.requests = []
+        cls.url = f"{cls.base}/users"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.payload = {
+            "users": [{"id": index, "name": "maritest"} for index in range(50000)]
+        }
+        self.write("users.json", json.dumps(self.payload, indent=2))
+        self.loader = FixtureLoader(self.directory.name)
+
+    def tearDown(self):
+        self.loader.clear()
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        with open(os.path.join(self.directory.name, name), "w") as f:
+            f.write(content)
+
+    def post(self, data):
+        Http("POST", self.url, headers={}, logger=False, data=data, retry=False)
+        return self.server.requests[-1]
+
+    def test_large_fixture_mapped_and_cached(self):
+        fixture = self.loader.load("users.json")
+        self.assertTrue(fixture.is_mapped)
+        self.assertIs(self.loader.load("users.json"), fixture)
+
+        for _ in range(3):
+            content_type, body = self.post(fixture)
+            self.assertEqual(content_type, "application/json")
+            self.assertEqual(json.loads(body), self.payload)
+
+    def test_reloaded_when_modified(self):
+        self.write("user.json", '{"id": 1}')
+        fixture = self.loader.load("user.json")
+        self.assertFalse(fixture.is_mapped)
+
+        self.write("user.json", '{"id": 20}')
+        reloaded = self.loader.load("user.json")
+        self.assertIsNot(reloaded, fixture)
+        self.assertEqual(bytes(reloaded), b'{"id": 20}')
+
+    def test_minify_and_yaml(self):
+        loader = FixtureLoader(self.directory.name, minify=True)
+        fixture = loader.load("users.json")
+        self.assertFalse(fixture.is_mapped)
+        self.assertNotIn(b" ", bytes(fixture))
+
+        self.write("user.yaml", "id: 1\nname: maritest\n")
+        self.assertEqual(bytes(loader.load("user.yaml")), b'{"id":1,"name":"maritest"}')
+
+    def test_fixture_from_object(self):
+        fixture = Fixture.from_object({"name": "maritest"}, chunk_size=4)
+        self.assertEqual(len(list(fixture)), 5)
+        self.assertEqual(
+            self.post(fixture), ("application/json", b'{"name":"maritest"}')
+        )
+
+    @unittest.expectedFailure
+    def test_missing_fixture(self):
+        self.loader.load("missing.json")
+
+    def test_suite_fixture_key(self):
+        self.write("user.json", '{"name": "maritest"}')
+        plan = compile_suite(
+            {
+                "tests": [
+                    {
+                        "name": "create user",
+                        "request": {
+                            "method": "POST",
+                            "url": self.url,
+                            "fixture": os.path.join(self.directory.name, "user.json"),
+                            "retry": False,
+                        },
+                        "assert": [{"assert_status_code_in": [201]}],
+                    }
+                ]
+            }
+        )
+        self.assertTrue(plan.steps[0].run().passed)
+        self.assertEqual(self.server.requests[-1][1], b'{"name": "maritest"}')
+
+    def test_static_suite_fixture_reloaded(self):
+        path = os.path.join(self.directory.name, "user.json")
+        self.write("user.json", '{"a": 1}')
+        plan = compile_suite(
+            {
+                "tests": [
+                    {
+                        "request": {"method": "POST", "url": self.url, "fixture": path},
+                        "assert": [{"assert_status_code_in": [201]}],
+                    }
+                ]
+            }
+        )
+        step = plan.steps[0]
+        self.assertTrue(step.run().passed)
+        self.assertEqual(step.request.render({})["fixture"], path)
+
+        self.write("user.json", '{"a": 2}')
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+        self.assertTrue(step.run().passed)
+        self.assertEqual(self.server.requests[-1][1], b'{"a": 2}')
+
+    def test_suite_fixture_relative_to_suite_file(self):
+        self.write("user.json", '{"name": "relative"}')
+        suite = {
+            "tests": [
+                {
+                    "request": {
+                        "method": "POST",
+                        "url": self.url,
+                        "fixture": "user.json",
+                    },
+                    "assert": [{"assert_status_code_in": [201]}],
+                }
+            ]
+        }
+        self.write("suite.json", json.dumps(suite))
+        plan = load_plan(
+            os.path.join(self.directory.name, "suite.json"), use_cache=False
+        )
+        self.assertTrue(plan.steps[0].run().passed)
+        self.assertEqual(self.server.requests[-1][1], b'{"name": "relative"}')
+
+
+if __name__ == "__main__":
+    unittest.main()
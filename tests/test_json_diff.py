@@ -0,0 +1,145 @@
+import unittest
+import requests_mock  # type: ignore
+from maritest.assertion import Assert
+from maritest.utils.json_diff import DiffKind, Difference, json_diff
+
+
+class TestJsonDiff(unittest.TestCase):
+    def setUp(self):
+        self.actual = {
+            "data": [
+                {"id": 1, "name": "ryan", "ts": 1},
+                {"id": 2, "name": "bob", "ts": 2},
+            ],
+            "total": 2,
+            "extra": True,
+        }
+        self.expected = {
+            "data": [
+                {"id": 1, "name": "ray", "ts": 9},
+                {"id": 2, "name": "bob", "ts": 3},
+            ],
+            "total": "2",
+            "next": None,
+        }
+
+    def test_equal_objects(self):
+        self.assertEqual([], json_diff(self.actual, self.actual))
+        self.assertEqual([], json_diff({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}))
+
+    def test_differences_in_document_order(self):
+        differences = json_diff(self.actual, self.expected)
+        self.assertEqual(
+            [str(difference) for difference in differences],
+            [
+                "$.data[0].name expected 'ray', was 'ryan'",
+                "$.data[0].ts expected 9, was 1",
+                "$.data[1].ts expected 3, was 2",
+                "$.total expected string, was number",
+                "$.next is missing, expected None",
+                "$.extra is unexpected, was True",
+            ],
+        )
+        self.assertEqual(differences[3].kind, DiffKind.TYPE)
+
+    def test_ignore_paths(self):
+        differences = json_diff(
+            self.actual,
+            self.expected,
+            ignore_paths=["$.data[*].ts", "$.total", "next", "$.extra"],
+        )
+        self.assertEqual(
+            differences, [Difference("$.data[0].name", DiffKind.CHANGED, "ryan", "ray")]
+        )
+
+    def test_unordered_arrays(self):
+        self.assertEqual(
+            [], json_diff([1, {"a": 1}, [2]], [[2], 1, {"a": 1}], unordered=True)
+        )
+        differences = json_diff(
+            {"tags": [1, 2, 3]}, {"tags": [3, 2, 4]}, unordered=["$.tags"]
+        )
+        self.assertEqual(
+            [str(difference) for difference in differences],
+            ["$.tags[2] is missing, expected 4", "$.tags[0] is unexpected, was 1"],
+        )
+        self.assertEqual(2, len(json_diff({"tags": [1, 2]}, {"tags": [2, 1]})))
+
+    def test_unordered_arrays_with_ignore_paths(self):
+        actual = {"items": [{"id": 1, "t": 10}, {"id": 2, "t": 20, "tags": ["b", "a"]}]}
+        expected = {
+            "items": [{"id": 2, "t": 99, "tags": ["a", "b"]}, {"id": 1, "t": 98}]
+        }
+        self.assertEqual(
+            [],
+            json_diff(actual, expected, ignore_paths=["$.items[*].t"], unordered=True),
+        )
+
+        # nested array is ordered unless listed
+        differences = json_diff(
+            actual, expected, ignore_paths=["$.items[*].t"], unordered=["$.items"]
+        )
+        self.assertEqual(
+            [str(difference) for difference in differences],
+            [
+                "$.items[0] is missing, expected {'id': 2, 't': 99, 'tags': ['a', 'b']}",
+                "$.items[1] is unexpected, was {'id': 2, 't': 20, 'tags': ['b', 'a']}",
+            ],
+        )
+        self.assertEqual(
+            [],
+            json_diff(
+                actual,
+                expected,
+                ignore_paths=["$.items[*].t"],
+                unordered=["$.items", "$.items[*].tags"],
+            ),
+        )
+
+    def test_max_diffs(self):
+        differences = json_diff(list(range(10000)), list(range(1, 10001)), max_diffs=3)
+        self.assertEqual(
+            ["$[0]", "$[1]", "$[2]"], [difference.path for difference in differences]
+        )
+        self.assertEqual(
+            10000, len(json_diff(list(range(10000)), [None] * 10000, max_diffs=None))
+        )
+
+    def test_array_length(self):
+        differences = json_diff([1, 2, 3], [1])
+        self.assertEqual(
+            ["$[1]", "$[2]"], [difference.path for difference in differences]
+        )
+        self.assertEqual(DiffKind.UNEXPECTED, differences[0].kind)
+
+    def test_deep_document(self):
+        actual, expected = 1, 2
+        for _ in range(5000):
+            actual, expected = {"a": actual}, {"a": expected}
+        differences = json_diff(actual, expected)
+        self.assertEqual(1, len(differences))
+        self.assertTrue(differences[0].path.endswith(".a.a"))
+
+    def test_assert_json_to_equal(self):
+        with requests_mock.Mocker() as m:
+            m.get("https://api.server/users", json=self.actual)
+            request = Assert(
+                "GET", "https://api.server/users", headers={}, logger=False
+            )
+
+        self.assertEqual(
+            "ignored",
+            request.assert_json_to_equal(
+                {**self.actual, "total": 3}, "ignored", ignore_paths=["$.total"]
+            ),
+        )
+        with self.assertRaises(AssertionError) as context:
+            request.assert_json_to_equal(self.expected, "not equal", max_diffs=2)
+        self.assertIn(
+            "$.data[0].name expected 'ray', was 'ryan'", str(context.exception)
+        )
+        self.assertNotIn("$.total", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
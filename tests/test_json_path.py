@@ -0,0 +1,34 @@
+import unittest
+from maritest.utils.json_path import compile_path, format_path, resolve
+
+
+class TestJsonPath(unittest.TestCase):
+    def test_compile_path(self):
+        self.assertEqual(("data", 0, "id"), compile_path("$.data[0].id"))
+        self.assertEqual(("data", 0, "id"), compile_path("data[0].id"))
+        self.assertEqual(
+            ("key with space", -1), compile_path("$['key with space'][-1]")
+        )
+        self.assertEqual((), compile_path("$"))
+
+    def test_resolve(self):
+        obj = {"data": [{"id": 1}, {"id": 2}], "key with space": [1, 2]}
+        self.assertEqual(2, resolve(obj, "$.data[-1].id"))
+        self.assertEqual([1, 2], resolve(obj, "$['key with space']"))
+        self.assertEqual(obj, resolve(obj, "$"))
+
+        with self.assertRaises(LookupError):
+            resolve(obj, "$.data[0].name")
+        with self.assertRaises(LookupError):
+            resolve(obj, "$.data.id")
+
+    def test_format_path(self):
+        self.assertEqual("$.data[0]['some key']", format_path(("data", 0, "some key")))
+
+    @unittest.expectedFailure
+    def test_invalid_path(self):
+        compile_path("$.data[")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from maritest.assertion import Assert
+from maritest.utils.links import check_links, extract_links, unexpected_links
+from tests.helpers import LocalServerTestCase, QuietHandler
+
+
+class Handler(QuietHandler):
+    def do_GET(self):
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        links = "".join(
+            f'<li><a href="{base}/{path}">{path}</a></li>' for path in self.server.paths
+        )
+        body = f'<html><body><a href="/relative">home</a><ul>{links}</ul></body></html>'
+        body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(404 if self.path.startswith("/missing") else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class TestLinks(LocalServerTestCase):
+    handler = Handler
+
+    def setUp(self):
+        self.server.paths = ["first", "second", "first"]
+
+    def request(self, stream=False):
+        return Assert(
+            "GET", f"{self.base}/index.html", headers={}, logger=False, stream=stream
+        )
+
+    def test_extract_links_in_chunks(self):
+        document = (
+            b'<p><a href="/a">a</a><A HREF="https://b.com">b</a><a name="c">c</a></p>'
+        )
+        chunks = [document[index : index + 7] for index in range(0, len(document), 7)]
+        self.assertEqual(extract_links(chunks), ["/a", "https://b.com"])
+
+    def test_unexpected_links(self):
+        links = ["/relative", "https://a.com", "https://b.com"]
+        self.assertEqual(unexpected_links(links, ["https://a.com"]), ["https://b.com"])
+        # string keep the substring semantics
+        self.assertEqual(unexpected_links(links, "https://a.com https://b.com"), [])
+
+    def test_assert_link_data(self):
+        expected = [f"{self.base}/{path}" for path in ("first", "second")]
+        for stream in (False, True):
+            request = self.request(stream=stream)
+            self.assertEqual(
+                request.assert_link_data(expected, "links found", check_links=True),
+                "links found",
+            )
+
+    @unittest.expectedFailure
+    def test_link_not_expected(self):
+        self.request().assert_link_data([f"{self.base}/first"], "second is unexpected")
+
+    @unittest.expectedFailure
+    def test_broken_link(self):
+        self.server.paths = ["first", "missing"]
+        expected = [f"{self.base}/{path}" for path in self.server.paths]
+        self.request().assert_link_data(expected, "missing is broken", check_links=True)
+
+    def test_expected_values_required(self):
+        with self.assertRaises(TypeError):
+            self.request().assert_link_data(message="expected values is missing")
+
+    def test_check_links(self):
+        links = [
+            f"{self.base}/first",
+            "/relative",
+            f"{self.base}/missing",
+            f"{self.base}/first",
+        ]
+        results = check_links(links, max_workers=2)
+        self.assertEqual(
+            results, {f"{self.base}/first": 200, f"{self.base}/missing": 404}
+        )
+        self.assertIsInstance(
+            check_links(["http://127.0.0.1:1/"])["http://127.0.0.1:1/"], Exception
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from unittest import mock
+import requests
+import requests_mock  # type: ignore
+from maritest.assertion import Assert
+from maritest.client import Http
+from maritest.request_template import RequestTemplate
+from maritest.utils.environment import environment_settings
+
+
+class TestRequestTemplate(unittest.TestCase):
+    def setUp(self):
+        self.mocker = requests_mock.Mocker()
+        self.mocker.start()
+        self.mocker.get("https://api.server/users/1", json={"id": 1})
+        self.mocker.post("https://api.server/users", json={"id": 2}, status_code=201)
+
+    def tearDown(self):
+        self.mocker.stop()
+
+    def test_prepare_same_as_session(self):
+        template = RequestTemplate(
+            "POST",
+            "https://api.server/${resource}",
+            headers={"X-Trace": "${trace}"},
+            params={"page": "${page}"},
+            json={"name": "${name}"},
+        )
+        prepared, environment = template.prepare(
+            {"resource": "users", "trace": "abc", "page": 2, "name": "ryan"}
+        )
+
+        session = requests.Session()
+        session.headers.update({"X-Trace": "abc"})
+        expected = session.prepare_request(
+            requests.Request(
+                "POST",
+                "https://api.server/users",
+                headers={"X-Trace": "abc"},
+                params={"page": 2},
+                json={"name": "ryan"},
+            )
+        )
+        self.assertEqual(prepared.url, expected.url)
+        self.assertEqual(prepared.body, expected.body)
+        self.assertEqual(dict(prepared.headers), dict(expected.headers))
+        self.assertIn("proxies", environment)
+
+    def test_static_template_prepared_once(self):
+        template = RequestTemplate("GET", "https://api.server/users/1", headers={})
+        first, _ = template.prepare()
+        second, _ = template.prepare()
+        self.assertIsNot(first, second)
+        self.assertEqual(first.url, second.url)
+        self.assertEqual(template.variables, frozenset())
+
+    def test_auth_applied_per_request(self):
+        class CountingAuth(requests.auth.AuthBase):
+            def __init__(self):
+                self.count = 0
+
+            def __call__(self, request):
+                self.count += 1
+                request.headers["Authorization"] = f"Bearer {self.count}"
+                request.register_hook("response", lambda response, **kwargs: response)
+                return request
+
+        auth = CountingAuth()
+        template = RequestTemplate(
+            "GET", "https://api.server/users/1", headers={}, auth=auth
+        )
+        first, _ = template.prepare()
+        second, _ = template.prepare()
+        self.assertEqual(first.headers["Authorization"], "Bearer 1")
+        self.assertEqual(second.headers["Authorization"], "Bearer 2")
+        self.assertEqual(len(second.hooks["response"]), 1)
+
+    def test_environment_merged_once_per_host(self):
+        environment_settings.invalidate()
+        template = RequestTemplate("GET", "https://api.server/users/${id}", headers={})
+        with mock.patch.object(
+            requests.Session,
+            "merge_environment_settings",
+            autospec=True,
+            side_effect=requests.Session.merge_environment_settings,
+        ) as merge:
+            for _ in range(3):
+                template.send({"id": 1}, logger=False, retry=False)
+        self.assertEqual(merge.call_count, 1)
+
+    def test_send_as_assert(self):
+        template = RequestTemplate("GET", "https://api.server/users/${id}", headers={})
+        request = template.send({"id": 1}, logger=False)
+        self.assertIsInstance(request, Assert)
+        self.assertEqual(request.get_json, {"id": 1})
+        self.assertEqual(request.url, "https://api.server/users/1")
+
+    def test_send_with_override_options(self):
+        template = RequestTemplate(
+            "POST", "https://api.server/users", json={"name": "${name}"}, logger=False
+        )
+        request = template.send({"name": "ryan"}, cls=Http, retry=False)
+        self.assertEqual(request.get_status_code, 201)
+        self.assertEqual(self.mocker.last_request.json(), {"name": "ryan"})
+
+    @unittest.expectedFailure
+    def test_missing_variable(self):
+        RequestTemplate("GET", "https://api.server/users/${id}", headers={}).prepare()
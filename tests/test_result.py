@@ -0,0 +1,69 @@
+import hashlib
+import sys
+import unittest
+import requests_mock  # type: ignore
+from maritest.assertion import Assert
+from maritest.result import ResultRecord
+
+
+class TestResultRecord(unittest.TestCase):
+    def setUp(self):
+        self.mocker = requests_mock.Mocker()
+        self.mocker.start()
+        self.mocker.get(
+            "https://api.server/users",
+            json={"id": 1},
+            headers={"Content-Type": "application/json", "X-Trace": "abc"},
+        )
+
+    def tearDown(self):
+        self.mocker.stop()
+
+    def test_record_from_http_and_release(self):
+        request = Assert("GET", "https://api.server/users", headers={}, logger=False)
+        content = request.get_content
+        record = request.to_record(
+            headers=["Content-Type", "X-Missing"],
+            assertions=[("assert_is_2xx_status", None)],
+        )
+
+        self.assertIsNone(request.response)
+        self.assertEqual(record.status_code, 200)
+        self.assertEqual(record.size, len(content))
+        self.assertEqual(record.hexdigest, hashlib.sha256(content).hexdigest())
+        self.assertEqual(record.header("content-type"), "application/json")
+        self.assertEqual(record.headers, (("content-type", "application/json"),))
+        self.assertTrue(record.passed)
+        self.assertGreaterEqual(record.elapsed, 0.0)
+
+    def test_keep_response_without_release(self):
+        request = Assert("GET", "https://api.server/users", headers={}, logger=False)
+        request.to_record(release=False)
+        self.assertEqual(request.get_json, {"id": 1})
+
+    def test_failed_record(self):
+        record = ResultRecord(
+            "GET",
+            "https://api.server/users",
+            status_code=500,
+            assertions=(
+                ("assert_is_2xx_status", "status not 2xx"),
+                ("assert_has_json", None),
+            ),
+        )
+        self.assertFalse(record.passed)
+        self.assertEqual(record.failures, ["assert_is_2xx_status: status not 2xx"])
+        self.assertEqual(record.to_dict()["passed"], False)
+        self.assertIn("FAILED", repr(record))
+
+    def test_compact_record(self):
+        record = ResultRecord("GET", "https://api.server/users")
+        url = "".join(["https://api.server/", "users"])
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertIs(ResultRecord("GET", url).url, record.url)
+        self.assertLessEqual(sys.getsizeof(record), 128)
+
+    @unittest.expectedFailure
+    def test_no_arbitrary_attribute(self):
+        record = ResultRecord("GET", "https://api.server/users")
+        record.response = object()
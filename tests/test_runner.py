@@ -0,0 +1,51 @@
+import time
+import unittest
+from maritest.runner import CaseResult, Runner
+
+
+def case(item):
+    name, passed = item
+    time.sleep(0.05)
+    return CaseResult(name=name, passed=passed)
+
+
+class TestRunner(unittest.TestCase):
+    def test_run_concurrently_in_order(self):
+        items = [(f"case {index}", True) for index in range(8)]
+        start = time.perf_counter()
+        results = Runner(concurrency=8).run(case, items)
+
+        self.assertLess(time.perf_counter() - start, 0.3)
+        self.assertEqual(
+            [name for name, _ in items], [result.name for result in results]
+        )
+        self.assertTrue(all(result.passed for result in results))
+
+    def test_exception_as_failed_result(self):
+        def failed(item):
+            raise ConnectionError("dead host")
+
+        results = Runner().run(failed, ["first"])
+
+        self.assertFalse(results[0].passed)
+        self.assertEqual("ConnectionError: dead host", results[0].error)
+        self.assertEqual("first", results[0].name)
+
+    def test_fail_fast(self):
+        items = [("failed", False)] + [(f"case {index}", True) for index in range(5)]
+        results = Runner(concurrency=1, fail_fast=True).run(case, items)
+
+        self.assertEqual(["failed"], [result.name for result in results])
+
+    def test_result_to_dict(self):
+        result = CaseResult(name="case", passed=False, failures=["status not 2xx"])
+        self.assertEqual(["status not 2xx"], result.to_dict()["failures"])
+        self.assertIn("FAILED", repr(result))
+
+    @unittest.expectedFailure
+    def test_invalid_concurrency(self):
+        Runner(concurrency=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import threading
+import unittest
+import requests_mock  # type: ignore
+from maritest.runner import CaseResult, Runner
+from maritest.scheduler import Scheduler, resolve_dependencies
+from maritest.suite import PlanStep
+from maritest.utils.extractors import Extractor
+from maritest.utils.template import Template
+
+
+def step(name, url, method="GET", extract=None, depends_on=None):
+    return PlanStep(
+        name=name,
+        request=Template({"method": method, "url": url, "headers": {}, "retry": False}),
+        extract={key: Extractor(value) for key, value in (extract or {}).items()},
+        assertions=[("assert_is_2xx_status", Template({"message": name}))],
+        depends_on=depends_on,
+    )
+
+
+class FakeStep:
+    def __init__(self, name, requires=(), extract=(), depends_on=()):
+        self.name = name
+        self.requires = frozenset(requires)
+        self.extract = dict.fromkeys(extract)
+        self.depends_on = list(depends_on)
+
+
+class TestResolveDependencies(unittest.TestCase):
+    def test_infer_from_variables(self):
+        steps = [
+            FakeStep("create", extract=["id"]),
+            FakeStep("get", requires=["id"]),
+            FakeStep("update", requires=["id"], extract=["id"]),
+            FakeStep("delete", requires=["id"], depends_on=["get"]),
+        ]
+        graph = resolve_dependencies(steps)
+        self.assertEqual(graph, [frozenset(), {0}, {0}, {1, 2}])
+
+    def test_runtime_variable_has_no_dependency(self):
+        graph = resolve_dependencies([FakeStep("get", requires=["token"])])
+        self.assertEqual(graph, [frozenset()])
+
+    def test_large_chain(self):
+        # every step extract the variable that needed by the next one
+        steps = [FakeStep("step 0", extract=["id"])] + [
+            FakeStep(f"step {index}", requires=["id"], extract=["id"])
+            for index in range(1, 50000)
+        ]
+        graph = resolve_dependencies(steps)
+        self.assertEqual(graph[-1], {49998})
+
+    @unittest.expectedFailure
+    def test_circular_dependency(self):
+        resolve_dependencies(
+            [FakeStep("a", depends_on=["b"]), FakeStep("b", depends_on=["a"])]
+        )
+
+    @unittest.expectedFailure
+    def test_unknown_dependency(self):
+        resolve_dependencies([FakeStep("a", depends_on=["missing"])])
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.mocker = requests_mock.Mocker()
+        self.mocker.start()
+        self.mocker.post("https://api.server/users", json={"id": 7})
+        self.mocker.post("https://api.server/orders", json={"id": 9})
+        self.mocker.get("https://api.server/users/7", json={"id": 7})
+        self.mocker.get("https://api.server/orders/9", json={"id": 9})
+        self.mocker.get("https://api.server/broken", status_code=500)
+
+    def tearDown(self):
+        self.mocker.stop()
+
+    def test_pass_extracted_variables(self):
+        steps = [
+            step(
+                "create user",
+                "https://api.server/users",
+                "POST",
+                {"user_id": "json:$.id"},
+            ),
+            step("get user", "https://api.server/users/${user_id}"),
+        ]
+        results = Scheduler().run(steps)
+        self.assertEqual([result.passed for result in results], [True, True])
+        self.assertEqual(
+            self.mocker.request_history[-1].url, "https://api.server/users/7"
+        )
+
+    def test_run_independent_branches_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        class BranchStep(FakeStep):
+            def run(self, variables):
+                if not self.requires:
+                    # both branches must be in flight at the same time
+                    barrier.wait()
+                    return CaseResult(self.name, True, variables={self.name: 1})
+                return CaseResult(self.name, set(variables) == set(self.requires))
+
+        steps = [
+            BranchStep("user", extract=["user"]),
+            BranchStep("order", extract=["order"]),
+            BranchStep("get user", requires=["user"]),
+            BranchStep("get order", requires=["order"]),
+        ]
+        results = Scheduler(Runner(concurrency=2)).run(steps)
+        self.assertEqual([result.passed for result in results], [True] * 4)
+        self.assertEqual([result.name for result in results], [s.name for s in steps])
+
+    def test_skip_step_with_failed_dependency(self):
+        steps = [
+            step("broken", "https://api.server/broken", extract={"user_id": "status"}),
+            step("get user", "https://api.server/users/${user_id}"),
+            step("create order", "https://api.server/orders", "POST"),
+        ]
+        results = Scheduler().run(steps)
+        self.assertEqual([result.passed for result in results], [False, False, True])
+        self.assertIn("broken", results[1].error)
+        self.assertEqual(len(self.mocker.request_history), 2)
+
+    def test_fail_fast(self):
+        steps = [
+            step("broken", "https://api.server/broken"),
+            step(
+                "create user", "https://api.server/users", "POST", depends_on=["broken"]
+            ),
+        ]
+        results = Scheduler(Runner(fail_fast=True)).run(steps)
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0], CaseResult)
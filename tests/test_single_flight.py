@@ -0,0 +1,152 @@
+import threading
+import time
+import unittest
+import requests
+import requests_mock  # type: ignore
+from concurrent.futures import ThreadPoolExecutor
+from maritest.assertion import Assert
+from maritest.utils.single_flight import SingleFlight, request_key
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_call_shared(self):
+        group = SingleFlight()
+        calls = []
+        barrier = threading.Barrier(4)
+
+        def func():
+            calls.append(1)
+            time.sleep(0.2)
+            return "result"
+
+        def worker():
+            barrier.wait()
+            return group.do("key", func)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: worker(), range(4)))
+
+        self.assertEqual(1, len(calls))
+        self.assertTrue(all(result == "result" for result, _ in results))
+        self.assertTrue(all(shared for _, shared in results))
+        self.assertEqual(0, len(group))
+
+    def test_sequential_call_not_shared(self):
+        group = SingleFlight()
+        self.assertEqual((1, False), group.do("key", lambda: 1))
+        self.assertEqual((2, False), group.do("key", lambda: 2))
+
+    def test_error_fan_out(self):
+        group = SingleFlight()
+        barrier = threading.Barrier(3)
+
+        def func():
+            time.sleep(0.2)
+            raise ValueError("failed")
+
+        def worker():
+            barrier.wait()
+            try:
+                group.do("key", func)
+            except ValueError as error:
+                return str(error)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(lambda _: worker(), range(3)))
+
+        self.assertEqual(["failed"] * 3, results)
+
+    def test_request_key_with_options(self):
+        request = requests.Request("GET", "https://fixture.api/resource").prepare()
+        key = request_key(request, allow_redirects=True, proxies={"https": "p"})
+        self.assertEqual(
+            key, request_key(request, proxies={"https": "p"}, allow_redirects=True)
+        )
+        self.assertNotEqual(
+            key, request_key(request, allow_redirects=False, proxies={})
+        )
+        self.assertNotEqual(
+            request_key(request, verify=True), request_key(request, verify="/ca.pem")
+        )
+
+
+class TestHttpCoalesce(unittest.TestCase):
+    def request(self, url="https://fixture.api/resource", headers=None, **kwargs):
+        return Assert(
+            method="GET",
+            url=url,
+            headers=headers or {},
+            logger=False,
+            coalesce=True,
+            **kwargs,
+        )
+
+    def test_identical_get_coalesced(self):
+        def callback(request, context):
+            time.sleep(0.3)
+            return {"id": 1}
+
+        barrier = threading.Barrier(5)
+
+        def worker(_):
+            barrier.wait()
+            return self.request()
+
+        with requests_mock.Mocker() as m:
+            m.get("https://fixture.api/resource", json=callback)
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                requests = list(executor.map(worker, range(5)))
+
+            self.assertEqual(1, m.call_count)
+
+        for request in requests:
+            request.assert_is_2xx_status("shared response")
+            self.assertEqual({"id": 1}, request.get_json)
+        self.assertEqual(4, sum(request.coalesced for request in requests))
+        self.assertIs(requests[0].get_json, requests[1].get_json)
+
+        # every waiter own its response object
+        self.assertEqual(5, len({id(request.response) for request in requests}))
+        requests[1].release()
+        for request in requests[2:]:
+            self.assertEqual({"id": 1}, request.response.json())
+
+    def test_different_headers_not_coalesced(self):
+        def callback(request, context):
+            time.sleep(0.2)
+            return {"id": 1}
+
+        barrier = threading.Barrier(2)
+
+        def worker(headers):
+            barrier.wait()
+            return self.request(headers=headers)
+
+        with requests_mock.Mocker() as m:
+            m.get("https://fixture.api/resource", json=callback)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(worker, [{"X-Tenant": "a"}, {"X-Tenant": "b"}]))
+
+            self.assertEqual(2, m.call_count)
+
+    def test_different_options_not_coalesced(self):
+        def callback(request, context):
+            time.sleep(0.2)
+            return {"id": 1}
+
+        barrier = threading.Barrier(2)
+
+        def worker(allow_redirects):
+            barrier.wait()
+            return self.request(allow_redirects=allow_redirects)
+
+        with requests_mock.Mocker() as m:
+            m.get("https://fixture.api/resource", json=callback)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(worker, [True, False]))
+
+            self.assertEqual(2, m.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
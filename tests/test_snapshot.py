@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests_mock  # type: ignore
+from maritest.assertion import Assert
+from maritest.snapshot import SnapshotStore, drop_paths, normalize
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(self.directory.name, update=False)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def request(self, **kwargs):
+        with requests_mock.Mocker() as m:
+            m.get("https://api.server/users", **kwargs)
+            return Assert("GET", "https://api.server/users", headers={}, logger=False)
+
+    def test_normalize(self):
+        self.assertEqual(normalize(b'{"b": 1,\n "a": [1, 2]}'), b'{"a":[1,2],"b":1}')
+        self.assertEqual(normalize(b"line\r\nline"), b"line\nline")
+        self.assertEqual(
+            normalize(b'{"id": 1, "meta": {"ts": 2}}', ignore_paths=["$.meta.ts"]),
+            b'{"id":1,"meta":{}}',
+        )
+
+    def test_drop_paths(self):
+        obj = {"data": [{"id": 1, "ts": 1}, {"id": 2, "ts": 2}], "ts": 0}
+        self.assertEqual(
+            drop_paths(obj, ["$.data[*].ts", "ts", "$.missing.path"]),
+            {"data": [{"id": 1}, {"id": 2}]},
+        )
+        self.assertEqual(obj["ts"], 0)
+
+    def test_snapshot_created_then_matched(self):
+        request = self.request(json={"id": 1, "name": "ryan"})
+        self.assertEqual(
+            request.assert_snapshot("users", "created", store=self.store), "created"
+        )
+        self.assertEqual(
+            request.assert_snapshot("users", "matched", store=self.store), "matched"
+        )
+
+        # the stored body is loaded only on mismatch
+        with mock.patch.object(SnapshotStore, "load", side_effect=AssertionError):
+            request.assert_snapshot(
+                "users", "matched", store=SnapshotStore(self.directory.name)
+            )
+
+    def test_snapshot_deduplicated(self):
+        request = self.request(json={"id": 1})
+        request.assert_snapshot("first", "created", store=self.store)
+        request.assert_snapshot("second", "created", store=self.store)
+        objects = [
+            files
+            for _, _, files in os.walk(os.path.join(self.directory.name, "objects"))
+        ]
+        self.assertEqual(sum(len(files) for files in objects), 1)
+        self.assertEqual(self.store.get("first"), self.store.get("second"))
+
+    def test_snapshot_mismatch(self):
+        self.request(json={"id": 1, "name": "ryan"}).assert_snapshot(
+            "users", "created", store=self.store
+        )
+        request = self.request(json={"id": 1, "name": "bob"})
+        with self.assertRaises(AssertionError) as context:
+            request.assert_snapshot("users", "matched", store=self.store)
+        self.assertIn("$.name expected 'ryan', was 'bob'", str(context.exception))
+
+        self.assertEqual(
+            "updated",
+            request.assert_snapshot(
+                "users",
+                "updated",
+                store=SnapshotStore(self.directory.name, update=True),
+            ),
+        )
+        self.assertEqual(
+            "matched",
+            request.assert_snapshot(
+                "users", "matched", store=SnapshotStore(self.directory.name)
+            ),
+        )
+
+    def test_text_snapshot_mismatch(self):
+        self.request(text="first\nsecond").assert_snapshot(
+            "page", "created", store=self.store
+        )
+        differences = self.store.compare("page", b"first\nthird")
+        self.assertIn("-second", differences)
+        self.assertIn("+third", differences)
+
+    def test_ignore_paths(self):
+        self.request(json={"id": 1, "ts": 1}).assert_snapshot(
+            "users", "created", ignore_paths=["ts"], store=self.store
+        )
+        self.request(json={"ts": 2, "id": 1}).assert_snapshot(
+            "users", "matched", ignore_paths=["ts"], store=self.store
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import io
+import tempfile
+import unittest
+from unittest import mock
+
+from maritest.result import ResultRecord
+from maritest.runner import CaseResult, Runner
+from maritest.store import ResultStore, percentile
+
+
+def result(name, url, status_code, elapsed, passed=True):
+    record = ResultRecord("GET", url, status_code=status_code, elapsed=elapsed, size=10)
+    return CaseResult(name, passed=passed, status_code=status_code, record=record)
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.store = ResultStore()
+        self.store.extend(
+            [
+                result("a", "https://api.com/users?page=1", 200, 0.1),
+                result("b", "https://api.com/users?page=2", 200, 0.2),
+                result("c", "https://api.com/users?page=3", 200, 0.3, passed=False),
+                result("d", "https://api.com/users?page=4", 503, 0.4, passed=False),
+                result("e", "https://api.com/orders", 404, 0.5, passed=False),
+            ]
+        )
+        self.store.add_result(
+            CaseResult("f", passed=False, error="timeout", duration=1.0)
+        )
+
+    def test_columns(self):
+        self.assertEqual(len(self.store), 6)
+        self.assertEqual(
+            self.store.endpoints,
+            ["GET https://api.com/users", "GET https://api.com/orders", "f"],
+        )
+        self.assertEqual(
+            list(self.store.columns["status_code"]), [200, 200, 200, 503, 404, 0]
+        )
+        self.assertEqual(list(self.store.columns["passed"]), [1, 1, 0, 0, 0, 0])
+
+    @mock.patch("maritest.store._numpy", return_value=None)
+    def test_group_by_endpoint(self, _):
+        summary = self.store.group_by("endpoint", percentiles=(50, 95))
+        users = summary["GET https://api.com/users"]
+        self.assertEqual(users["count"], 4)
+        self.assertEqual(users["failure_rate"], 0.5)
+        self.assertEqual(users["error_rate"], 0.25)
+        self.assertAlmostEqual(users["mean"], 0.25)
+        self.assertAlmostEqual(users["p50"], 0.25)
+        self.assertAlmostEqual(users["p95"], 0.385)
+        self.assertEqual(users["size"], 40)
+        self.assertEqual(summary["f"]["error_rate"], 1.0)
+
+    @mock.patch("maritest.store._numpy", return_value=None)
+    def test_group_by_many_keys(self, _):
+        summary = self.store.group_by(["endpoint", "status_class"], percentiles=())
+        self.assertEqual(summary[("GET https://api.com/users", "2xx")]["count"], 3)
+        self.assertEqual(summary[("GET https://api.com/users", "5xx")]["count"], 1)
+        self.assertEqual(summary[("f", "error")]["max"], 1.0)
+        self.assertEqual(
+            set(self.store.group_by("status_class")), {"2xx", "4xx", "5xx", "error"}
+        )
+
+    @unittest.expectedFailure
+    def test_group_by_unknown_key(self):
+        self.store.group_by("method")
+
+    def test_vectorized_aggregation(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        with mock.patch("maritest.store._numpy", return_value=None):
+            expected = self.store.group_by(["endpoint", "status_class"])
+        summary = self.store.group_by(["endpoint", "status_class"])
+        self.assertEqual(set(summary), set(expected))
+        for group, row in expected.items():
+            for name, value in row.items():
+                self.assertAlmostEqual(summary[group][name], value)
+
+    def test_percentile(self):
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 50), 2.5)
+        self.assertEqual(percentile([1.0], 99), 1.0)
+
+    def test_export_csv(self):
+        output = io.StringIO()
+        self.store.to_csv(output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], "endpoint,status_code,latency,size,passed")
+        self.assertEqual(lines[1], "GET https://api.com/users,200,0.1,10,True")
+        self.assertEqual(len(lines), 7)
+
+    def test_export_parquet(self):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        with tempfile.TemporaryDirectory() as directory:
+            self.store.to_parquet(f"{directory}/results.parquet")
+            table = pyarrow.parquet.read_table(f"{directory}/results.parquet")
+        self.assertEqual(table.num_rows, 6)
+
+    def test_runner_feeds_store(self):
+        store = ResultStore(endpoint=lambda result: result.name[0])
+        runner = Runner(concurrency=4, store=store)
+        runner.run(
+            lambda name: result(name, "https://api.com/", 200, 0.1), ["a1", "a2", "b1"]
+        )
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.group_by()["a"]["count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import requests_mock  # type: ignore
+from maritest.runner import Runner
+from maritest.suite import compile_suite, load_plan, run_suite
+
+SUITE = {
+    "name": "users api",
+    "base_url": "https://api.server",
+    "variables": {"user_id": 1, "token": "abc"},
+    "defaults": {"headers": {"Authorization": "Bearer ${token}"}, "retry": False},
+    "tests": [
+        {
+            "name": "get user",
+            "request": {"method": "GET", "url": "/users/${user_id}"},
+            "assert": [
+                "assert_is_2xx_status",
+                {"assert_status_code_in": [200]},
+                {"assert_json_to_equal": {"obj": {"id": 1, "name": "ryan"}}},
+            ],
+        },
+        {
+            "name": "list users",
+            "request": {"method": "GET", "url": "/users", "params": {"page": 1}},
+            "assert": [{"assert_status_code_in": {"status_code": [404]}}],
+        },
+    ],
+}
+
+CHAINED_SUITE = """
+name: chained
+base_url: https://api.server
+tests:
+  - name: create user
+    request:
+      method: POST
+      url: /users
+      json: {name: ryan}
+    extract:
+      user_id: json:$.id
+    assert:
+      - assert_is_2xx_status
+  - name: get created user
+    request:
+      method: GET
+      url: /users/${user_id}
+    assert:
+      - assert_keys_in_response: {keys: [name]}
+"""
+
+
+class TestSuite(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # cached plans are written into temporary directory
+        self.environ = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": self.directory})
+        self.environ.start()
+        self.mocker = requests_mock.Mocker()
+        self.mocker.start()
+        self.mocker.get(
+            "https://api.server/users/1",
+            json={"id": 1, "name": "ryan"},
+            request_headers={"Authorization": "Bearer abc"},
+        )
+        self.mocker.get("https://api.server/users?page=1", json=[])
+        self.mocker.post("https://api.server/users", json={"id": 7}, status_code=201)
+        self.mocker.get("https://api.server/users/7", json={"name": "ryan"})
+
+    def tearDown(self):
+        self.mocker.stop()
+        self.environ.stop()
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as f:
+            f.write(content if isinstance(content, str) else json.dumps(content))
+        return path
+
+    def test_compile_suite(self):
+        plan = compile_suite(SUITE)
+
+        self.assertEqual(2, len(plan))
+        self.assertTrue(plan.is_independent)
+        self.assertEqual(
+            {
+                "method": "GET",
+                "url": "https://api.server/users/1",
+                "headers": {"Authorization": "Bearer abc"},
+                "retry": False,
+            },
+            plan.steps[0].request.render(),
+        )
+        prepared, _ = plan.steps[0].template.prepare()
+        self.assertEqual(prepared.url, "https://api.server/users/1")
+        self.assertEqual(prepared.headers["Authorization"], "Bearer abc")
+        dynamic = compile_suite(
+            {
+                "tests": [
+                    {"request": {"method": "GET", "url": "https://api.server/${path}"}}
+                ]
+            }
+        )
+        self.assertIsNone(dynamic.steps[0].template)
+        self.assertEqual("assert_status_code_in", plan.steps[0].assertions[1][0])
+
+    def test_run_suite(self):
+        path = self.write("suite.json", SUITE)
+        results = run_suite(path, runner=Runner(concurrency=2))
+
+        self.assertEqual(
+            ["get user", "list users"], [result.name for result in results]
+        )
+        self.assertTrue(results[0].passed)
+        self.assertFalse(results[1].passed)
+        self.assertIn("assert_status_code_in", results[1].failures[0])
+
+    def test_chained_yaml_suite(self):
+        path = self.write("suite.yaml", CHAINED_SUITE)
+        plan = load_plan(path)
+        results = plan.run()
+
+        self.assertFalse(plan.is_independent)
+        self.assertEqual({"user_id"}, plan.steps[1].requires)
+        self.assertTrue(all(result.passed for result in results))
+        self.assertEqual({"user_id": 7}, results[0].variables)
+
+    def test_cached_plan(self):
+        path = self.write("suite.json", SUITE)
+        cache_dir = os.path.join(self.directory, "cache")
+        load_plan(path, cache_dir=cache_dir)
+        self.assertEqual(1, len(os.listdir(cache_dir)))
+
+        cached = load_plan(path, cache_dir=cache_dir)
+        self.assertEqual(2, len(cached))
+        self.assertEqual(1, len(os.listdir(cache_dir)))
+        results = cached.run()
+        self.assertEqual([True, False], [result.passed for result in results])
+
+        # cached plan with other header is compiled again
+        cache_path = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+        with open(cache_path) as f:
+            content = json.load(f)
+        content["header"]["plan_version"] = 0
+        content["plan"]["name"] = "tampered"
+        with open(cache_path, "w") as f:
+            json.dump(content, f)
+        self.assertEqual("users api", load_plan(path, cache_dir=cache_dir).name)
+
+        # changed suite file use another cache key
+        self.write("suite.json", dict(SUITE, name="changed"))
+        self.assertEqual("changed", load_plan(path, cache_dir=cache_dir).name)
+        self.assertEqual(2, len(os.listdir(cache_dir)))
+
+    def test_default_cache_dir(self):
+        path = self.write("suite.yaml", CHAINED_SUITE)
+        load_plan(path)
+        self.assertNotIn(".maritest_cache", os.listdir(self.directory))
+        self.assertEqual(
+            1, len(os.listdir(os.path.join(self.directory, "maritest", "plans")))
+        )
+        self.assertTrue(load_plan(path).steps[1].request.variables)
+
+    def test_fail_fast(self):
+        suite = dict(SUITE, tests=list(reversed(SUITE["tests"])))
+        results = compile_suite(suite).run(runner=Runner(concurrency=1, fail_fast=True))
+        self.assertEqual(1, len(results))
+
+    @unittest.expectedFailure
+    def test_unknown_assertion(self):
+        compile_suite(
+            {
+                "tests": [
+                    {
+                        "request": {"method": "GET", "url": "/"},
+                        "assert": ["assert_unknown"],
+                    }
+                ]
+            }
+        )
+
+    @unittest.expectedFailure
+    def test_invalid_assertion_arguments(self):
+        compile_suite(
+            {
+                "tests": [
+                    {
+                        "request": {"method": "GET", "url": "/"},
+                        "assert": [{"assert_response_time": {"seconds": 1}}],
+                    }
+                ]
+            }
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
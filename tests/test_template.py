@@ -0,0 +1,62 @@
+import json
+import unittest
+from maritest.utils.template import Template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render_string(self):
+        template = Template("/users/${user_id}/posts/${post_id}")
+        self.assertEqual({"user_id", "post_id"}, template.variables)
+        self.assertEqual(
+            "/users/1/posts/2", template.render({"user_id": 1, "post_id": 2})
+        )
+
+    def test_keep_value_type(self):
+        template = Template({"id": "${id}", "tags": ["${tag}", "static"]})
+        self.assertEqual(
+            {"id": 1, "tags": [["a"], "static"]},
+            template.render({"id": 1, "tag": ["a"]}),
+        )
+
+    def test_static_template(self):
+        source = {"key": ["value", 1, None]}
+        template = Template(source)
+        self.assertTrue(template.is_static)
+        self.assertEqual(source, template.render())
+
+    def test_render_returned_copy(self):
+        for template in (
+            Template({"json": {"id": 1}, "tags": ["a"]}),
+            Template({"url": "${url}", "json": {"id": 1}}),
+        ):
+            rendered = template.render({"url": "/users"})
+            rendered["json"]["id"] = 2
+            rendered.pop("json")
+            self.assertEqual(template.render({"url": "/users"})["json"], {"id": 1})
+
+    def test_partial_render(self):
+        template = Template({"url": "/users/${user_id}?token=${token}"}).partial(
+            {"token": "abc"}
+        )
+        self.assertEqual({"user_id"}, template.variables)
+        self.assertEqual({"url": "/users/1?token=abc"}, template.render({"user_id": 1}))
+        self.assertTrue(template.partial({"user_id": 2}).is_static)
+
+    def test_dump_and_load(self):
+        template = Template({"url": "/users/${user_id}?q=${query}", "n": ["${n}", 1]})
+        # substituted value is kept as it is, not parsed as placeholder
+        template = template.partial({"query": "${literal}"})
+        restored = Template.load(json.loads(json.dumps(template.dump())))
+        self.assertEqual({"user_id", "n"}, restored.variables)
+        self.assertEqual(
+            {"url": "/users/1?q=${literal}", "n": [2, 1]},
+            restored.render({"user_id": 1, "n": 2}),
+        )
+
+    def test_undefined_variable(self):
+        with self.assertRaises(KeyError):
+            Template("${missing}").render({})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import unittest
+import requests
+from maritest.transport import RequestsTransport
+from maritest.utils.tls import ResumableSSLContext, SSLContextCache, TLSAdapter
+from tests.helpers import QuietHandler, start_server, stop_server
+
+
+class Handler(QuietHandler):
+    protocol_version = "HTTP/1.0"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl command is required")
+class TestTLSResumption(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.cert = os.path.join(cls.directory, "cert.pem")
+        cls.key = os.path.join(cls.directory, "key.pem")
+        subprocess.run(
+            [
+                "openssl",
+                "req",
+                "-x509",
+                "-newkey",
+                "rsa:2048",
+                "-nodes",
+                "-keyout",
+                cls.key,
+                "-out",
+                cls.cert,
+                "-days",
+                "1",
+                "-subj",
+                "/CN=localhost",
+                "-addext",
+                "subjectAltName=DNS:localhost",
+            ],
+            check=True,
+            capture_output=True,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cls.cert, cls.key)
+        cls.server = start_server(Handler, ssl_context=context)
+        cls.url = f"https://localhost:{cls.server.server_port}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_server(cls.server)
+        shutil.rmtree(cls.directory)
+
+    def test_reuse_context_and_resume_session(self):
+        cache = SSLContextCache()
+        for _ in range(3):
+            # new session and connection for every request, same as `Http`
+            with requests.Session() as session:
+                session.mount("https://", TLSAdapter(cache))
+                response = session.get(self.url, verify=self.cert)
+                self.assertEqual(response.content, b"ok")
+
+        context = cache.get(self.cert)
+        stats = context.stats()
+        self.assertEqual(len(cache), 1)
+        self.assertIsInstance(context, ResumableSSLContext)
+        self.assertEqual(stats["handshakes"], 3)
+        self.assertGreaterEqual(stats["resumed"], 1)
+
+    def test_verification_failed_with_default_bundle(self):
+        with requests.Session() as session:
+            session.mount("https://", TLSAdapter(SSLContextCache()))
+            with self.assertRaises(requests.exceptions.SSLError):
+                session.get(self.url)
+
+    def test_skip_verification(self):
+        cache = SSLContextCache()
+        with requests.Session() as session:
+            session.mount("https://", TLSAdapter(cache))
+            self.assertEqual(session.get(self.url, verify=False).status_code, 200)
+        self.assertEqual(cache.get(False).verify_mode, ssl.CERT_NONE)
+
+    def test_transport_mount_adapter(self):
+        cache = SSLContextCache()
+        transport = RequestsTransport(ssl_contexts=cache)
+        with requests.Session() as session:
+            request = session.prepare_request(requests.Request("GET", self.url))
+            response = transport.send(request, session=session, verify=self.cert)
+            self.assertIsInstance(session.get_adapter(self.url), TLSAdapter)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(cache), 1)
+
+
+class TestSSLContextCache(unittest.TestCase):
+    def test_cache_per_settings(self):
+        cache = SSLContextCache()
+        self.assertIs(cache.get(True), cache.get(None))
+        self.assertIsNot(cache.get(True), cache.get(False))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    @unittest.expectedFailure
+    def test_invalid_bundle_path(self):
+        SSLContextCache().get("/not/exist/bundle.pem")
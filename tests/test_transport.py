@@ -0,0 +1,323 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import unittest
+import requests
+import requests_mock  # type: ignore
+from unittest import mock
+from maritest.assertion import Assert
+from maritest.transport import (
+    ASGITransport,
+    WSGITransport,
+    Http2Transport,
+    RequestsTransport,
+    build_response,
+    get_transport,
+    set_default_transport,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class TestTransportSelection(unittest.TestCase):
+    def tearDown(self):
+        set_default_transport(None)
+
+    def test_default_requests_transport(self):
+        self.assertIsInstance(get_transport(), RequestsTransport)
+        self.assertIs(get_transport("requests"), get_transport("requests"))
+
+    def test_environment_transport(self):
+        with mock.patch.dict(os.environ, {"MARITEST_TRANSPORT": "requests"}):
+            self.assertIsInstance(get_transport(), RequestsTransport)
+
+    def test_set_default_transport(self):
+        transport = RequestsTransport()
+        set_default_transport(transport)
+        self.assertIs(transport, get_transport())
+
+        with requests_mock.Mocker() as m:
+            m.get("https://api.server/get", json={"key": "value"})
+            request = Assert(
+                method="GET", url="https://api.server/get", headers={}, logger=False
+            )
+
+        self.assertIs(transport, request.transport)
+        self.assertEqual({"key": "value"}, request.get_json)
+
+    @unittest.expectedFailure
+    def test_invalid_transport(self):
+        get_transport("http3")
+
+    def test_build_response(self):
+        request = requests.Request("GET", "https://api.server/get").prepare()
+        response = build_response(
+            request=request,
+            status_code=201,
+            headers=[
+                ("Content-Type", "application/json"),
+                ("Vary", "Accept"),
+                ("Vary", "Origin"),
+                ("Set-Cookie", "session=abc; Path=/"),
+            ],
+            content=b'{"id": 1}',
+        )
+        self.assertEqual("Created", response.reason)
+        self.assertEqual("Accept, Origin", response.headers["vary"])
+        self.assertEqual("abc", response.cookies["session"])
+        self.assertEqual({"id": 1}, response.json())
+        self.assertEqual("https://api.server/get", response.url)
+
+
+@unittest.skipIf(httpx is None, "httpx package is not installed")
+class TestHttp2Transport(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            return httpx.Response(
+                200,
+                json={"path": request.url.path},
+                headers={"X-Request-Id": "1"},
+            )
+
+        self.transport = Http2Transport(transport=httpx.MockTransport(handler))
+
+    def tearDown(self):
+        self.transport.close()
+
+    def request(self, url):
+        return Assert(
+            method="GET",
+            url=url,
+            headers={"X-Custom": "value"},
+            params={"page": 1},
+            logger=False,
+            transport=self.transport,
+        )
+
+    def test_same_property_and_assertion(self):
+        request = self.request("https://api.server/posts")
+
+        self.assertEqual(200, request.get_status_code)
+        self.assertEqual({"path": "/posts"}, request.get_json)
+        self.assertEqual("1", request.get_headers["x-request-id"])
+        self.assertEqual("https://api.server/posts?page=1", request.get_url)
+        self.assertIsInstance(request.get_duration, float)
+        request.assert_is_2xx_status("status is 2xx")
+        request.assert_has_json("it has JSON")
+        self.assertEqual("value", self.requests[0].headers["x-custom"])
+
+    def test_one_client_per_host(self):
+        self.request("https://api.server/posts")
+        self.request("https://api.server/comments")
+        self.request("https://other.server/posts")
+
+        self.assertEqual(2, len(self.transport))
+
+    def test_timeout_exception(self):
+        def handler(request):
+            raise httpx.ConnectTimeout("timeout", request=request)
+
+        transport = Http2Transport(transport=httpx.MockTransport(handler))
+        with self.assertRaises(Exception) as error:
+            Assert(
+                method="GET",
+                url="https://api.server/posts",
+                headers={},
+                logger=False,
+                transport=transport,
+            )
+        self.assertIn("HTTP Request was timeout", str(error.exception))
+
+    def test_retry_status_code(self):
+        statuses = [503, 503, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), headers={"Retry-After": "0"})
+
+        transport = Http2Transport(transport=httpx.MockTransport(handler))
+        request = Assert(
+            method="GET",
+            url="https://api.server/posts",
+            headers={},
+            logger=False,
+            transport=transport,
+        )
+        self.assertEqual(200, request.get_status_code)
+        self.assertEqual([], statuses)
+
+        statuses = [503, 200]
+        request = Assert(
+            method="GET",
+            url="https://api.server/posts",
+            headers={},
+            logger=False,
+            retry=False,
+            transport=transport,
+        )
+        self.assertEqual(503, request.get_status_code)
+        self.assertEqual([200], statuses)
+
+    def test_retry_connection_error(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) < 2:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200)
+
+        transport = Http2Transport(transport=httpx.MockTransport(handler))
+        request = Assert(
+            method="GET",
+            url="https://api.server/posts",
+            headers={},
+            logger=False,
+            transport=transport,
+        )
+        self.assertEqual(200, request.get_status_code)
+        self.assertEqual(2, len(attempts))
+
+    def test_stream_body(self):
+        body = json.dumps({"id": list(range(1000))}).encode("utf-8")
+        compressed = gzip.compress(body)
+
+        def handler(request):
+            # byte stream instead of content, so the body is read from network
+            return httpx.Response(
+                200,
+                stream=httpx.ByteStream(compressed),
+                headers={"Content-Encoding": "gzip"},
+            )
+
+        transport = Http2Transport(transport=httpx.MockTransport(handler))
+        request = Assert(
+            method="GET",
+            url="https://api.server/posts",
+            headers={},
+            logger=False,
+            stream=True,
+            transport=transport,
+        )
+        self.assertIs(False, request.response._content)
+        size = request.body_size()
+        self.assertEqual((len(compressed), len(body)), (size.wire, size.decoded))
+        self.assertEqual(
+            hashlib.sha256(body).hexdigest(), request.digest_body().hexdigest("sha256")
+        )
+
+        request = Assert(
+            method="GET",
+            url="https://api.server/posts",
+            headers={},
+            logger=False,
+            stream=True,
+            transport=transport,
+        )
+        self.assertEqual(body, request.get_content)
+
+
+def wsgi_app(environ, start_response):
+    if environ["PATH_INFO"] == "/redirect":
+        start_response("302 Found", [("Location", "/echo?from=redirect")])
+        return [b""]
+
+    length = int(environ.get("CONTENT_LENGTH") or 0)
+    body = {
+        "method": environ["REQUEST_METHOD"],
+        "path": environ["PATH_INFO"],
+        "query": environ["QUERY_STRING"],
+        "header": environ.get("HTTP_X_CUSTOM"),
+        "body": environ["wsgi.input"].read(length).decode("utf-8"),
+    }
+    start_response(
+        "200 OK",
+        [("Content-Type", "application/json"), ("Set-Cookie", "session=wsgi")],
+    )
+    return [json.dumps(body).encode("utf-8")]
+
+
+async def asgi_app(scope, receive, send):
+    message = await receive()
+    headers = dict(scope["headers"])
+    body = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "query": scope["query_string"].decode("latin-1"),
+        "header": headers.get(b"x-custom", b"").decode("latin-1"),
+        "body": message["body"].decode("utf-8"),
+    }
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 201,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": json.dumps(body).encode()})
+
+
+class TestInProcessTransport(unittest.TestCase):
+    def request(self, transport, method="POST", url="http://testserver/echo", **kwargs):
+        return Assert(
+            method=method,
+            url=url,
+            headers={"X-Custom": "value"},
+            params={"page": 1},
+            logger=False,
+            transport=transport,
+            **kwargs
+        )
+
+    def test_wsgi_transport(self):
+        request = self.request(WSGITransport(wsgi_app), json={"key": "value"})
+
+        request.assert_is_ok("WSGI app was called")
+        request.assert_content_type_to_equal("application/json", "JSON response")
+        self.assertEqual(
+            {
+                "method": "POST",
+                "path": "/echo",
+                "query": "page=1",
+                "header": "value",
+                "body": '{"key": "value"}',
+            },
+            request.get_json,
+        )
+        self.assertEqual("wsgi", request.get_cookies["session"])
+
+    def test_wsgi_redirect(self):
+        request = self.request(
+            WSGITransport(wsgi_app),
+            method="GET",
+            url="http://testserver/redirect",
+            allow_redirects=True,
+        )
+        self.assertEqual("from=redirect", request.get_json["query"])
+        self.assertEqual(302, request.get_history[0].status_code)
+        self.assertEqual("http://testserver/echo?from=redirect", request.get_url)
+
+    def test_asgi_transport(self):
+        request = self.request(ASGITransport(asgi_app), data={"key": "value"})
+
+        request.assert_status_code_in([201], "ASGI app was called")
+        self.assertEqual("key=value", request.get_json["body"])
+        self.assertEqual("value", request.get_json["header"])
+
+    def test_asgi_inside_event_loop(self):
+        async def main():
+            return self.request(ASGITransport(asgi_app), method="GET")
+
+        request = asyncio.run(main())
+        self.assertEqual("GET", request.get_json["method"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import hashlib
+import io
+import json
+import os
+import pathlib
+import tempfile
+import unittest
+from maritest.client import Http
+from maritest.utils.upload import FileBody, IterableBody, MultipartEncoder
+from tests.helpers import LocalServerTestCase, QuietHandler
+
+
+class Handler(QuietHandler):
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk = self.rfile.read(size + 2)[:-2]
+                if not size:
+                    break
+                body += chunk
+        else:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+
+        self.server.bodies.append(body)
+        response = json.dumps(
+            {
+                "size": len(body),
+                "sha256": hashlib.sha256(body).hexdigest(),
+                "content_length": self.headers.get("Content-Length"),
+                "transfer_encoding": self.headers.get("Transfer-Encoding"),
+                "content_type": self.headers.get("Content-Type"),
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+
+class TestUpload(LocalServerTestCase):
+    handler = Handler
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server.bodies = []
+        cls.url = f"{cls.base}/upload"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "data.csv")
+        self.content = b"id,name\n" + b"1,maritest\n" * 200000
+        with open(self.path, "wb") as f:
+            f.write(self.content)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def upload(self, data):
+        return Http(
+            "POST", self.url, headers={}, logger=False, data=data, retry=False
+        ).get_json
+
+    def test_file_body(self):
+        bodies = (
+            FileBody(self.path),
+            FileBody(self.path, use_mmap=True),
+            pathlib.Path(self.path),
+        )
+        for data in bodies:
+            result = self.upload(data)
+            self.assertEqual(result["sha256"], hashlib.sha256(self.content).hexdigest())
+            self.assertEqual(result["content_length"], str(len(self.content)))
+            self.assertIsNone(result["transfer_encoding"])
+
+        # iterated again, ex: when the request was retried
+        body = FileBody(self.path, chunk_size=1024)
+        self.assertEqual(b"".join(body), b"".join(body))
+
+    def test_iterable_body_chunked(self):
+        def generate():
+            for index in range(1000):
+                yield f"line {index}\n"
+
+        result = self.upload(IterableBody(generate()))
+        expected = "".join(f"line {index}\n" for index in range(1000)).encode("utf-8")
+        self.assertEqual(result["transfer_encoding"], "chunked")
+        self.assertEqual(result["sha256"], hashlib.sha256(expected).hexdigest())
+
+    def test_multipart_encoder(self):
+        encoder = MultipartEncoder(
+            [
+                ("name", "dataset"),
+                ("file", ("data.csv", self.path)),
+                ("raw", ("raw.bin", io.BytesIO(b"\x00\x01"), "application/x-raw")),
+                ("note", ('say "hi".txt', b"hello")),
+            ],
+            boundary="maritest-boundary",
+        )
+        result = self.upload(encoder)
+        self.assertEqual(
+            result["content_type"], "multipart/form-data; boundary=maritest-boundary"
+        )
+        self.assertEqual(result["content_length"], str(len(encoder)))
+
+        body = self.server.bodies[-1]
+        self.assertEqual(len(body), len(encoder))
+        self.assertIn(
+            b'Content-Disposition: form-data; name="file"; filename="data.csv"\r\n'
+            b"Content-Type: text/csv\r\n\r\n" + self.content + b"\r\n",
+            body,
+        )
+        self.assertIn(b"Content-Type: application/x-raw\r\n\r\n\x00\x01\r\n", body)
+        self.assertIn(b'filename="say %22hi%22.txt"', body)
+        self.assertTrue(body.endswith(b"--maritest-boundary--\r\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()